@@ -0,0 +1,256 @@
+"""
+Archival of transactions in closed control periods.
+
+Transactions whose control period and date are both older than
+ARCHIVE_AFTER_MONTHS months move from ``transactions`` into
+``transactions_archive``: one row per user and control period holding the
+columns as compressed parallel arrays. That keeps the hot table and its
+indexes to the recent periods most reads touch.
+
+Reads that reach back into a user's archived periods use
+``ledger_transactions()``, a UNION ALL of the hot table and the unnested
+archive with the same columns as ``transactions``. Whether they do is
+decided per user from the archive itself (``archived_through``), so users
+without archived rows never pay for the union and changing
+ARCHIVE_AFTER_MONTHS only affects what the next run moves. Archived
+transactions are read-only: updates and deletes by id only see the hot
+table.
+
+Usage (from the backend directory):
+    python -m app.core.archive run
+    python -m app.core.archive run --months 36 --no-vacuum
+    python -m app.core.archive status
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import date, datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import Date, DateTime, Float, Integer, String, bindparam, column, false, func, select, true, union_all
+
+from .cache import cached, read_cache
+from .config import settings
+from .database import connect_db, database, disconnect_db, get_read_database
+from .queries import PreparedQuery
+from .timeouts import current_statement_timeout
+from ..models.database_models import transactions_archive_table, transactions_table
+
+logger = logging.getLogger(__name__)
+
+def _add_months(month_start: date, months: int) -> date:
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def archive_cutoff(months: Optional[int] = None, today: Optional[date] = None) -> Optional[date]:
+    """First day not eligible for archiving, or None when archiving is off."""
+    months = settings.ARCHIVE_AFTER_MONTHS if months is None else months
+    if months <= 0:
+        return None
+    return _add_months((today or date.today()).replace(day=1), -months)
+
+# Latest control period or transaction date among a user's archived rows
+ARCHIVED_THROUGH_QUERY = PreparedQuery(
+    select(
+        func.greatest(
+            func.max(transactions_archive_table.c.control_date),
+            func.max(transactions_archive_table.c.last_date),
+        )
+    ).where(transactions_archive_table.c.user_id == bindparam("user_id"))
+)
+
+async def load_archived_through(db, user_id: int) -> date:
+    """Last day the user's archived rows cover, ``date.min`` when nothing is archived."""
+    return await ARCHIVED_THROUGH_QUERY.fetch_val(db, user_id=user_id) or date.min
+
+@cached("archive")
+async def archived_through(user_id: int) -> date:
+    """``load_archived_through`` for reads; archive runs invalidate it."""
+    return await load_archived_through(get_read_database(user_id), user_id)
+
+def reaches_archive(through: date, day: Optional[date]) -> bool:
+    """Whether a read starting at ``day`` (None: the beginning) needs archived
+    rows, for a user whose archive covers up to ``through``."""
+    return through > date.min and (day is None or day <= through)
+
+_archived = func.unnest(
+    transactions_archive_table.c.ids,
+    transactions_archive_table.c.descriptions,
+    transactions_archive_table.c.amounts,
+    transactions_archive_table.c.dates,
+    transactions_archive_table.c.categories,
+    transactions_archive_table.c.accounts,
+    transactions_archive_table.c.create_bys,
+    transactions_archive_table.c.create_dates,
+    transactions_archive_table.c.update_bys,
+    transactions_archive_table.c.update_dates,
+).table_valued(
+    column("id", Integer),
+    column("description", String),
+    column("amount", Float),
+    column("date", Date),
+    column("category", String),
+    column("account", String),
+    column("create_by", Integer),
+    column("create_date", DateTime),
+    column("update_by", Integer),
+    column("update_date", DateTime),
+).render_derived(name="archived")
+
+def ledger_transactions(
+    date_range: Optional[Tuple[str, str]] = None,
+    control_date_range: Optional[Tuple[str, str]] = None,
+):
+    """A user's hot and archived transactions, with the columns of ``transactions``
+    plus ``archived`` (true for rows read from the archive, which are read-only).
+
+    Both branches are restricted to ``bindparam("user_id")``. The names in
+    ``date_range`` (``[from, to)``) and ``control_date_range`` (inclusive)
+    are bind parameters the caller also filters on; they are used here to
+    skip archive rows whose periods cannot match before unnesting them.
+    """
+    hot = select(transactions_table, false().label("archived")).where(transactions_table.c.user_id == bindparam("user_id"))
+    archive = transactions_archive_table.c
+    archived = select(
+        _archived.c.id,
+        _archived.c.description,
+        _archived.c.amount,
+        _archived.c.date,
+        archive.control_date,
+        _archived.c.category,
+        _archived.c.account,
+        archive.user_id,
+        _archived.c.create_by,
+        _archived.c.create_date,
+        _archived.c.update_by,
+        _archived.c.update_date,
+        true().label("archived"),
+    ).select_from(transactions_archive_table).join(_archived, true()).where(
+        archive.user_id == bindparam("user_id")
+    )
+    if date_range is not None:
+        date_from, date_to = date_range
+        archived = archived.where(
+            archive.last_date >= bindparam(date_from),
+            archive.first_date < bindparam(date_to),
+        )
+    if control_date_range is not None:
+        control_date_from, control_date_to = control_date_range
+        archived = archived.where(
+            archive.control_date >= bindparam(control_date_from),
+            archive.control_date <= bindparam(control_date_to),
+        )
+    return union_all(hot, archived).subquery("ledger")
+
+# Moves one user's ($1) rows before the cutoff ($2) in a single statement,
+# merging them into any archive row already holding the period
+ARCHIVE_USER_SQL = """
+WITH moved AS (
+    DELETE FROM transactions
+    WHERE user_id = $1
+      AND control_date < $2
+      AND (date IS NULL OR date < $2)
+    RETURNING *
+)
+INSERT INTO transactions_archive AS a (
+    user_id, control_date, row_count, first_date, last_date,
+    ids, descriptions, amounts, dates, categories, accounts,
+    create_bys, create_dates, update_bys, update_dates, archived_at
+)
+SELECT user_id, control_date, count(*), min(date), max(date),
+       array_agg(id ORDER BY date, id), array_agg(description ORDER BY date, id),
+       array_agg(amount ORDER BY date, id), array_agg(date ORDER BY date, id),
+       array_agg(category ORDER BY date, id), array_agg(account ORDER BY date, id),
+       array_agg(create_by ORDER BY date, id), array_agg(create_date ORDER BY date, id),
+       array_agg(update_by ORDER BY date, id), array_agg(update_date ORDER BY date, id),
+       $3
+FROM moved
+GROUP BY user_id, control_date
+ON CONFLICT (user_id, control_date) DO UPDATE SET
+    row_count = a.row_count + EXCLUDED.row_count,
+    first_date = LEAST(a.first_date, EXCLUDED.first_date),
+    last_date = GREATEST(a.last_date, EXCLUDED.last_date),
+    ids = a.ids || EXCLUDED.ids,
+    descriptions = a.descriptions || EXCLUDED.descriptions,
+    amounts = a.amounts || EXCLUDED.amounts,
+    dates = a.dates || EXCLUDED.dates,
+    categories = a.categories || EXCLUDED.categories,
+    accounts = a.accounts || EXCLUDED.accounts,
+    create_bys = a.create_bys || EXCLUDED.create_bys,
+    create_dates = a.create_dates || EXCLUDED.create_dates,
+    update_bys = a.update_bys || EXCLUDED.update_bys,
+    update_dates = a.update_dates || EXCLUDED.update_dates,
+    archived_at = EXCLUDED.archived_at
+"""
+
+async def archive_transactions(months: Optional[int] = None, vacuum: bool = True) -> dict:
+    """Move every user's eligible transactions into the archive, one user per statement."""
+    cutoff = archive_cutoff(months)
+    if cutoff is None:
+        return {"cutoff": None, "users": 0, "periods": 0}
+    started = time.perf_counter()
+    user_ids = [row["id"] for row in await database.fetch_all(query="SELECT id FROM users ORDER BY id")]
+    archived_at = datetime.utcnow()
+    users = periods = 0
+    for user_id in user_ids:
+        async with database.connection() as connection:
+            status = await connection.raw_connection.execute(ARCHIVE_USER_SQL, user_id, cutoff, archived_at)
+        count = int(status.split()[-1])
+        if count:
+            users += 1
+            periods += count
+            # Switches the user's reads to the ledger on every worker
+            for resource in ("archive", "transactions"):
+                await read_cache.invalidate(resource, user_id)
+    if vacuum and users:
+        # Make the deleted rows' space reusable and refresh planner statistics
+        await database.execute(query="VACUUM (ANALYZE) transactions")
+    logger.info(
+        f"Archived {periods} user periods of {users} users before {cutoff} "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return {"cutoff": cutoff, "users": users, "periods": periods}
+
+async def archive_status() -> dict:
+    row = await database.fetch_one(
+        query="SELECT count(*) AS periods, count(DISTINCT user_id) AS users, "
+              "coalesce(sum(row_count), 0) AS transactions, min(control_date) AS oldest, "
+              "max(control_date) AS newest, pg_total_relation_size('transactions_archive') AS bytes "
+              "FROM transactions_archive"
+    )
+    hot = await database.fetch_one(
+        query="SELECT count(*) AS transactions, pg_total_relation_size('transactions') AS bytes FROM transactions"
+    )
+    return {
+        "cutoff": archive_cutoff(),
+        "archive": dict(row._mapping),
+        "hot": dict(hot._mapping),
+    }
+
+async def _main(args):
+    # Maintenance jobs may legitimately run for longer than request queries
+    current_statement_timeout.set(0)
+    await connect_db()
+    try:
+        if args.command == "run":
+            result = await archive_transactions(args.months, vacuum=not args.no_vacuum)
+            print(f"Archived {result['periods']} periods of {result['users']} users before {result['cutoff']}")
+        elif args.command == "status":
+            status = await archive_status()
+            print(f"Cutoff: {status['cutoff']}")
+            for name in ("hot", "archive"):
+                print(f"{name}: " + ", ".join(f"{k}={v}" for k, v in status[name].items()))
+    finally:
+        await disconnect_db()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive transactions of closed control periods")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="move eligible transactions into the archive")
+    run_parser.add_argument("--months", type=int, default=None, help="defaults to ARCHIVE_AFTER_MONTHS")
+    run_parser.add_argument("--no-vacuum", action="store_true", help="skip VACUUM (ANALYZE) afterwards")
+    subparsers.add_parser("status", help="show hot and archived row counts and sizes")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(parser.parse_args()))
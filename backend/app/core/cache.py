@@ -0,0 +1,261 @@
+"""
+Read-through cache for per-user service reads, with pluggable backends.
+"""
+
+import functools
+import inspect
+import logging
+import pickle
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .coalesce import read_coalescer
+from .config import settings
+from .invalidation import invalidation_bus
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+class MemoryBackend:
+    """Per-worker LRU of values with a per-entry expiry."""
+
+    name = "memory"
+    shared = False
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def discard(self, key: str):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+class RedisBackend:
+    """Values pickled into a Redis-compatible server shared by all workers.
+
+    Only point this at a server the app alone writes to: values are unpickled.
+    """
+
+    name = "redis"
+    shared = True
+
+    def __init__(self, url: str, prefix: str):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package")
+        self._client = redis.from_url(url)
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        data = await self._client.get(self._prefix + key)
+        if data is None:
+            return False, None
+        return True, pickle.loads(data)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await self._client.set(self._prefix + key, pickle.dumps(value), px=int(ttl * 1000))
+
+    async def delete(self, key: str):
+        await self._client.delete(self._prefix + key)
+
+    def size(self) -> Optional[int]:
+        return None
+
+class _ResourceStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+def _plain(value):
+    """Detach DB records into plain dicts so they can be shared and pickled."""
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    mapping = getattr(value, "_mapping", None)
+    return dict(mapping) if mapping is not None else value
+
+class ReadCache:
+    """Cache of per-user service reads keyed by resource and user.
+
+    A read made while the user has a write in progress skips the cache, so
+    checks inside writes see the database. Each invalidation bumps a
+    per-key version in this worker, and a value loaded across a version
+    change is returned but not stored, so a read racing a write cannot put
+    the old value back. Backend errors count as misses. ``None`` results are
+    not cached.
+    """
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.errors = 0
+        self._versions: Dict[str, int] = {}
+        self._stats: Dict[str, _ResourceStats] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def _resource_stats(self, resource: str) -> _ResourceStats:
+        stats = self._stats.get(resource)
+        if stats is None:
+            stats = self._stats[resource] = _ResourceStats()
+        return stats
+
+    async def get_or_load(self, resource: str, user_id: int, load):
+        stats = self._resource_stats(resource)
+        if read_coalescer.is_writing(user_id):
+            stats.bypassed += 1
+            return _plain(await load())
+
+        key = f"{resource}:{user_id}"
+        try:
+            found, value = await self.backend.get(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache get failed for {key}: {e}")
+            found, value = False, None
+        if found:
+            stats.hits += 1
+            return value
+
+        stats.misses += 1
+        version = self._versions.get(key, 0)
+        value = _plain(await load())
+        if value is not None and self._versions.get(key, 0) == version:
+            try:
+                await self.backend.set(key, value, self.ttl)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Cache set failed for {key}: {e}")
+        return value
+
+    async def invalidate(self, resource: str, user_id: int):
+        """Drop a user's cached value for a resource after it changed, here and on other workers.
+
+        The change is published even without a backend, for change notifications.
+        """
+        if self.backend is not None:
+            key = f"{resource}:{user_id}"
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self._resource_stats(resource).invalidations += 1
+            try:
+                await self.backend.delete(key)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Cache delete failed for {key}: {e}")
+        await invalidation_bus.publish(resource, user_id)
+
+    def forget(self, resource: str, user_id: int):
+        """Apply another worker's invalidation; a shared backend was already cleared by it."""
+        if self.backend is None:
+            return
+        key = f"{resource}:{user_id}"
+        self._versions[key] = self._versions.get(key, 0) + 1
+        if not self.backend.shared:
+            self.backend.discard(key)
+
+    def clear(self):
+        """Forget every worker-local value, e.g. after invalidations may have been missed."""
+        if self.backend is not None and not self.backend.shared:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        if self.backend is None:
+            return {"backend": None}
+        return {
+            "backend": self.backend.name,
+            "ttl": self.ttl,
+            "entries": self.backend.size(),
+            "errors": self.errors,
+            "resources": {name: stats.as_dict() for name, stats in self._stats.items()},
+        }
+
+def _create_backend():
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryBackend(settings.CACHE_MAX_ENTRIES)
+    if settings.CACHE_BACKEND == "redis":
+        return RedisBackend(settings.CACHE_REDIS_URL, settings.CACHE_KEY_PREFIX)
+    if settings.CACHE_BACKEND in ("", "none"):
+        return None
+    raise ValueError(f"Unsupported CACHE_BACKEND: {settings.CACHE_BACKEND}")
+
+read_cache = ReadCache(_create_backend(), settings.CACHE_TTL)
+invalidation_bus.add_handler(read_cache.forget)
+invalidation_bus.add_reset_handler(read_cache.clear)
+
+def cached(resource: str, *, user_arg: str = "user_id"):
+    """Serve a per-user service read through ``read_cache``.
+
+    The read must depend only on ``user_arg``; records it returns are cached
+    (and returned) as plain dicts.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if read_cache.backend is None:
+                return await func(*args, **kwargs)
+            user_id = signature.bind(*args, **kwargs).arguments[user_arg]
+            return await read_cache.get_or_load(resource, user_id, lambda: func(*args, **kwargs))
+
+        return wrapper
+    return decorator
+
+def invalidates(*resources: str, user_arg: str = "user_id"):
+    """Invalidate the user's cached ``resources`` after a service write, even if it raised."""
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            user_id = signature.bind(*args, **kwargs).arguments[user_arg]
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                for resource in resources:
+                    await read_cache.invalidate(resource, user_id)
+
+        return wrapper
+    return decorator
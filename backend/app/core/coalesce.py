@@ -0,0 +1,102 @@
+"""
+Single-flight coalescing of identical concurrent service reads.
+"""
+
+import asyncio
+import functools
+import inspect
+from typing import Any, Dict, Hashable
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers with the same key.
+
+    Keys are ``(name, user, args)``. While a user has a write in progress their
+    reads bypass coalescing, and in-flight entries for the user are dropped
+    when a write starts and ends, so nobody joins a read that may predate
+    their own write.
+    """
+
+    def __init__(self):
+        self._flights: Dict[tuple, asyncio.Future] = {}
+        self._writing: Dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    async def do(self, key: tuple, user: Hashable, func):
+        if user is not None and self._writing.get(user):
+            self.bypassed += 1
+            return await func()
+
+        flight = self._flights.get(key)
+        if flight is None:
+            self.misses += 1
+            # Run in its own task so one caller disconnecting does not cancel
+            # the query for everyone else sharing it
+            flight = asyncio.ensure_future(func())
+            self._flights[key] = flight
+            flight.add_done_callback(functools.partial(self._finish, key))
+        else:
+            self.hits += 1
+        return await asyncio.shield(flight)
+
+    def _finish(self, key: tuple, flight: asyncio.Future):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            flight.exception()
+
+    def forget_user(self, user: Hashable):
+        """Stop new callers from joining the user's in-flight reads."""
+        for key in [k for k in self._flights if k[1] == user]:
+            del self._flights[key]
+
+    def begin_write(self, user: Hashable):
+        self._writing[user] = self._writing.get(user, 0) + 1
+        self.forget_user(user)
+
+    def end_write(self, user: Hashable):
+        remaining = self._writing.get(user, 0) - 1
+        if remaining > 0:
+            self._writing[user] = remaining
+        else:
+            self._writing.pop(user, None)
+        self.forget_user(user)
+
+    def is_writing(self, user: Hashable) -> bool:
+        return bool(self._writing.get(user))
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "in_flight": len(self._flights),
+        }
+
+read_coalescer = SingleFlight()
+
+def coalesced(func=None, *, user_arg: str = "user_id"):
+    """Coalesce identical concurrent calls of a service read.
+
+    Calls are identical when all bound arguments are equal; ``user_arg`` names
+    the argument that identifies the user for write tracking.
+    """
+    if func is None:
+        return functools.partial(coalesced, user_arg=user_arg)
+
+    signature = inspect.signature(func)
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        key = (name, arguments.get(user_arg), tuple(arguments.items()))
+        return await read_coalescer.do(key, arguments.get(user_arg), lambda: func(*args, **kwargs))
+
+    return wrapper
@@ -0,0 +1,229 @@
+"""
+In-process per-user columnar copies of transactions for analytical reads.
+"""
+
+import asyncio
+import functools
+import logging
+import sys
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+from .config import settings
+from .invalidation import invalidation_bus
+from .responses import COLUMNAR_EPOCH
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+_EPOCH_ORDINAL = COLUMNAR_EPOCH.toordinal()
+
+def day_number(day: date) -> int:
+    return day.toordinal() - _EPOCH_ORDINAL
+
+class UserColumns:
+    """One user's dated transactions as NumPy columns, sorted by date.
+
+    Dates are int32 day numbers from ``COLUMNAR_EPOCH``, amounts int64 cents,
+    and category and account int32 codes into per-user dictionaries (a
+    missing value is ``""``). Sorting by date turns a date range into a slice.
+    """
+
+    def __init__(self, rows: Sequence):
+        categories: Dict[str, int] = {}
+        accounts: Dict[str, int] = {}
+        count = len(rows)
+        self.days = numpy.fromiter((day_number(r[0]) for r in rows), dtype=numpy.int32, count=count)
+        self.cents = numpy.fromiter((round((r[1] or 0) * 100) for r in rows), dtype=numpy.int64, count=count)
+        self.category_codes = numpy.fromiter(
+            (categories.setdefault(r[2], len(categories)) for r in rows), dtype=numpy.int32, count=count
+        )
+        self.account_codes = numpy.fromiter(
+            (accounts.setdefault(r[3], len(accounts)) for r in rows), dtype=numpy.int32, count=count
+        )
+        self.categories: List[str] = list(categories)
+        self.accounts: List[str] = list(accounts)
+        self._category_index = categories
+        self._account_index = accounts
+        self.nbytes = (
+            self.days.nbytes + self.cents.nbytes + self.category_codes.nbytes + self.account_codes.nbytes
+            + sum(sys.getsizeof(s) for s in self.categories) + sum(sys.getsizeof(s) for s in self.accounts)
+        )
+        self.loaded_at = time.monotonic()
+
+    def _select(self, date_from: date, date_to: date, account: Optional[str], category: Optional[str]):
+        """Row slice for ``[date_from, date_to)`` and a mask for the filters (None when unfiltered)."""
+        lo, hi = numpy.searchsorted(self.days, [day_number(date_from), day_number(date_to)], side="left")
+        rows = slice(int(lo), int(hi))
+        mask = None
+        for value, index, codes in (
+            (account, self._account_index, self.account_codes),
+            (category, self._category_index, self.category_codes),
+        ):
+            if value is None:
+                continue
+            code = index.get(value, -1)
+            matches = codes[rows] == code
+            mask = matches if mask is None else mask & matches
+        return rows, mask
+
+    def _weights(self, metric: str, rows: slice, mask):
+        cents = self.cents[rows]
+        if metric == "count":
+            weights = numpy.ones(len(cents), dtype=numpy.int64)
+        elif metric == "income":
+            weights = numpy.where(cents > 0, cents, 0)
+        elif metric == "expense":
+            weights = numpy.where(cents < 0, -cents, 0)
+        else:
+            weights = cents
+        return weights if mask is None else numpy.where(mask, weights, 0)
+
+    def _values(self, metric: str, totals) -> list:
+        if metric == "count":
+            return [int(v) for v in totals]
+        return [round(float(v) / 100, 2) for v in totals]
+
+    def series(
+        self, metric: str, starts: Sequence[date], end: date,
+        account: Optional[str] = None, category: Optional[str] = None
+    ) -> list:
+        """``metric`` per bucket, buckets beginning at ``starts`` and the last ending before ``end``."""
+        rows, mask = self._select(starts[0], end, account, category)
+        edges = numpy.fromiter((day_number(s) for s in starts), dtype=numpy.int32, count=len(starts))
+        buckets = numpy.searchsorted(edges, self.days[rows], side="right") - 1
+        weights = self._weights(metric, rows, mask)
+        totals = numpy.bincount(buckets, weights=weights, minlength=len(starts))
+        return self._values(metric, totals)
+
+    def breakdown(
+        self, by: str, metric: str, date_from: date, date_to: date,
+        account: Optional[str] = None, category: Optional[str] = None
+    ) -> tuple:
+        """Keys (sorted) and ``metric`` per category or account with rows in ``[date_from, date_to)``."""
+        rows, mask = self._select(date_from, date_to, account, category)
+        codes = (self.category_codes if by == "category" else self.account_codes)[rows]
+        dictionary = self.categories if by == "category" else self.accounts
+        present = numpy.ones(len(codes), dtype=numpy.int64) if mask is None else mask.astype(numpy.int64)
+        counts = numpy.bincount(codes, weights=present, minlength=len(dictionary))
+        totals = numpy.bincount(codes, weights=self._weights(metric, rows, mask), minlength=len(dictionary))
+        groups = sorted(numpy.flatnonzero(counts), key=lambda g: dictionary[g])
+        return [dictionary[g] for g in groups], self._values(metric, totals[groups])
+
+class ColumnarCache:
+    """LRU of ``UserColumns`` bounded by total array memory.
+
+    Concurrent misses for a user share one load. Writes call ``invalidate``,
+    which drops the user's copy and bumps a generation counter, so a load
+    that was already running when the write happened is used for that one
+    read but not kept. Entries also expire after ``ttl`` seconds, which bounds
+    how stale a copy can get from writes on other workers. State is per worker.
+    """
+
+    def __init__(self, enabled: bool, max_bytes: int, ttl: float):
+        if enabled and numpy is None:
+            logger.warning("ANALYTICS_CACHE_ENABLED is set but numpy is not installed; analytics cache disabled")
+            enabled = False
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[int, UserColumns]" = OrderedDict()
+        self._loading: Dict[int, asyncio.Future] = {}
+        self._generations: Dict[int, int] = {}
+
+    async def get(self, user_id: int, load: Callable[[], Awaitable[Sequence]]) -> UserColumns:
+        """The user's columns, loading them with ``load()`` (rows of date, amount, category, account) on a miss."""
+        columns = self._entries.get(user_id)
+        if columns is not None and time.monotonic() - columns.loaded_at < self.ttl:
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return columns
+        if columns is not None:
+            self._remove(user_id)
+
+        self.misses += 1
+        flight = self._loading.get(user_id)
+        if flight is None:
+            flight = asyncio.ensure_future(self._load(user_id, load))
+            self._loading[user_id] = flight
+            flight.add_done_callback(functools.partial(self._finish, user_id))
+        return await asyncio.shield(flight)
+
+    def _finish(self, user_id: int, flight: asyncio.Future):
+        if self._loading.get(user_id) is flight:
+            del self._loading[user_id]
+        if not flight.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            flight.exception()
+
+    async def _load(self, user_id: int, load) -> UserColumns:
+        generation = self._generations.get(user_id, 0)
+        columns = UserColumns(await load())
+        if self._generations.get(user_id, 0) == generation and columns.nbytes <= self.max_bytes:
+            self._store(user_id, columns)
+        return columns
+
+    def _store(self, user_id: int, columns: UserColumns):
+        if user_id in self._entries:
+            self._remove(user_id)
+        self._entries[user_id] = columns
+        self.bytes += columns.nbytes
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, user_id: int):
+        columns = self._entries.pop(user_id, None)
+        if columns is not None:
+            self.bytes -= columns.nbytes
+
+    def invalidate(self, user_id: int):
+        """Forget the user's columns after their transactions changed."""
+        if not self.enabled:
+            return
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        self._loading.pop(user_id, None)
+        self._remove(user_id)
+        self.invalidations += 1
+
+    def on_invalidation(self, resource: str, user_id: int):
+        """Apply another worker's invalidation of the user's transactions."""
+        if resource == "transactions":
+            self.invalidate(user_id)
+
+    def clear(self):
+        for user_id in list(self._entries):
+            self.invalidate(user_id)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "users": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+columnar_cache = ColumnarCache(
+    enabled=settings.ANALYTICS_CACHE_ENABLED,
+    max_bytes=settings.ANALYTICS_CACHE_MAX_BYTES,
+    ttl=settings.ANALYTICS_CACHE_TTL,
+)
+invalidation_bus.add_handler(columnar_cache.on_invalidation)
+invalidation_bus.add_reset_handler(columnar_cache.clear)
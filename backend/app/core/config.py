@@ -5,6 +5,27 @@ class Settings:
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "postgresql+psycopg2://user:password@db:5432/transactions")
     
+    # Optional read replica for user-scoped reads
+    READ_DATABASE_URL: str = os.getenv("READ_DATABASE_URL", "")
+    # Seconds a user's reads stay on the primary after they write (read-your-writes)
+    READ_YOUR_WRITES_WINDOW: float = float(os.getenv("READ_YOUR_WRITES_WINDOW", "5"))
+    
+    # Database connection pool (asyncpg)
+    DB_POOL_MIN_SIZE: int = int(os.getenv("DB_POOL_MIN_SIZE", "5"))
+    DB_POOL_MAX_SIZE: int = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+    DB_POOL_ACQUIRE_TIMEOUT: float = float(os.getenv("DB_POOL_ACQUIRE_TIMEOUT", "30"))
+    DB_POOL_MAX_INACTIVE_LIFETIME: float = float(os.getenv("DB_POOL_MAX_INACTIVE_LIFETIME", "300"))
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+    DB_MAX_CACHED_STATEMENT_LIFETIME: int = int(os.getenv("DB_MAX_CACHED_STATEMENT_LIFETIME", "3600"))
+    # statement_timeout of pooled connections (0 disables), set once per
+    # connection; the few heavy routes (analytics, balances, bulk writes,
+    # period recomputation, exports) raise it per request
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "10000"))
+    LONG_STATEMENT_TIMEOUT_MS: int = int(os.getenv("LONG_STATEMENT_TIMEOUT_MS", "30000"))
+    EXPORT_STATEMENT_TIMEOUT_MS: int = int(os.getenv("EXPORT_STATEMENT_TIMEOUT_MS", "300000"))
+    # Cancel GET requests (and their queries) when the client disconnects
+    CANCEL_ON_DISCONNECT: bool = os.getenv("CANCEL_ON_DISCONNECT", "true").lower() == "true"
+    
     # JWT
     JWT_SECRET: str = os.getenv("JWT_SECRET", "supersecretkey")
     JWT_ALGORITHM: str = "HS256"
@@ -19,6 +40,95 @@ class Settings:
         "http://localhost:3001",
     ]
     
+    # Response compression (bytes)
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    # Bodies/chunks at least this large are compressed in a worker thread
+    COMPRESSION_OFFLOAD_SIZE: int = int(os.getenv("COMPRESSION_OFFLOAD_SIZE", "262144"))
+    
+    # Admission control (per worker)
+    RATE_LIMIT_PER_SECOND: float = float(os.getenv("RATE_LIMIT_PER_SECOND", "20"))
+    RATE_LIMIT_BURST: float = float(os.getenv("RATE_LIMIT_BURST", "60"))
+    MAX_INFLIGHT_READ: int = int(os.getenv("MAX_INFLIGHT_READ", "64"))
+    MAX_INFLIGHT_WRITE: int = int(os.getenv("MAX_INFLIGHT_WRITE", "32"))
+    MAX_INFLIGHT_BULK: int = int(os.getenv("MAX_INFLIGHT_BULK", "4"))
+    # /dashboard runs up to 6 queries concurrently, each on its own pooled
+    # connection: it costs that many tokens and few run at once
+    MAX_INFLIGHT_DASHBOARD: int = int(os.getenv("MAX_INFLIGHT_DASHBOARD", "3"))
+    DASHBOARD_ADMISSION_COST: float = float(os.getenv("DASHBOARD_ADMISSION_COST", "6"))
+    # GET requests with a larger ?limit= are admitted as bulk
+    ADMISSION_LARGE_READ_LIMIT: int = int(os.getenv("ADMISSION_LARGE_READ_LIMIT", "5000"))
+    
+    # Transactions table partitioning: "" (none), "range" (monthly on control_date)
+    # or "hash" (on user_id). Only applies when the table is first created.
+    TRANSACTIONS_PARTITIONING: str = os.getenv("TRANSACTIONS_PARTITIONING", "").lower()
+    TRANSACTIONS_HASH_PARTITIONS: int = int(os.getenv("TRANSACTIONS_HASH_PARTITIONS", "16"))
+    # Monthly range partitions kept created around the current month
+    TRANSACTIONS_PARTITIONS_BEHIND: int = int(os.getenv("TRANSACTIONS_PARTITIONS_BEHIND", "24"))
+    TRANSACTIONS_PARTITIONS_AHEAD: int = int(os.getenv("TRANSACTIONS_PARTITIONS_AHEAD", "3"))
+    
+    # Slow query capture (0 disables). Plans are captured at most once per
+    # SLOW_QUERY_EXPLAIN_INTERVAL seconds per statement.
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    SLOW_QUERY_SAMPLE_RATE: float = float(os.getenv("SLOW_QUERY_SAMPLE_RATE", "1.0"))
+    SLOW_QUERY_EXPLAIN_INTERVAL: float = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "300"))
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = int(os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", "10000"))
+    SLOW_QUERY_MAX_ENTRIES: int = int(os.getenv("SLOW_QUERY_MAX_ENTRIES", "200"))
+    
+    # Usernames allowed to use the /admin endpoints (comma-separated)
+    ADMIN_USERNAMES: List[str] = [u.strip() for u in os.getenv("ADMIN_USERNAMES", "").split(",") if u.strip()]
+    
+    # Schema migrations run as a deploy step before the server starts
+    # (python -m app.core.migrations upgrade; the Docker image does this).
+    # MIGRATE_ON_STARTUP also applies them at boot, except the online index
+    # builds (transactional = False), which are always left to that step.
+    MIGRATE_ON_STARTUP: bool = os.getenv("MIGRATE_ON_STARTUP", "false").lower() == "true"
+    MIGRATION_LOCK_TIMEOUT: str = os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
+    
+    # Read-through cache for per-user service reads: "memory" (per worker),
+    # "redis" (shared, requires the redis package) or "none"
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory").lower()
+    CACHE_TTL: float = float(os.getenv("CACHE_TTL", "60"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_KEY_PREFIX: str = os.getenv("CACHE_KEY_PREFIX", "fin2:")
+    
+    # Broadcast cache invalidations to the other workers with NOTIFY on this
+    # channel; each worker keeps one extra connection LISTENing on it
+    CACHE_INVALIDATION_ENABLED: bool = os.getenv("CACHE_INVALIDATION_ENABLED", "true").lower() == "true"
+    CACHE_INVALIDATION_CHANNEL: str = os.getenv("CACHE_INVALIDATION_CHANNEL", "fin2_cache_invalidation")
+    
+    # Per-user NumPy copies of transactions answering /analytics reads in
+    # memory (requires numpy). Copies are dropped on the user's writes and
+    # expire after ANALYTICS_CACHE_TTL seconds; memory is per worker.
+    ANALYTICS_CACHE_ENABLED: bool = os.getenv("ANALYTICS_CACHE_ENABLED", "false").lower() == "true"
+    ANALYTICS_CACHE_MAX_BYTES: int = int(os.getenv("ANALYTICS_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    ANALYTICS_CACHE_TTL: float = float(os.getenv("ANALYTICS_CACHE_TTL", "300"))
+    # Longest series /analytics/series returns, in buckets
+    ANALYTICS_MAX_BUCKETS: int = int(os.getenv("ANALYTICS_MAX_BUCKETS", "3660"))
+    
+    # Server-sent change events (/events): open streams per worker, and
+    # seconds between keepalive comments on idle streams
+    EVENTS_MAX_CONNECTIONS: int = int(os.getenv("EVENTS_MAX_CONNECTIONS", "10000"))
+    EVENTS_HEARTBEAT: float = float(os.getenv("EVENTS_HEARTBEAT", "25"))
+    
+    # Transactions whose control period and date are older than this many
+    # months are moved into transactions_archive by ``python -m app.core.archive
+    # run``; reads reaching a user's archived periods union it in. 0 disables
+    # archiving; rows already archived stay readable.
+    ARCHIVE_AFTER_MONTHS: int = int(os.getenv("ARCHIVE_AFTER_MONTHS", "24"))
+    
+    # Rows per record batch (Parquet row group) in /transactions/export
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", "50000"))
+    
+    # Logging: "json" (one object per line) or "text"; records go through a
+    # queue of LOG_QUEUE_SIZE to a writer thread and are dropped when it is
+    # full. LOG_SAMPLING keeps a fraction of the sub-WARNING records of
+    # busy loggers, e.g. "app.routes.transactions=0.1,app.routes.dashboard=0.5".
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json").lower()
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_SAMPLING: str = os.getenv("LOG_SAMPLING", "app.routes.transactions=0.1")
+    
     # App
     APP_NAME: str = "Finance Tracker API"
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
@@ -1,49 +1,200 @@
 import databases
 import sqlalchemy
 import asyncio
+import functools
+import inspect
 import logging
 import time
+from typing import Dict, Optional
+from .coalesce import read_coalescer
 from .config import settings
+from .slow_queries import slow_query_log
+from .timeouts import apply_statement_timeout, query_cancellations
 
 logger = logging.getLogger(__name__)
 
+def _split_url(url: str):
+    """Split a database URL into its scheme and the remainder."""
+    scheme, _, rest = url.partition("://")
+    if scheme.split("+", 1)[0] not in ("postgres", "postgresql"):
+        raise ValueError(f"Unsupported database scheme: {scheme}")
+    return scheme, rest
+
 # Database setup with error handling
-def get_database_url():
-    """Get database URL with proper format."""
-    url = settings.DATABASE_URL
-    # Ensure we're using the correct PostgreSQL driver
-    if url.startswith('postgres://'):
-        url = url.replace('postgres://', 'postgresql+psycopg2://', 1)
-    elif url.startswith('postgresql://') and '+psycopg2' not in url:
-        url = url.replace('postgresql://', 'postgresql+psycopg2://', 1)
-    return url
+def get_database_url(url: Optional[str] = None):
+    """Get database URL for the async (asyncpg) query path."""
+    _, rest = _split_url(url or settings.DATABASE_URL)
+    return f"postgresql+asyncpg://{rest}"
+
+def get_dsn():
+    """Get a plain postgresql:// DSN for direct asyncpg connections (migrations)."""
+    _, rest = _split_url(settings.DATABASE_URL)
+    return f"postgresql://{rest}"
+
+class MonitoredPool:
+    """Proxy around an asyncpg pool that records acquire wait time and timeouts."""
+
+    def __init__(self, pool, acquire_timeout: float):
+        self._pool = pool
+        self._acquire_timeout = acquire_timeout
+        self.acquire_count = 0
+        self.acquire_timeouts = 0
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+    async def acquire(self, *, timeout=None):
+        start_time = time.perf_counter()
+        self.waiting += 1
+        try:
+            connection = await self._pool.acquire(timeout=timeout or self._acquire_timeout)
+        except asyncio.TimeoutError:
+            self.acquire_timeouts += 1
+            logger.warning(f"Timed out acquiring a database connection after {self._acquire_timeout}s")
+            raise
+        finally:
+            self.waiting -= 1
+        try:
+            await apply_statement_timeout(connection)
+        except BaseException:
+            await self._pool.release(connection)
+            raise
+
+        wait = time.perf_counter() - start_time
+        self.acquire_count += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        return connection
+
+    def stats(self) -> dict:
+        """Return a snapshot of pool usage for monitoring."""
+        size = self._pool.get_size()
+        idle = self._pool.get_idle_size()
+        avg_wait = self.total_wait / self.acquire_count if self.acquire_count else 0.0
+        return {
+            "min_size": self._pool.get_min_size(),
+            "max_size": self._pool.get_max_size(),
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "waiting": self.waiting,
+            "acquire_count": self.acquire_count,
+            "acquire_timeouts": self.acquire_timeouts,
+            "avg_wait_ms": round(avg_wait * 1000, 3),
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
 
 # Database connection
 database_url = get_database_url()
-logger.info("Using database URL with PostgreSQL driver")
+logger.info("Using database URL with asyncpg driver")
+
+def _create_database(url: str) -> databases.Database:
+    """Create an async database; options are passed through to asyncpg.create_pool."""
+    async def init_connection(connection):
+        slow_query_log.instrument(connection, db)
+        connection.add_query_logger(query_cancellations.observe)
+
+    db = databases.Database(
+        url,
+        init=init_connection,
+        min_size=settings.DB_POOL_MIN_SIZE,
+        max_size=settings.DB_POOL_MAX_SIZE,
+        max_inactive_connection_lifetime=settings.DB_POOL_MAX_INACTIVE_LIFETIME,
+        statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        max_cached_statement_lifetime=settings.DB_MAX_CACHED_STATEMENT_LIFETIME,
+        server_settings={"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)},
+    )
+    return db
+
+# Primary pool serving every write and any read not routed to the replica
+database = _create_database(database_url)
+
+# Optional replica pool for user-scoped reads
+read_database: Optional[databases.Database] = None
+if settings.READ_DATABASE_URL:
+    read_database = _create_database(get_database_url(settings.READ_DATABASE_URL))
+    logger.info("Read replica configured for user-scoped reads")
 
-database = databases.Database(database_url)
 metadata = sqlalchemy.MetaData()
 
-# Create engine with optimized connection pooling
-engine = sqlalchemy.create_engine(
-    database_url,
-    pool_pre_ping=True,
-    pool_recycle=3600,  # 1 hour instead of 5 minutes for better performance
-    pool_size=20,       # Explicit pool size for better resource management
-    max_overflow=30,    # Allow overflow connections for peak loads
-    pool_timeout=30,    # Connection timeout
-    echo=settings.DEBUG
-)
-
-def create_tables():
-    """Create all tables in the database."""
-    metadata.create_all(engine)
+# Last write time per user, used to keep read-your-writes consistency
+_recent_writes: Dict[int, float] = {}
+_RECENT_WRITES_PRUNE_SIZE = 10000
+
+def mark_user_write(user_id: int):
+    """Record that a user wrote, pinning their reads to the primary for a while."""
+    if read_database is None:
+        return
+    now = time.monotonic()
+    if len(_recent_writes) >= _RECENT_WRITES_PRUNE_SIZE:
+        cutoff = now - settings.READ_YOUR_WRITES_WINDOW
+        for key in [k for k, t in _recent_writes.items() if t < cutoff]:
+            del _recent_writes[key]
+    _recent_writes[user_id] = now
+
+def get_read_database(user_id: int) -> databases.Database:
+    """Get the database a user's read should go to.
+
+    Reads go to the replica unless none is configured or the user wrote within
+    READ_YOUR_WRITES_WINDOW seconds, in which case the primary is used so they
+    see their own changes despite replication lag.
+    """
+    if read_database is None:
+        return database
+    last_write = _recent_writes.get(user_id)
+    if last_write is not None:
+        if time.monotonic() - last_write < settings.READ_YOUR_WRITES_WINDOW:
+            return database
+        del _recent_writes[user_id]
+    return read_database
+
+def writes_user_data(func):
+    """Mark a service write so the user's reads stay on the primary.
+
+    The decorated coroutine must take a ``user_id`` argument. The user is marked
+    both before the write (so ownership checks inside it read the primary) and
+    after it (so the window starts when the write is visible). While the write
+    runs, the user's reads are not coalesced with reads that may predate it.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        user_id = signature.bind(*args, **kwargs).arguments["user_id"]
+        mark_user_write(user_id)
+        read_coalescer.begin_write(user_id)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            read_coalescer.end_write(user_id)
+            mark_user_write(user_id)
+
+    return wrapper
+
+def get_pool_stats(db: databases.Database = database) -> dict:
+    """Get connection pool statistics, or an empty dict when not connected."""
+    pool = db._backend._pool
+    if isinstance(pool, MonitoredPool):
+        return pool.stats()
+    return {}
+
+async def _connect(db: databases.Database):
+    await db.connect()
+    # databases acquires connections through the backend's pool attribute,
+    # so wrapping it here instruments every request.
+    db._backend._pool = MonitoredPool(db._backend._pool, settings.DB_POOL_ACQUIRE_TIMEOUT)
 
 async def connect_db():
-    """Connect to the database."""
-    await database.connect()
+    """Connect to the database (and the read replica, if configured)."""
+    await _connect(database)
+    if read_database is not None:
+        await _connect(read_database)
 
 async def disconnect_db():
-    """Disconnect from the database."""
-    await database.disconnect()
\ No newline at end of file
+    """Disconnect from the database (and the read replica, if configured)."""
+    await database.disconnect()
+    if read_database is not None:
+        await read_database.disconnect()
@@ -0,0 +1,116 @@
+"""
+Per-user change notifications pushed to clients as server-sent events.
+"""
+
+import asyncio
+from typing import AsyncIterator, Dict, Optional, Set
+
+import orjson
+
+from .config import settings
+from .invalidation import invalidation_bus
+
+# Sent when changes may have been missed; clients should refetch everything
+RESYNC = "*"
+
+class Subscriber:
+    """One connected client: the resources changed since its last delivery."""
+
+    __slots__ = ("user_id", "pending", "wakeup")
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.pending: Set[str] = set()
+        self.wakeup = asyncio.Event()
+
+class ChangeEvents:
+    """Fan out ``(resource, user_id)`` changes to the user's open event streams.
+
+    Changes arrive through the invalidation bus: this worker's writes
+    directly and other workers' over LISTEN/NOTIFY. A subscriber keeps only
+    the set of changed resource names until its stream sends them, so a
+    slow or idle client costs a few small objects however many writes
+    happen, and bursts of writes collapse into one event per resource.
+    """
+
+    def __init__(self, max_connections: int, heartbeat: float):
+        self.max_connections = max_connections
+        self.heartbeat = heartbeat
+        self.rejected = 0
+        self.delivered = 0
+        self._subscribers: Dict[int, Set[Subscriber]] = {}
+        self._connections = 0
+
+    def notify(self, resource: str, user_id: int):
+        for subscriber in self._subscribers.get(user_id, ()):
+            subscriber.pending.add(resource)
+            subscriber.wakeup.set()
+
+    def resync(self):
+        for subscribers in self._subscribers.values():
+            for subscriber in subscribers:
+                subscriber.pending.add(RESYNC)
+                subscriber.wakeup.set()
+
+    def subscribe(self, user_id: int) -> Optional[Subscriber]:
+        """Register a stream for the user, or return None when this worker is at capacity."""
+        if self._connections >= self.max_connections:
+            self.rejected += 1
+            return None
+        subscriber = Subscriber(user_id)
+        self._subscribers.setdefault(user_id, set()).add(subscriber)
+        self._connections += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        subscribers = self._subscribers.get(subscriber.user_id)
+        if subscribers is None or subscriber not in subscribers:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self._subscribers[subscriber.user_id]
+        self._connections -= 1
+
+    async def stream(self, subscriber: Subscriber) -> AsyncIterator[bytes]:
+        """SSE bytes for a subscriber until the client goes away.
+
+        Each change is ``event: change`` with ``{"resource": ...}``; after a
+        lost invalidation listener it is ``event: resync``. Comment lines
+        every ``heartbeat`` seconds keep proxies from closing idle streams.
+        """
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                try:
+                    await asyncio.wait_for(subscriber.wakeup.wait(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                subscriber.wakeup.clear()
+                resources = sorted(subscriber.pending)
+                subscriber.pending.clear()
+                if RESYNC in resources:
+                    self.delivered += 1
+                    yield b"event: resync\ndata: {}\n\n"
+                    continue
+                self.delivered += len(resources)
+                for resource in resources:
+                    yield b"event: change\ndata: " + orjson.dumps({"resource": resource}) + b"\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> dict:
+        return {
+            "connections": self._connections,
+            "users": len(self._subscribers),
+            "max_connections": self.max_connections,
+            "delivered": self.delivered,
+            "rejected": self.rejected,
+        }
+
+change_events = ChangeEvents(
+    max_connections=settings.EVENTS_MAX_CONNECTIONS,
+    heartbeat=settings.EVENTS_HEARTBEAT,
+)
+invalidation_bus.add_handler(change_events.notify, local=True)
+invalidation_bus.add_reset_handler(change_events.resync)
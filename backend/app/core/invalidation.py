@@ -0,0 +1,162 @@
+"""
+Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from typing import Callable, List, Optional
+
+import asyncpg
+from sqlalchemy import bindparam, func, select
+
+from .config import settings
+from .database import database, mark_user_write
+from .queries import PreparedQuery
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_QUERY = PreparedQuery(
+    select(func.pg_notify(bindparam("channel"), bindparam("payload")))
+)
+
+class InvalidationBus:
+    """Broadcast ``(resource, user_id)`` invalidations to every worker.
+
+    Writers evict their own caches and then ``publish`` once the write has
+    returned: the NOTIFY is a separate statement on whichever pooled
+    connection it acquires, so it is not tied to the write's transaction and
+    is also sent when the write failed. Each worker holds one dedicated LISTEN connection
+    and passes events from other workers to the registered handlers;
+    handlers added with ``local=True`` also get this worker's own events.
+    When that connection drops, events may have been missed, so the reset
+    handlers clear every cache before listening again.
+    """
+
+    def __init__(self, channel: str, enabled: bool, reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        self.channel = channel
+        self.enabled = enabled
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.published = 0
+        self.publish_errors = 0
+        self.received = 0
+        self.reconnects = 0
+        self._handlers: List[Callable[[str, int], None]] = []
+        self._local_handlers: List[Callable[[str, int], None]] = []
+        self._reset_handlers: List[Callable[[], None]] = []
+        self._connection: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lost: Optional[asyncio.Event] = None
+
+    def add_handler(self, handler: Callable[[str, int], None], local: bool = False):
+        """Call ``handler(resource, user_id)`` for invalidations from other workers,
+        and with ``local`` also for those published by this worker."""
+        self._handlers.append(handler)
+        if local:
+            self._local_handlers.append(handler)
+
+    def add_reset_handler(self, handler: Callable[[], None]):
+        """Call ``handler()`` when invalidations may have been missed."""
+        self._reset_handlers.append(handler)
+
+    async def publish(self, resource: str, user_id: int):
+        for handler in self._local_handlers:
+            handler(resource, user_id)
+        if not self.enabled:
+            return
+        payload = json.dumps({"worker": self.worker_id, "resource": resource, "user_id": user_id})
+        try:
+            await NOTIFY_QUERY.fetch_val(database, channel=self.channel, payload=payload)
+            self.published += 1
+        except Exception as e:
+            # Other workers fall back to their caches' TTLs
+            self.publish_errors += 1
+            logger.warning(f"Could not publish invalidation of {resource} for user {user_id}: {e}")
+
+    def _on_notification(self, connection, pid, channel, payload):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed invalidation: {payload[:200]}")
+            return
+        if event.get("worker") == self.worker_id:
+            return
+        self.received += 1
+        for handler in self._handlers:
+            handler(event["resource"], event["user_id"])
+
+    def _on_termination(self, connection):
+        if self._lost is not None:
+            self._lost.set()
+
+    def _reset(self):
+        for handler in self._reset_handlers:
+            handler()
+
+    async def _listen(self, dsn: str):
+        delay = self.reconnect_delay
+        attempts = 0
+        while True:
+            connection = None
+            try:
+                self._lost = asyncio.Event()
+                connection = await asyncpg.connect(dsn)
+                connection.add_termination_listener(self._on_termination)
+                await connection.add_listener(self.channel, self._on_notification)
+                self._connection = connection
+                if attempts:
+                    self.reconnects += 1
+                    logger.info("Cache invalidation listener reconnected")
+                # Values cached while not listening may have missed an event
+                self._reset()
+                delay = self.reconnect_delay
+                await self._lost.wait()
+                logger.warning("Cache invalidation listener connection lost; clearing local caches")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener could not connect: {e}")
+            finally:
+                self._connection = None
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            self._reset()
+            attempts += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def start(self, dsn: str):
+        if self.enabled and self._task is None:
+            self._task = asyncio.ensure_future(self._listen(dsn))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "listening": self._connection is not None and not self._connection.is_closed(),
+            "published": self.published,
+            "publish_errors": self.publish_errors,
+            "received": self.received,
+            "reconnects": self.reconnects,
+        }
+
+invalidation_bus = InvalidationBus(
+    channel=settings.CACHE_INVALIDATION_CHANNEL,
+    enabled=settings.CACHE_INVALIDATION_ENABLED,
+)
+# Another worker's write may not have reached the replica yet: keep this
+# worker's reads of that user on the primary too, so they neither serve nor
+# re-cache the old value
+invalidation_bus.add_handler(lambda resource, user_id: mark_user_write(user_id))
@@ -0,0 +1,185 @@
+"""
+Non-blocking structured logging.
+
+Records are put on a bounded in-memory queue by the thread that logs them
+and written to stderr by a background thread, so a request never waits on
+the terminal or the log collector; uvicorn's server and access logs take
+the same path. Below WARNING, records from loggers
+listed in LOG_SAMPLING are kept at the configured rate; warnings and
+errors are always kept. When the queue is full, records are dropped and
+counted instead of blocking.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+from typing import Dict, Optional
+
+import orjson
+
+from .config import settings
+from .slow_queries import current_route
+
+# Loggers uvicorn configures with handlers of their own
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "route"}
+
+def parse_sampling(spec: str) -> Dict[str, float]:
+    """Parse ``"logger.name=0.1,other=0.5"`` into rates per logger name."""
+    rates = {}
+    for part in spec.split(","):
+        name, _, rate = part.strip().partition("=")
+        if name and rate:
+            rates[name] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, route, extras and exception."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        document = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        route = getattr(record, "route", None)
+        if route:
+            document["route"] = route
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                document[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            document["exception"] = record.exc_text
+        return orjson.dumps(document, default=str).decode()
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of sub-WARNING records per logger (longest matching name prefix wins)."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.sampled_out: Dict[str, int] = {}
+        self._resolved: Dict[str, Optional[float]] = {}
+
+    def _rate(self, name: str) -> Optional[float]:
+        if name not in self._resolved:
+            prefix = name
+            rate = None
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition(".")[0]
+            self._resolved[name] = rate
+        return self._resolved[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate is None or rate >= 1.0:
+            return True
+        if random.random() < rate:
+            record.sample_rate = rate
+            return True
+        self.sampled_out[record.name] = self.sampled_out.get(record.name, 0) + 1
+        return False
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of blocking or erroring."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+        self._last_drop_warning = 0.0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve what depends on the logging thread (message arguments,
+        # the traceback, the request's route); the writer thread formats
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.route = current_route.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+            now = time.monotonic()
+            if now - self._last_drop_warning >= 60:
+                self._last_drop_warning = now
+                print(f"Log queue full; {self.dropped} records dropped so far", file=sys.stderr)
+
+class LogPipeline:
+    """The installed queue handler, its writer thread and the sampling filter."""
+
+    def __init__(self):
+        self.handler: Optional[DroppingQueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.sampling: Optional[SamplingFilter] = None
+
+    def setup(self):
+        """Route the root logger through a queue to a background writer; safe to call twice."""
+        if self.handler is not None:
+            return
+        stream = logging.StreamHandler(sys.stderr)
+        if settings.LOG_FORMAT == "json":
+            stream.setFormatter(JSONFormatter())
+        else:
+            stream.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+        self.sampling = SamplingFilter(parse_sampling(settings.LOG_SAMPLING))
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+        self.handler.addFilter(self.sampling)
+        self.listener = logging.handlers.QueueListener(self.handler.queue, stream, respect_handler_level=True)
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(logging.DEBUG if settings.DEBUG else settings.LOG_LEVEL)
+        # uvicorn installs its own synchronous handlers with propagate off;
+        # send its error and access logs through the queue as well
+        for name in UVICORN_LOGGERS:
+            server_logger = logging.getLogger(name)
+            for handler in list(server_logger.handlers):
+                server_logger.removeHandler(handler)
+            server_logger.propagate = True
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Write out queued records and stop the writer thread."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def stats(self) -> dict:
+        if self.handler is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "format": settings.LOG_FORMAT,
+            "queued": self.handler.queue.qsize(),
+            "enqueued": self.handler.enqueued,
+            "dropped": self.handler.dropped,
+            "sampled_out": dict(self.sampling.sampled_out),
+        }
+
+log_pipeline = LogPipeline()
@@ -0,0 +1,226 @@
+"""
+Versioned schema migrations.
+
+Migrations are modules in ``app/migrations`` named ``NNNN_description.py``.
+Each defines ``async def upgrade(conn)`` taking a raw asyncpg connection, and
+may set ``transactional = False`` when it cannot run inside a transaction
+(``CREATE INDEX CONCURRENTLY``). Applied versions are recorded in the
+``schema_migrations`` table and a session advisory lock makes sure concurrent
+runners (several workers, a deploy job) apply each migration exactly once.
+
+Usage (from the backend directory):
+    python -m app.core.migrations upgrade [--target 0002]
+    python -m app.core.migrations status
+"""
+
+import argparse
+import asyncio
+import importlib
+import logging
+import pkgutil
+import re
+import time
+from typing import Dict, List, Optional
+
+import asyncpg
+
+from .config import settings
+from .database import get_dsn
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PACKAGE = "app.migrations"
+MIGRATIONS_TABLE = "schema_migrations"
+# Arbitrary key for pg_advisory_lock, shared by every migration runner
+ADVISORY_LOCK_ID = 0x66696E32
+_MODULE_NAME = re.compile(r"^(\d{4})_(\w+)$")
+
+class Migration:
+    def __init__(self, version: str, name: str, module):
+        self.version = version
+        self.name = name
+        self.module = module
+        self.transactional = getattr(module, "transactional", True)
+
+    def __repr__(self):
+        return f"{self.version}_{self.name}"
+
+def discover_migrations() -> List[Migration]:
+    """All migration modules, ordered by version."""
+    package = importlib.import_module(MIGRATIONS_PACKAGE)
+    migrations = []
+    for module_info in pkgutil.iter_modules(package.__path__):
+        match = _MODULE_NAME.match(module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{MIGRATIONS_PACKAGE}.{module_info.name}")
+        migrations.append(Migration(match.group(1), match.group(2), module))
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions in {MIGRATIONS_PACKAGE}: {versions}")
+    return migrations
+
+async def _applied_versions(conn) -> Dict[str, dict]:
+    await conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+            version VARCHAR PRIMARY KEY,
+            name VARCHAR NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+            duration_ms INTEGER NOT NULL
+        )
+    """)
+    rows = await conn.fetch(f"SELECT version, name, applied_at, duration_ms FROM {MIGRATIONS_TABLE}")
+    return {row["version"]: dict(row) for row in rows}
+
+async def _apply(conn, migration: Migration):
+    logger.info(f"Applying migration {migration}")
+    started = time.perf_counter()
+
+    async def record():
+        await conn.execute(
+            f"INSERT INTO {MIGRATIONS_TABLE} (version, name, duration_ms) VALUES ($1, $2, $3)",
+            migration.version, migration.name, int((time.perf_counter() - started) * 1000),
+        )
+
+    if migration.transactional:
+        async with conn.transaction():
+            # Fail fast instead of queueing every query behind a blocked ALTER
+            await conn.execute(f"SET LOCAL lock_timeout = '{settings.MIGRATION_LOCK_TIMEOUT}'")
+            await migration.module.upgrade(conn)
+            await record()
+    else:
+        # Statements run in autocommit mode; they must be safe to re-run if the
+        # migration is interrupted before it is recorded.
+        await migration.module.upgrade(conn)
+        await record()
+    logger.info(f"Applied migration {migration} in {time.perf_counter() - started:.1f}s")
+
+async def upgrade(
+    target: Optional[str] = None, dsn: Optional[str] = None, transactional_only: bool = False
+) -> List[str]:
+    """Apply pending migrations up to ``target`` (inclusive); returns the versions applied.
+
+    With ``transactional_only`` (application startup) the run stops before the
+    first pending ``transactional = False`` migration: those build indexes
+    online and can take as long as the table is large, so they are left to
+    the CLI instead of holding up readiness.
+    """
+    migrations = discover_migrations()
+    conn = await asyncpg.connect(dsn or get_dsn())
+    try:
+        # Index builds can take a while; no server-side timeout for this session
+        await conn.execute("SET statement_timeout = 0")
+        await conn.execute("SELECT pg_advisory_lock($1)", ADVISORY_LOCK_ID)
+        try:
+            applied = await _applied_versions(conn)
+            done = []
+            for migration in migrations:
+                if target is not None and migration.version > target:
+                    break
+                if migration.version in applied:
+                    continue
+                if transactional_only and not migration.transactional:
+                    logger.warning(
+                        f"Migration {migration} and later ones are pending; "
+                        "apply them with: python -m app.core.migrations upgrade"
+                    )
+                    break
+                await _apply(conn, migration)
+                done.append(migration.version)
+            return done
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", ADVISORY_LOCK_ID)
+    finally:
+        await conn.close()
+
+async def status(dsn: Optional[str] = None) -> List[dict]:
+    """Every known migration with its applied time (None when pending)."""
+    conn = await asyncpg.connect(dsn or get_dsn())
+    try:
+        applied = await _applied_versions(conn)
+    finally:
+        await conn.close()
+    return [
+        {
+            "version": m.version,
+            "name": m.name,
+            "applied_at": applied.get(m.version, {}).get("applied_at"),
+        }
+        for m in discover_migrations()
+    ]
+
+# Helpers for migration modules
+
+async def table_exists(conn, table: str) -> bool:
+    return await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", table)
+
+async def _partitions_of(conn, table: str) -> Optional[List[str]]:
+    """Partition names of a partitioned table, or None for a plain table."""
+    partitioned = await conn.fetchval(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass($1))", table
+    )
+    if not partitioned:
+        return None
+    rows = await conn.fetch(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass($1) ORDER BY c.relname",
+        table,
+    )
+    return [row["relname"] for row in rows]
+
+async def create_index_concurrently(conn, name: str, table: str, columns: str, unique: bool = False):
+    """Build an index without blocking writes to ``table``.
+
+    Must be called from a ``transactional = False`` migration. A build that was
+    interrupted leaves an invalid index behind, which is dropped and rebuilt.
+    Partitioned tables do not support CONCURRENTLY, so the parent index is
+    created on the parent only and each partition's index is built
+    concurrently and attached to it.
+    """
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    partitions = await _partitions_of(conn, table)
+    if partitions is None:
+        invalid = await conn.fetchval(
+            "SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass($1)", name
+        )
+        if invalid:
+            logger.warning(f"Dropping invalid index {name} left by an interrupted build")
+            await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        await conn.execute(f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+        return
+
+    await conn.execute(f"CREATE {kind} IF NOT EXISTS {name} ON ONLY {table} ({columns})")
+    for partition in partitions:
+        child = f"{partition}_{name}"[:63]
+        await create_index_concurrently(conn, child, partition, columns, unique)
+        # A no-op when the index is already attached
+        await conn.execute(f"ALTER INDEX {name} ATTACH PARTITION {child}")
+
+async def drop_index_concurrently(conn, name: str):
+    """Drop an index without blocking writes (plain DROP for partitioned indexes)."""
+    partitioned = await conn.fetchval(
+        "SELECT EXISTS (SELECT 1 FROM pg_class WHERE oid = to_regclass($1) AND relkind = 'I')", name
+    )
+    if partitioned:
+        await conn.execute(f"DROP INDEX IF EXISTS {name}")
+    else:
+        await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+async def _main(args):
+    if args.command == "upgrade":
+        applied = await upgrade(args.target)
+        print(f"Applied {len(applied)} migrations: {', '.join(applied) or '-'}")
+    elif args.command == "status":
+        for entry in await status():
+            state = f"applied {entry['applied_at']:%Y-%m-%d %H:%M:%S}" if entry["applied_at"] else "pending"
+            print(f"{entry['version']}  {entry['name']:<40} {state}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage database schema migrations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = subparsers.add_parser("upgrade", help="apply pending migrations")
+    upgrade_parser.add_argument("--target", help="stop after this version")
+    subparsers.add_parser("status", help="list migrations and whether they are applied")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(parser.parse_args()))
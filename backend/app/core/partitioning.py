@@ -0,0 +1,180 @@
+"""
+Partition management for the transactions table.
+
+Enabled with TRANSACTIONS_PARTITIONING=range|hash when the table is first
+created. Range mode keeps monthly partitions on ``control_date`` named
+``transactions_yYYYYmMM`` plus a default partition; hash mode spreads users
+over TRANSACTIONS_HASH_PARTITIONS partitions on ``user_id``.
+
+Usage (from the backend directory):
+    python -m app.core.partitioning ensure
+    python -m app.core.partitioning list
+    python -m app.core.partitioning detach --older-than-months 36
+"""
+
+import argparse
+import asyncio
+import logging
+import re
+from datetime import date
+from typing import List, Optional
+
+from .config import settings
+from .database import connect_db, database, disconnect_db
+from .timeouts import current_statement_timeout
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "transactions"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+_RANGE_NAME = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+def _add_months(month_start: date, months: int) -> date:
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def range_partition_name(month_start: date) -> str:
+    return f"{PARENT_TABLE}_y{month_start.year:04d}m{month_start.month:02d}"
+
+async def _is_partitioned() -> bool:
+    result = await database.fetch_val(
+        query="SELECT count(*) FROM pg_partitioned_table pt "
+              "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :name",
+        values={"name": PARENT_TABLE},
+    )
+    return bool(result)
+
+async def list_partitions() -> List[str]:
+    """Names of the partitions currently attached to the transactions table."""
+    rows = await database.fetch_all(
+        query="SELECT c.relname FROM pg_inherits i "
+              "JOIN pg_class c ON c.oid = i.inhrelid "
+              "JOIN pg_class p ON p.oid = i.inhparent "
+              "WHERE p.relname = :name ORDER BY c.relname",
+        values={"name": PARENT_TABLE},
+    )
+    return [row["relname"] for row in rows]
+
+async def _default_has_rows(start: date, end: date) -> bool:
+    return bool(await database.fetch_val(
+        query=f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+              "WHERE control_date >= :start AND control_date < :end)",
+        values={"start": start, "end": end},
+    ))
+
+async def _create_from_default(name: str, bounds: tuple, statement: str):
+    """Create a monthly partition whose rows currently sit in the default partition.
+
+    Postgres refuses to add a partition while the default holds rows in its
+    range, so the default is detached, the month created, the rows moved
+    into it and the default re-attached, all in one transaction.
+    """
+    start, end = bounds
+    async with database.transaction():
+        await database.execute(query="SET LOCAL statement_timeout = 0")
+        await database.execute(query=f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+        await database.execute(query=statement)
+        moved = await database.fetch_val(
+            query=f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                  "WHERE control_date >= :start AND control_date < :end RETURNING *), "
+                  f"inserted AS (INSERT INTO {name} SELECT * FROM moved RETURNING 1) "
+                  "SELECT count(*) FROM inserted",
+            values={"start": start, "end": end},
+        )
+        await database.execute(query=f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+    logger.info(f"Moved {moved} rows from {DEFAULT_PARTITION} into new partition {name}")
+
+async def ensure_partitions(today: Optional[date] = None) -> List[str]:
+    """Create any missing partitions; returns the names created."""
+    mode = settings.TRANSACTIONS_PARTITIONING
+    if not mode:
+        return []
+    if not await _is_partitioned():
+        logger.warning(
+            f"TRANSACTIONS_PARTITIONING={mode} but table '{PARENT_TABLE}' is not partitioned; "
+            "partitioning only applies to newly created tables"
+        )
+        return []
+
+    existing = set(await list_partitions())
+    statements = []
+    if mode == "hash":
+        modulus = settings.TRANSACTIONS_HASH_PARTITIONS
+        for remainder in range(modulus):
+            name = f"{PARENT_TABLE}_p{remainder}"
+            statements.append((name, None, f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+                                           f"FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"))
+    else:
+        current = (today or date.today()).replace(day=1)
+        first = _add_months(current, -settings.TRANSACTIONS_PARTITIONS_BEHIND)
+        for offset in range(settings.TRANSACTIONS_PARTITIONS_BEHIND + settings.TRANSACTIONS_PARTITIONS_AHEAD + 1):
+            start = _add_months(first, offset)
+            end = _add_months(start, 1)
+            name = range_partition_name(start)
+            statements.append((name, (start, end), f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+                                                   f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"))
+        # Catches rows outside the managed months instead of rejecting them
+        statements.append((DEFAULT_PARTITION, None,
+                           f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+
+    created = []
+    for name, bounds, statement in statements:
+        if name in existing:
+            continue
+        if bounds and DEFAULT_PARTITION in existing and await _default_has_rows(*bounds):
+            await _create_from_default(name, bounds, statement)
+        else:
+            await database.execute(query=statement)
+        created.append(name)
+    if created:
+        logger.info(f"Created {len(created)} transaction partitions")
+    return created
+
+async def detach_old_partitions(older_than_months: int, today: Optional[date] = None) -> List[str]:
+    """Detach monthly partitions that end before the cutoff; returns their names.
+
+    Detached partitions stay in the database as standalone tables, so their data
+    can be archived or dropped separately.
+    """
+    if settings.TRANSACTIONS_PARTITIONING != "range":
+        return []
+    cutoff = _add_months((today or date.today()).replace(day=1), -older_than_months)
+    detached = []
+    for name in await list_partitions():
+        match = _RANGE_NAME.match(name)
+        if not match:
+            continue
+        start = date(int(match.group(1)), int(match.group(2)), 1)
+        if _add_months(start, 1) <= cutoff:
+            await database.execute(query=f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}")
+            detached.append(name)
+    if detached:
+        logger.info(f"Detached {len(detached)} transaction partitions older than {cutoff}")
+    return detached
+
+async def _main(args):
+    # Maintenance jobs may legitimately run for longer than request queries
+    current_statement_timeout.set(0)
+    await connect_db()
+    try:
+        if args.command == "ensure":
+            created = await ensure_partitions()
+            print(f"Created {len(created)} partitions: {', '.join(created) or '-'}")
+        elif args.command == "list":
+            for name in await list_partitions():
+                print(name)
+        elif args.command == "detach":
+            detached = await detach_old_partitions(args.older_than_months)
+            print(f"Detached {len(detached)} partitions: {', '.join(detached) or '-'}")
+    finally:
+        await disconnect_db()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage transactions table partitions")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("ensure", help="create missing partitions")
+    subparsers.add_parser("list", help="list attached partitions")
+    detach_parser = subparsers.add_parser("detach", help="detach old monthly partitions")
+    detach_parser.add_argument("--older-than-months", type=int, required=True)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,98 @@
+"""
+Precompiled SQL statements for hot service-layer queries.
+"""
+
+import logging
+from typing import Any, AsyncIterator, List, Optional
+
+import databases
+from databases.backends.common.records import Record, create_column_maps
+
+logger = logging.getLogger(__name__)
+
+_registry: List["PreparedQuery"] = []
+
+class PreparedQuery:
+    """A SQLAlchemy Core statement compiled once into asyncpg-ready SQL.
+
+    Parameters are declared with ``sqlalchemy.bindparam(name)``. Each call only
+    binds values and runs the cached SQL text, so asyncpg also reuses the same
+    server-side prepared statement. Rows come back as the same ``Record``
+    objects ``databases`` returns.
+    """
+
+    def __init__(self, statement):
+        self.statement = statement
+        self.sql: Optional[str] = None
+        _registry.append(self)
+
+    def compile(self, dialect) -> None:
+        """Compile the statement for the given dialect."""
+        compiled = self.statement.compile(dialect=dialect)
+        # Same positional ordering as databases' own compiler
+        names = sorted(compiled.params)
+        self.sql = compiled.string % {name: f"${i}" for i, name in enumerate(names, start=1)}
+        processors = compiled._bind_processors
+        self._binds = [(name, processors.get(name)) for name in names]
+        self._result_columns = compiled._result_columns
+        self._column_maps = create_column_maps(self._result_columns)
+        self._dialect = dialect
+
+    def bind(self, db: databases.Database, params: dict) -> List[Any]:
+        """Return positional arguments for the compiled SQL."""
+        if self.sql is None:
+            self.compile(db._backend._dialect)
+        return [
+            processor(params[name]) if processor else params[name]
+            for name, processor in self._binds
+        ]
+
+    def _record(self, row) -> Record:
+        return Record(row, self._result_columns, self._dialect, self._column_maps)
+
+    async def fetch_all(self, db: databases.Database, **params) -> List[Record]:
+        args = self.bind(db, params)
+        async with db.connection() as connection:
+            rows = await connection.raw_connection.fetch(self.sql, *args)
+        return [self._record(row) for row in rows]
+
+    async def fetch_one(self, db: databases.Database, **params) -> Optional[Record]:
+        args = self.bind(db, params)
+        async with db.connection() as connection:
+            row = await connection.raw_connection.fetchrow(self.sql, *args)
+        return self._record(row) if row is not None else None
+
+    async def fetch_val(self, db: databases.Database, **params) -> Any:
+        row = await self.fetch_one(db, **params)
+        return row[0] if row is not None else None
+
+    async def execute(self, db: databases.Database, **params) -> str:
+        """Run a statement that returns no rows; returns the status, e.g. ``UPDATE 3``."""
+        args = self.bind(db, params)
+        async with db.connection() as connection:
+            return await connection.raw_connection.execute(self.sql, *args)
+
+    async def iterate_chunks(self, db: databases.Database, chunk_size: int, **params) -> AsyncIterator[list]:
+        """Yield the rows in lists of up to ``chunk_size`` from a server-side cursor.
+
+        Rows are plain asyncpg records, readable by column name or position;
+        only one chunk is in memory at a time. The connection stays checked
+        out, inside a read transaction, until the iteration ends.
+        """
+        args = self.bind(db, params)
+        async with db.connection() as connection:
+            async with connection.transaction():
+                cursor = await connection.raw_connection.cursor(self.sql, *args)
+                while True:
+                    rows = await cursor.fetch(chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+
+def compile_prepared_queries(db: databases.Database) -> int:
+    """Compile every registered statement for the database's dialect."""
+    dialect = db._backend._dialect
+    for query in _registry:
+        query.compile(dialect)
+    logger.info(f"Compiled {len(_registry)} prepared queries")
+    return len(_registry)
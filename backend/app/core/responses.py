@@ -0,0 +1,249 @@
+"""
+Fast JSON responses for large record lists.
+"""
+
+from datetime import date
+from typing import AsyncIterator, Iterable, List, Sequence, Type
+
+import orjson
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+# Dates in columnar payloads are sent as day offsets from this epoch
+COLUMNAR_EPOCH = date(1970, 1, 1)
+_EPOCH_ORDINAL = COLUMNAR_EPOCH.toordinal()
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+def record_dicts(records: Iterable, model: Type[BaseModel]) -> List[dict]:
+    """Convert DB records to plain dicts holding only the model's fields.
+
+    Keys follow the model's field order, so the output matches what
+    ``response_model=List[model]`` would produce without building a pydantic
+    object per row.
+    """
+    fields = tuple(model.model_fields)
+    rows = (getattr(record, "_mapping", record) for record in records)
+    return [{field: row[field] for field in fields} for row in rows]
+
+def serialize_records(records: Iterable, model: Type[BaseModel]) -> bytes:
+    """Serialize DB records to JSON bytes shaped like ``List[model]``."""
+    return orjson.dumps(record_dicts(records, model))
+
+def _date_fields(model: Type[BaseModel]) -> set:
+    return {
+        name for name, field in model.model_fields.items()
+        if field.annotation is date or date in getattr(field.annotation, "__args__", ())
+    }
+
+def _dictionary_encode(values: list) -> dict:
+    """Encode a column as distinct values plus an index per row (None stays None)."""
+    dictionary: dict = {}
+    indices = [
+        None if value is None else dictionary.setdefault(value, len(dictionary))
+        for value in values
+    ]
+    return {"dictionary": list(dictionary), "indices": indices}
+
+def columnar_document(
+    records: Iterable, model: Type[BaseModel], dictionary_fields: Sequence[str] = ()
+) -> dict:
+    """Build a column-oriented document from DB records.
+
+    Each model field becomes one array. Date fields are day offsets from
+    COLUMNAR_EPOCH and ``dictionary_fields`` are dictionary-encoded, which
+    removes the per-row repetition of keys and common strings.
+    """
+    fields = tuple(model.model_fields)
+    date_fields = _date_fields(model)
+    rows = [getattr(record, "_mapping", record) for record in records]
+
+    columns = {}
+    for field in fields:
+        values = [row[field] for row in rows]
+        if field in date_fields:
+            values = [None if value is None else value.toordinal() - _EPOCH_ORDINAL for value in values]
+        if field in dictionary_fields:
+            columns[field] = _dictionary_encode(values)
+        else:
+            columns[field] = values
+
+    return {
+        "format": "columnar",
+        "length": len(rows),
+        "epoch": COLUMNAR_EPOCH,
+        "columns": columns,
+    }
+
+def serialize_columnar(
+    records: Iterable, model: Type[BaseModel], dictionary_fields: Sequence[str] = ()
+) -> bytes:
+    """Serialize DB records to a column-oriented JSON document."""
+    return orjson.dumps(columnar_document(records, model, dictionary_fields))
+
+def serialize_arrow(
+    records: Iterable, model: Type[BaseModel], dictionary_fields: Sequence[str] = ()
+) -> bytes:
+    """Serialize DB records to an Arrow IPC stream (requires pyarrow)."""
+    if pyarrow is None:
+        raise RuntimeError("pyarrow is not installed")
+    fields = tuple(model.model_fields)
+    rows = [getattr(record, "_mapping", record) for record in records]
+
+    arrays = []
+    for field in fields:
+        array = pyarrow.array([row[field] for row in rows])
+        if field in dictionary_fields:
+            array = array.dictionary_encode()
+        arrays.append(array)
+    batch = pyarrow.RecordBatch.from_arrays(arrays, names=list(fields))
+
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+def _arrow_type(annotation):
+    types = set(getattr(annotation, "__args__", (annotation,))) - {type(None)}
+    if date in types:
+        return pyarrow.date32()
+    if bool in types:
+        return pyarrow.bool_()
+    if int in types:
+        return pyarrow.int64()
+    if float in types:
+        return pyarrow.float64()
+    return pyarrow.string()
+
+def arrow_schema(model: Type[BaseModel], dictionary_fields: Sequence[str] = ()):
+    """Arrow schema for a model's fields; ``dictionary_fields`` become dictionary<int32, string>."""
+    fields = []
+    for name, field in model.model_fields.items():
+        arrow_type = _arrow_type(field.annotation)
+        if name in dictionary_fields:
+            arrow_type = pyarrow.dictionary(pyarrow.int32(), arrow_type)
+        fields.append(pyarrow.field(name, arrow_type))
+    return pyarrow.schema(fields)
+
+def arrow_batch(rows: Sequence, schema) -> "pyarrow.RecordBatch":
+    """Build a record batch from rows readable by field name, one column at a time."""
+    arrays = []
+    for field in schema:
+        values = [row[field.name] for row in rows]
+        if pyarrow.types.is_dictionary(field.type):
+            array = pyarrow.array(values, type=field.type.value_type).dictionary_encode()
+        else:
+            array = pyarrow.array(values, type=field.type)
+        arrays.append(array)
+    return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+class _ChunkSink:
+    """Write-only file object whose written bytes are collected until taken."""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+async def stream_arrow_file(chunks: AsyncIterator[Sequence], schema, format: str) -> AsyncIterator[bytes]:
+    """Encode chunks of rows as an Arrow IPC stream or a Parquet file, yielding bytes per chunk.
+
+    Every chunk becomes one record batch (one row group in Parquet), so
+    memory stays bounded by the chunk size. Dictionary columns are encoded
+    per batch; Arrow streams carry them as replacement dictionaries.
+    """
+    sink = _ChunkSink()
+    if format == "parquet":
+        writer = pyarrow.parquet.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pyarrow.ipc.new_stream(sink, schema)
+    try:
+        async for rows in chunks:
+            if format == "parquet":
+                writer.write_table(pyarrow.Table.from_batches([arrow_batch(rows, schema)]))
+            else:
+                writer.write_batch(arrow_batch(rows, schema))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
+
+class RecordListResponse(Response):
+    """JSON response for a list of DB records, serialized with orjson."""
+
+    media_type = "application/json"
+
+    def __init__(self, records: Iterable, model: Type[BaseModel], **kwargs):
+        super().__init__(content=serialize_records(records, model), **kwargs)
+
+class ColumnarResponse(Response):
+    """Column-oriented JSON response for a list of DB records."""
+
+    media_type = "application/json"
+
+    def __init__(self, records: Iterable, model: Type[BaseModel], dictionary_fields: Sequence[str] = (), **kwargs):
+        super().__init__(content=serialize_columnar(records, model, dictionary_fields), **kwargs)
+
+class ArrowResponse(Response):
+    """Arrow IPC stream response for a list of DB records."""
+
+    media_type = ARROW_MEDIA_TYPE
+
+    def __init__(self, records: Iterable, model: Type[BaseModel], dictionary_fields: Sequence[str] = (), **kwargs):
+        super().__init__(content=serialize_arrow(records, model, dictionary_fields), **kwargs)
+
+class ArrowFileResponse(StreamingResponse):
+    """Streamed Arrow IPC or Parquet download of chunks of DB records."""
+
+    def __init__(
+        self, chunks: AsyncIterator[Sequence], model: Type[BaseModel], format: str,
+        dictionary_fields: Sequence[str] = (), filename: str = "export", **kwargs
+    ):
+        if pyarrow is None:
+            raise RuntimeError("pyarrow is not installed")
+        extension, media_type = ("parquet", PARQUET_MEDIA_TYPE) if format == "parquet" else ("arrows", ARROW_MEDIA_TYPE)
+        headers = {"Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
+        super().__init__(
+            stream_arrow_file(chunks, arrow_schema(model, dictionary_fields), format),
+            media_type=media_type, headers=headers, **kwargs
+        )
+
+class ORJSONResponse(Response):
+    """JSON response for an arbitrary document, serialized with orjson."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
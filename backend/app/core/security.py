@@ -53,3 +53,9 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     if user is None:
         raise credentials_exception
     return user
+
+async def get_current_admin_user(current_user=Depends(get_current_user)):
+    """Get the current user, requiring them to be listed in ADMIN_USERNAMES."""
+    if current_user["username"] not in settings.ADMIN_USERNAMES:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
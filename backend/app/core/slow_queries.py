@@ -0,0 +1,219 @@
+"""
+Slow query capture with sampled EXPLAIN plans.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import random
+import re
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+import databases
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# "METHOD /path" of the request being served, set by PerformanceMiddleware
+current_route: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_route", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace and replace literals so equivalent statements group together."""
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _IN_LIST.sub("(?)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+def _plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+def summarize_plan(plan: dict) -> dict:
+    """Pull the facts worth scanning for out of an EXPLAIN (FORMAT JSON) plan."""
+    root = plan["Plan"]
+    nodes = list(_plan_nodes(root))
+    return {
+        "total_cost": root.get("Total Cost"),
+        "execution_time_ms": plan.get("Execution Time"),
+        "seq_scans": sorted({n["Relation Name"] for n in nodes if n["Node Type"] == "Seq Scan"}),
+        "sorts": sum(1 for n in nodes if n["Node Type"] in ("Sort", "Incremental Sort")),
+        "shared_blocks_read": root.get("Shared Read Blocks"),
+        "shared_blocks_hit": root.get("Shared Hit Blocks"),
+    }
+
+class _Entry:
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+        self.last_seen = 0.0
+        self.routes: "OrderedDict[str, int]" = OrderedDict()
+        self.plan: Optional[dict] = None
+        self.plan_summary: Optional[dict] = None
+        self.plan_analyzed = False
+        self.plan_route: Optional[str] = None
+        self.plan_captured_at: Optional[float] = None
+        self.explain_started = 0.0
+        self.explain_error: Optional[str] = None
+
+    def as_dict(self, include_plan: bool) -> dict:
+        result = {
+            "sql": self.sql,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "last_ms": round(self.last_ms, 3),
+            "last_seen": self.last_seen,
+            "routes": dict(self.routes),
+            "plan_summary": self.plan_summary,
+            "plan_analyzed": self.plan_analyzed,
+            "plan_route": self.plan_route,
+            "plan_captured_at": self.plan_captured_at,
+            "explain_error": self.explain_error,
+        }
+        if include_plan:
+            result["plan"] = self.plan
+        return result
+
+class SlowQueryLog:
+    """Record statements slower than a threshold and EXPLAIN a sample of them.
+
+    Hooked into every pooled asyncpg connection as a query logger, so it sees
+    queries from both ``databases`` and ``PreparedQuery``. Entries are keyed by
+    normalized SQL and bounded in number. A plan is captured at most once per
+    ``explain_interval`` seconds per statement, one at a time, on a separate
+    pooled connection. SELECTs get ``EXPLAIN (ANALYZE, BUFFERS)`` inside a
+    read-only transaction that is rolled back; other statements get a plain
+    ``EXPLAIN`` so they are never executed twice. State is per worker.
+    """
+
+    ROUTES_PER_ENTRY = 10
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        sample_rate: float = 1.0,
+        explain_interval: float = 300.0,
+        explain_timeout_ms: int = 10000,
+        max_entries: int = 200,
+    ):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.explain_interval = explain_interval
+        self.explain_timeout_ms = explain_timeout_ms
+        self.max_entries = max_entries
+        self.explains_run = 0
+        self.explains_failed = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._explaining = False
+
+    def instrument(self, connection, db: databases.Database):
+        """Attach to a new pool connection; used as asyncpg's pool ``init``."""
+        if self.threshold_ms > 0:
+            connection.add_query_logger(lambda record: self.observe(record, db))
+
+    def observe(self, record, db: databases.Database):
+        elapsed_ms = record.elapsed * 1000
+        if elapsed_ms < self.threshold_ms or record.exception is not None:
+            return
+        query = record.query
+        if query.lstrip()[:7].upper() == "EXPLAIN":
+            return
+
+        sql = normalize_sql(query)
+        entry = self._entries.get(sql)
+        if entry is None:
+            if len(self._entries) >= self.max_entries:
+                self._entries.popitem(last=False)
+            entry = self._entries[sql] = _Entry(sql)
+        else:
+            self._entries.move_to_end(sql)
+
+        route = current_route.get() or "-"
+        entry.count += 1
+        entry.total_ms += elapsed_ms
+        entry.max_ms = max(entry.max_ms, elapsed_ms)
+        entry.last_ms = elapsed_ms
+        entry.last_seen = time.time()
+        entry.routes[route] = entry.routes.get(route, 0) + 1
+        entry.routes.move_to_end(route)
+        if len(entry.routes) > self.ROUTES_PER_ENTRY:
+            entry.routes.popitem(last=False)
+        logger.warning(f"Slow query ({elapsed_ms:.1f}ms) on {route}: {sql[:200]}")
+
+        now = time.monotonic()
+        due = not entry.explain_started or now - entry.explain_started >= self.explain_interval
+        if due and not self._explaining and random.random() < self.sample_rate:
+            self._explaining = True
+            entry.explain_started = now
+            asyncio.ensure_future(self._explain(entry, query, record.args, route, db))
+
+    async def _explain(self, entry: _Entry, query: str, args, route: str, db: databases.Database):
+        analyze = query.lstrip()[:6].upper() == "SELECT"
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+        try:
+            async with db.connection() as connection:
+                raw = connection.raw_connection
+                transaction = raw.transaction(readonly=True)
+                await transaction.start()
+                try:
+                    await raw.execute(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+                    plan = await raw.fetchval(f"EXPLAIN ({options}) {query}", *(args or ()))
+                finally:
+                    await transaction.rollback()
+            plan = json.loads(plan)[0] if isinstance(plan, str) else plan[0]
+            entry.plan = plan
+            entry.plan_summary = summarize_plan(plan)
+            entry.plan_analyzed = analyze
+            entry.plan_route = route
+            entry.plan_captured_at = time.time()
+            entry.explain_error = None
+            self.explains_run += 1
+            if entry.plan_summary["seq_scans"]:
+                logger.warning(
+                    f"Slow query plan uses sequential scans on {', '.join(entry.plan_summary['seq_scans'])}: "
+                    f"{entry.sql[:200]}"
+                )
+        except Exception as e:
+            self.explains_failed += 1
+            entry.explain_error = str(e)
+            logger.debug(f"Could not EXPLAIN slow query: {e}")
+        finally:
+            self._explaining = False
+
+    def entries(self, limit: int = 50, include_plans: bool = True) -> List[dict]:
+        """Captured statements, most total time first."""
+        ranked = sorted(self._entries.values(), key=lambda e: e.total_ms, reverse=True)
+        return [entry.as_dict(include_plans) for entry in ranked[:limit]]
+
+    def reset(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "threshold_ms": self.threshold_ms,
+            "statements": len(self._entries),
+            "explains_run": self.explains_run,
+            "explains_failed": self.explains_failed,
+        }
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    sample_rate=settings.SLOW_QUERY_SAMPLE_RATE,
+    explain_interval=settings.SLOW_QUERY_EXPLAIN_INTERVAL,
+    explain_timeout_ms=settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS,
+    max_entries=settings.SLOW_QUERY_MAX_ENTRIES,
+)
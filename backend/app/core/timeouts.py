@@ -0,0 +1,74 @@
+"""
+Per-route statement timeouts and accounting of cancelled queries.
+"""
+
+import contextvars
+import logging
+from typing import Dict, Optional
+
+import asyncpg
+
+from .config import settings
+from .slow_queries import current_route
+
+logger = logging.getLogger(__name__)
+
+# statement_timeout (ms) for connections acquired by the current request;
+# None keeps the pool default DB_STATEMENT_TIMEOUT_MS
+current_statement_timeout: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "current_statement_timeout", default=None
+)
+
+def statement_timeout(timeout_ms: int):
+    """Route dependency running the request's queries under ``timeout_ms`` (0: no limit).
+
+    For the few routes that need a budget other than the pool's
+    DB_STATEMENT_TIMEOUT_MS: applied with ``SET statement_timeout`` when a
+    connection is acquired, and the pool's ``RESET ALL`` on release restores
+    the default. Every other request pays no extra round trip.
+    """
+    async def dependency():
+        current_statement_timeout.set(timeout_ms)
+
+    return dependency
+
+async def apply_statement_timeout(connection):
+    """Set the current request's statement timeout on a freshly acquired connection."""
+    timeout_ms = current_statement_timeout.get()
+    if timeout_ms is not None and timeout_ms != settings.DB_STATEMENT_TIMEOUT_MS:
+        await connection.execute(f"SET statement_timeout = {int(timeout_ms)}")
+
+class QueryCancellations:
+    """Count queries stopped by statement timeouts and requests cancelled on disconnect, per route."""
+
+    MAX_ROUTES = 100
+
+    def __init__(self):
+        self.timeouts: Dict[str, int] = {}
+        self.disconnects: Dict[str, int] = {}
+
+    def observe(self, record):
+        """asyncpg query logger: note statements the server cancelled."""
+        if isinstance(record.exception, asyncpg.QueryCanceledError):
+            route = current_route.get() or "-"
+            self._count(self.timeouts, route)
+            logger.warning(f"Query cancelled after {record.elapsed:.1f}s on {route}: {record.query[:200]}")
+
+    def disconnected(self, route: str):
+        self._count(self.disconnects, route)
+
+    def _count(self, counts: Dict[str, int], route: str):
+        if route not in counts and len(counts) >= self.MAX_ROUTES:
+            route = "other"
+        counts[route] = counts.get(route, 0) + 1
+
+    def stats(self) -> dict:
+        return {
+            "default_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+            "timeouts": sum(self.timeouts.values()),
+            "disconnects": sum(self.disconnects.values()),
+            "timeouts_by_route": dict(self.timeouts),
+            "disconnects_by_route": dict(self.disconnects),
+        }
+
+query_cancellations = QueryCancellations()
@@ -1,20 +1,34 @@
 import logging
-from fastapi import FastAPI
+import asyncpg
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from .core.config import settings
-from .core.database import create_tables, connect_db, disconnect_db
-from .routes import auth_router, transactions_router, control_dates_router, credits_router, budget_preferences_router
-from .middleware import PerformanceMiddleware
-
-# Configure logging with better performance for production
-logging.basicConfig(
-    level=logging.INFO if not settings.DEBUG else logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
+from .core.database import database, read_database, connect_db, disconnect_db, get_dsn, get_pool_stats
+from .core import migrations
+from .core.queries import compile_prepared_queries
+from .core.coalesce import read_coalescer
+from .core.partitioning import ensure_partitions
+from .core.slow_queries import slow_query_log
+from .core.cache import read_cache
+from .core.columnar_cache import columnar_cache
+from .core.invalidation import invalidation_bus
+from .core.events import change_events
+from .core.responses import ORJSONResponse
+from .core.timeouts import query_cancellations
+from .core.logs import log_pipeline
+from .routes import auth_router, transactions_router, control_dates_router, credits_router, budget_preferences_router, dashboard_router, admin_router, analytics_router, events_router
+from .middleware import (
+    PerformanceMiddleware,
+    CompressionMiddleware,
+    compression_stats,
+    AdmissionMiddleware,
+    AdmissionController,
+    DisconnectMiddleware,
 )
+
+# Log through a queue to a background writer so requests never wait on output
+log_pipeline.setup()
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
@@ -23,9 +37,36 @@ app = FastAPI(
     debug=settings.DEBUG
 )
 
+# Compress large responses (innermost, so its cost shows up in X-Process-Time)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+)
+
 # Add performance monitoring middleware
 app.add_middleware(PerformanceMiddleware, slow_query_threshold=1.0)
 
+# Stop work (and queries) for reads whose client went away; inside admission
+# control so the request leaves the in-flight count once it is cancelled
+app.add_middleware(DisconnectMiddleware, enabled=settings.CANCEL_ON_DISCONNECT)
+
+# Shed overload early, before requests queue on the database pool.
+# Added before CORS so rejections still carry CORS headers.
+admission_controller = AdmissionController(
+    rate=settings.RATE_LIMIT_PER_SECOND,
+    burst=settings.RATE_LIMIT_BURST,
+    max_inflight={
+        "read": settings.MAX_INFLIGHT_READ,
+        "write": settings.MAX_INFLIGHT_WRITE,
+        "bulk": settings.MAX_INFLIGHT_BULK,
+        "dashboard": settings.MAX_INFLIGHT_DASHBOARD,
+    },
+    large_read_limit=settings.ADMISSION_LARGE_READ_LIMIT,
+    dashboard_cost=settings.DASHBOARD_ADMISSION_COST,
+)
+app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
 # Configure CORS with optimized settings
 cors_origins = ["*"] if settings.DEBUG else settings.CORS_ORIGINS
 app.add_middleware(
@@ -42,16 +83,30 @@ app.add_middleware(
         "Access-Control-Request-Method",
         "Access-Control-Request-Headers"
     ],
-    expose_headers=["Authorization", "Content-Type", "X-Process-Time"],
+    expose_headers=["Authorization", "Content-Type", "X-Process-Time", "Retry-After"],
     max_age=86400,  # 24 hours
 )
 
+# A statement that hit its statement_timeout: the server is busy or the
+# request asks for too much, not a server error
+@app.exception_handler(asyncpg.QueryCanceledError)
+async def query_cancelled_handler(request: Request, exc: asyncpg.QueryCanceledError):
+    return ORJSONResponse(
+        {"detail": "Query took too long; narrow the request or retry later"},
+        status_code=503,
+        headers={"Retry-After": "5"},
+    )
+
 # Include routers
 app.include_router(auth_router, tags=["authentication"])
 app.include_router(transactions_router, prefix="/transactions", tags=["transactions"])
 app.include_router(control_dates_router, prefix="/config/control_date", tags=["control_dates"])
 app.include_router(credits_router, prefix="/credits", tags=["credits"])
 app.include_router(budget_preferences_router, prefix="/budget-preferences", tags=["budget_preferences"])
+app.include_router(dashboard_router, prefix="/dashboard", tags=["dashboard"])
+app.include_router(admin_router, prefix="/admin", tags=["admin"])
+app.include_router(analytics_router, prefix="/analytics", tags=["analytics"])
+app.include_router(events_router, prefix="/events", tags=["events"])
 
 # Application lifecycle events
 @app.on_event("startup")
@@ -59,20 +114,34 @@ async def startup():
     """Initialize application on startup."""
     logger.info("Starting up application...")
     try:
-        # Create database tables
-        create_tables()
-        logger.info("Database tables created/verified.")
+        # Apply pending schema migrations (a no-op once the schema is current)
+        if settings.MIGRATE_ON_STARTUP:
+            applied = await migrations.upgrade(transactional_only=True)
+            logger.info(f"Database schema up to date ({len(applied)} migrations applied).")
         
         # Connect to database
         await connect_db()
         logger.info("Database connection established.")
         
+        # Create upcoming partitions when the transactions table is partitioned
+        await ensure_partitions()
+        
+        # Compile hot service queries once so requests only bind parameters
+        compile_prepared_queries(database)
+        
+        # Evict cached values when other workers write
+        await invalidation_bus.start(get_dsn())
+        
         # Log configuration
         cors_origins = ["*"] if settings.DEBUG else settings.CORS_ORIGINS
         logger.info(f"CORS middleware configured. Debug mode: {settings.DEBUG}")
         logger.info(f"Allowed origins: {cors_origins}")
         logger.info("Performance middleware enabled with 1.0s slow query threshold")
-        logger.info("Database connection pool optimized for production workloads")
+        logger.info(
+            f"Database connection pool: min_size={settings.DB_POOL_MIN_SIZE}, "
+            f"max_size={settings.DB_POOL_MAX_SIZE}, "
+            f"statement_cache_size={settings.DB_STATEMENT_CACHE_SIZE}"
+        )
         logger.info("Application startup complete.")
         
     except Exception as e:
@@ -83,6 +152,7 @@ async def startup():
 async def shutdown():
     """Cleanup on application shutdown."""
     logger.info("Shutting down application...")
+    await invalidation_bus.stop()
     await disconnect_db()
     logger.info("Application shutdown complete.")
 
@@ -92,6 +162,30 @@ async def health_check():
     """Basic health check endpoint."""
     return {"status": "healthy", "app": settings.APP_NAME}
 
+@app.get("/health/db")
+async def database_health_check():
+    """Connection pool statistics for monitoring."""
+    stats = {"pool": get_pool_stats()}
+    if read_database is not None:
+        stats["read_pool"] = get_pool_stats(read_database)
+    return stats
+
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for monitoring."""
+    return {
+        "compression": compression_stats.stats(),
+        "admission": admission_controller.stats(),
+        "coalescing": read_coalescer.stats(),
+        "slow_queries": slow_query_log.stats(),
+        "cache": read_cache.stats(),
+        "analytics_cache": columnar_cache.stats(),
+        "invalidation": invalidation_bus.stats(),
+        "events": change_events.stats(),
+        "query_cancellations": query_cancellations.stats(),
+        "logging": log_pipeline.stats(),
+    }
+
 # Explicit OPTIONS handler for CORS preflight
 @app.options("/{path:path}")
 async def options_handler():
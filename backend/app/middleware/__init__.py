@@ -3,5 +3,15 @@ Middleware package for the Finance Tracker API.
 """
 
 from .performance import PerformanceMiddleware
+from .compression import CompressionMiddleware, compression_stats
+from .admission import AdmissionMiddleware, AdmissionController
+from .disconnect import DisconnectMiddleware
 
-__all__ = ["PerformanceMiddleware"]
\ No newline at end of file
+__all__ = [
+    "PerformanceMiddleware",
+    "CompressionMiddleware",
+    "compression_stats",
+    "AdmissionMiddleware",
+    "AdmissionController",
+    "DisconnectMiddleware",
+]
\ No newline at end of file
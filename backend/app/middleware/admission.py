@@ -0,0 +1,187 @@
+"""
+Admission control middleware for FastAPI.
+"""
+
+import json
+import logging
+import math
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qs
+
+from jose import JWTError, jwt
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Paths that are never limited (health checks, metrics, CORS preflight)
+EXEMPT_PATHS = ("/health", "/metrics")
+# Long-lived streams: rate limited on connect but not counted as in flight,
+# since they hold no database connection while open
+STREAM_PATHS = ("/events",)
+
+READ, WRITE, BULK, DASHBOARD = "read", "write", "bulk", "dashboard"
+
+# The startup bootstrap, which fans out into several concurrent queries
+DASHBOARD_PATH = "/dashboard"
+
+class _TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+class AdmissionController:
+    """Per-client token buckets plus a global in-flight cap per route class.
+
+    Route classes are ``read`` (GET/HEAD), ``write`` (other methods),
+    ``bulk`` (bulk endpoints, exports and reads whose ``limit`` exceeds
+    ``large_read_limit``) and ``dashboard`` (the bootstrap request, which
+    holds several pool connections at once and is charged ``dashboard_cost``
+    tokens). State is in-process, so limits apply per worker.
+    """
+
+    BUCKET_PRUNE_SIZE = 10000
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_inflight: Dict[str, int],
+        large_read_limit: int,
+        bulk_cost: float = 5.0,
+        dashboard_cost: float = 6.0,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_inflight = max_inflight
+        self.large_read_limit = large_read_limit
+        self.costs = {READ: 1.0, WRITE: 1.0, BULK: bulk_cost, DASHBOARD: dashboard_cost}
+        self.inflight = {route_class: 0 for route_class in max_inflight}
+        self.rejected = {"rate_limited": 0, "overloaded": 0}
+        self.admitted = 0
+        self._buckets: Dict[str, _TokenBucket] = {}
+
+    def classify(self, scope: Scope) -> Optional[str]:
+        """Return the route class for a request, or None if it is exempt."""
+        method = scope["method"]
+        path = scope["path"]
+        if method == "OPTIONS" or path.startswith(EXEMPT_PATHS):
+            return None
+        if "/bulk" in path or path.endswith("/export"):
+            return BULK
+        if path.rstrip("/") == DASHBOARD_PATH:
+            return DASHBOARD
+        if method in ("GET", "HEAD"):
+            limit = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("limit")
+            if limit and limit[0].isdigit() and int(limit[0]) > self.large_read_limit:
+                return BULK
+            return READ
+        return WRITE
+
+    def take_token(self, key: str, route_class: str) -> float:
+        """Consume tokens for a request; return 0 if admitted, else seconds to wait."""
+        now = time.monotonic()
+        cost = self.costs[route_class]
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.BUCKET_PRUNE_SIZE:
+                self._prune(now)
+            bucket = self._buckets[key] = _TokenBucket(self.burst, now)
+        else:
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+
+        if bucket.tokens >= cost:
+            bucket.tokens -= cost
+            return 0.0
+        return (cost - bucket.tokens) / self.rate
+
+    def _prune(self, now: float):
+        # Buckets that have refilled completely carry no state worth keeping
+        full_after = self.burst / self.rate
+        for key in [k for k, b in self._buckets.items() if now - b.updated >= full_after]:
+            del self._buckets[key]
+
+    def stats(self) -> dict:
+        return {
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "inflight": dict(self.inflight),
+            "max_inflight": dict(self.max_inflight),
+            "tracked_clients": len(self._buckets),
+        }
+
+def client_key(scope: Scope) -> str:
+    """Identify the caller by JWT subject, falling back to the client address."""
+    authorization = Headers(scope=scope).get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+            if payload.get("sub"):
+                return f"user:{payload['sub']}"
+        except JWTError:
+            pass
+    client = scope.get("client")
+    return f"ip:{client[0]}" if client else "ip:unknown"
+
+class AdmissionMiddleware:
+    """Shed excess load early with 429/503 and Retry-After instead of queueing
+    requests until the database pool times out."""
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller
+        route_class = controller.classify(scope)
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = controller.take_token(client_key(scope), route_class)
+        if retry_after:
+            controller.rejected["rate_limited"] += 1
+            await _reject(send, 429, "Rate limit exceeded", retry_after)
+            return
+
+        if scope["path"].startswith(STREAM_PATHS):
+            controller.admitted += 1
+            await self.app(scope, receive, send)
+            return
+
+        if controller.inflight[route_class] >= controller.max_inflight[route_class]:
+            controller.rejected["overloaded"] += 1
+            logger.warning("Shedding %s request %s %s: server busy", route_class, scope["method"], scope["path"])
+            await _reject(send, 503, "Server busy, please retry", 1.0)
+            return
+
+        controller.admitted += 1
+        controller.inflight[route_class] += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.inflight[route_class] -= 1
+
+async def _reject(send: Send, status_code: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode("latin-1")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
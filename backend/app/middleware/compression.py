@@ -0,0 +1,212 @@
+"""
+Response compression middleware for FastAPI.
+"""
+
+import functools
+import logging
+import zlib
+from typing import Dict, Optional
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml")
+# Server-sent events must reach the client unbuffered
+EXCLUDED_TYPES = ("text/event-stream",)
+
+def available_encodings() -> tuple:
+    """Supported encodings in order of server preference."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return tuple(encodings)
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred encoding the client accepts, honouring q-values."""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    for encoding in available_encodings():
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+class _Compressor:
+    """Incremental compressor with a uniform compress/flush interface."""
+
+    def __init__(self, encoding: str):
+        if encoding == "gzip":
+            compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+            self.compress, self.flush = compressor.compress, compressor.flush
+        elif encoding == "br":
+            compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self.compress, self.flush = compressor.process, compressor.finish
+        elif encoding == "zstd":
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+            self.compress, self.flush = compressor.compress, compressor.flush
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress_all(self, data: bytes) -> bytes:
+        return self.compress(data) + self.flush()
+
+    def compress_chunk(self, data: bytes, final: bool) -> bytes:
+        output = self.compress(data)
+        return output + self.flush() if final else output
+
+class CompressionStats:
+    """Byte counters per encoding, used to report compression ratios."""
+
+    def __init__(self):
+        self._by_encoding: Dict[str, Dict[str, int]] = {}
+
+    def record(self, encoding: str, original_size: int, compressed_size: int):
+        entry = self._by_encoding.setdefault(
+            encoding, {"responses": 0, "bytes_in": 0, "bytes_out": 0}
+        )
+        entry["responses"] += 1
+        entry["bytes_in"] += original_size
+        entry["bytes_out"] += compressed_size
+
+    def stats(self) -> dict:
+        return {
+            encoding: {
+                **entry,
+                "ratio": round(entry["bytes_in"] / entry["bytes_out"], 2) if entry["bytes_out"] else 0.0,
+            }
+            for encoding, entry in self._by_encoding.items()
+        }
+
+compression_stats = CompressionStats()
+
+class CompressionMiddleware:
+    """Compress responses with zstd, brotli or gzip based on Accept-Encoding.
+
+    Bodies smaller than ``minimum_size`` are sent as-is. Streaming responses are
+    compressed chunk by chunk. Chunks of ``offload_size`` bytes or more are
+    compressed in a worker thread so large payloads do not block the event loop.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, offload_size: int = 256 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+class _CompressionResponder:
+    """Per-request state for CompressionMiddleware."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def _should_compress(self, headers: Headers) -> bool:
+        if "content-encoding" in headers or self.start_message["status"] == 206:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        if content_type.startswith(EXCLUDED_TYPES):
+            return False
+        return content_type.startswith(COMPRESSIBLE_TYPES) or "json" in content_type
+
+    async def _run(self, func, data: bytes) -> bytes:
+        if len(data) >= self.middleware.offload_size:
+            return await anyio.to_thread.run_sync(func, data)
+        return func(data)
+
+    async def send(self, message: Message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the headers until the first body chunk decides the encoding
+            self.start_message = message
+            return
+        if message_type != "http.response.body" or self.passthrough:
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            small = not more_body and len(body) < self.middleware.minimum_size
+            if small or not self._should_compress(headers):
+                self.passthrough = True
+                await self.downstream(self.start_message)
+                await self.downstream(message)
+                return
+
+            self.compressor = _Compressor(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                data = await self._run(self.compressor.compress_all, body)
+                headers["Content-Length"] = str(len(data))
+                compression_stats.record(self.encoding, len(body), len(data))
+                await self.downstream(self.start_message)
+                await self.downstream({"type": "http.response.body", "body": data})
+                return
+            await self.downstream(self.start_message)
+
+        # Streaming body
+        data = await self._run(
+            functools.partial(self.compressor.compress_chunk, final=not more_body), body
+        )
+        self.bytes_in += len(body)
+        self.bytes_out += len(data)
+        if not more_body:
+            compression_stats.record(self.encoding, self.bytes_in, self.bytes_out)
+        if data or not more_body:
+            await self.downstream({"type": "http.response.body", "body": data, "more_body": more_body})
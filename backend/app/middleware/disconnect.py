@@ -0,0 +1,65 @@
+"""
+Cancel read requests whose client has gone away.
+"""
+
+import asyncio
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.timeouts import query_cancellations
+
+logger = logging.getLogger(__name__)
+
+# Only requests without side effects are safe to abandon halfway
+CANCELLABLE_METHODS = ("GET", "HEAD")
+
+class DisconnectMiddleware:
+    """Cancel a GET/HEAD request's handler when the client disconnects.
+
+    The handler runs in its own task while this middleware keeps reading
+    ``receive``; an ``http.disconnect`` before the handler finishes cancels
+    the task. asyncpg turns the cancellation of an in-flight query into a
+    cancel request to the server, so the statement stops and its connection
+    goes back to the pool instead of finishing work nobody will read.
+    """
+
+    def __init__(self, app: ASGIApp, enabled: bool = True):
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if not self.enabled or scope["type"] != "http" or scope["method"] not in CANCELLABLE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        messages: "asyncio.Queue[Message]" = asyncio.Queue()
+
+        async def watch() -> None:
+            while True:
+                message = await receive()
+                messages.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    return
+
+        handler = asyncio.ensure_future(self.app(scope, messages.get, send))
+        watcher = asyncio.ensure_future(watch())
+        try:
+            await asyncio.wait((handler, watcher), return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            handler.cancel()
+            raise
+        finally:
+            watcher.cancel()
+
+        if not handler.done():
+            route = f"{scope['method']} {scope['path']}"
+            query_cancellations.disconnected(route)
+            logger.info("Client disconnected; cancelling %s", route)
+            handler.cancel()
+            try:
+                await handler
+            except asyncio.CancelledError:
+                pass
+            return
+        handler.result()
@@ -7,6 +7,8 @@ import logging
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from ..core.slow_queries import current_route
+
 logger = logging.getLogger(__name__)
 
 class PerformanceMiddleware(BaseHTTPMiddleware):
@@ -18,6 +20,8 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
     
     async def dispatch(self, request: Request, call_next):
         start_time = time.time()
+        # Lets slow queries be attributed to the request that ran them
+        current_route.set(f"{request.method} {request.url.path}")
         
         # Process the request
         response: Response = await call_next(request)
@@ -28,8 +32,8 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
         # Log slow requests
         if process_time > self.slow_query_threshold:
             logger.warning(
-                f"Slow request: {request.method} {request.url.path} "
-                f"took {process_time:.3f}s (threshold: {self.slow_query_threshold}s)"
+                "Slow request: %s %s took %.3fs (threshold: %ss)",
+                request.method, request.url.path, process_time, self.slow_query_threshold
             )
         
         # Add performance header
@@ -0,0 +1,130 @@
+"""
+Baseline schema: the tables previously created by ``metadata.create_all``.
+
+Frozen as the DDL of that schema, so later model changes never alter what
+this migration does; they get migrations of their own. Databases created
+before migrations existed already have these tables and are left
+untouched; on a fresh database each table is created with its indexes.
+
+TRANSACTIONS_PARTITIONING chooses how ``transactions`` is created: Postgres
+requires the partition key in the primary key, so it joins ``id`` there.
+"""
+
+from ..core.config import settings
+from ..core.migrations import table_exists
+
+_AUDIT_COLUMNS = """
+    create_by INTEGER NOT NULL,
+    create_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    update_by INTEGER NOT NULL,
+    update_date TIMESTAMP WITHOUT TIME ZONE NOT NULL"""
+
+_TRANSACTIONS_KEYS = {
+    "": ("control_date DATE", "PRIMARY KEY (id)", ""),
+    "range": ("control_date DATE NOT NULL", "PRIMARY KEY (id, control_date)", " PARTITION BY RANGE (control_date)"),
+    "hash": ("control_date DATE", "PRIMARY KEY (id, user_id)", " PARTITION BY HASH (user_id)"),
+}
+
+def _transactions_table():
+    control_date, primary_key, partition_by = _TRANSACTIONS_KEYS[settings.TRANSACTIONS_PARTITIONING]
+    return f"""
+CREATE TABLE transactions (
+    id SERIAL NOT NULL,
+    description VARCHAR,
+    amount FLOAT,
+    date DATE,
+    {control_date},
+    category VARCHAR,
+    account VARCHAR,
+    user_id INTEGER NOT NULL,{_AUDIT_COLUMNS},
+    {primary_key}
+){partition_by}"""
+
+# (table, CREATE TABLE, CREATE INDEX statements); None: see _transactions_table
+BASELINE_TABLES = (
+    ("budget_preference_categories", """
+CREATE TABLE budget_preference_categories (
+    id SERIAL NOT NULL,
+    budget_preference_id INTEGER NOT NULL,
+    category VARCHAR NOT NULL,
+    create_by INTEGER NOT NULL,
+    create_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT uq_budget_preference_category UNIQUE (budget_preference_id, category)
+)""", (
+        "CREATE INDEX ix_budget_preference_categories_budget_preference_id "
+        "ON budget_preference_categories (budget_preference_id)",
+        "CREATE INDEX ix_budget_preference_categories_category ON budget_preference_categories (category)",
+    )),
+    ("budget_preferences", f"""
+CREATE TABLE budget_preferences (
+    id SERIAL NOT NULL,
+    name VARCHAR NOT NULL,
+    percentage FLOAT NOT NULL,
+    user_id INTEGER NOT NULL,{_AUDIT_COLUMNS},
+    PRIMARY KEY (id)
+)""", (
+        "CREATE INDEX ix_budget_preferences_user_id ON budget_preferences (user_id)",
+    )),
+    ("control_dates", f"""
+CREATE TABLE control_dates (
+    id SERIAL NOT NULL,
+    user_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    control_date DATE NOT NULL,{_AUDIT_COLUMNS},
+    PRIMARY KEY (id)
+)""", (
+        "CREATE INDEX ix_control_dates_user_id ON control_dates (user_id)",
+    )),
+    ("credit_payments", f"""
+CREATE TABLE credit_payments (
+    id SERIAL NOT NULL,
+    credit_id INTEGER NOT NULL,
+    value FLOAT NOT NULL,
+    date DATE NOT NULL,
+    type VARCHAR NOT NULL,{_AUDIT_COLUMNS},
+    PRIMARY KEY (id)
+)""", (
+        "CREATE INDEX ix_credit_payments_credit_id ON credit_payments (credit_id)",
+        "CREATE INDEX ix_credit_payments_date ON credit_payments (date)",
+    )),
+    ("credits", f"""
+CREATE TABLE credits (
+    id SERIAL NOT NULL,
+    name VARCHAR NOT NULL,
+    monthly_value FLOAT NOT NULL,
+    payment_day INTEGER NOT NULL,
+    total_amount FLOAT,
+    user_id INTEGER NOT NULL,{_AUDIT_COLUMNS},
+    PRIMARY KEY (id)
+)""", (
+        "CREATE INDEX ix_credits_user_id ON credits (user_id)",
+    )),
+    ("transactions", None, (
+        "CREATE INDEX idx_transactions_user_control_date ON transactions (user_id, control_date)",
+        "CREATE INDEX idx_transactions_user_date ON transactions (user_id, date)",
+        "CREATE INDEX ix_transactions_account ON transactions (account)",
+        "CREATE INDEX ix_transactions_category ON transactions (category)",
+        "CREATE INDEX ix_transactions_control_date ON transactions (control_date)",
+        "CREATE INDEX ix_transactions_date ON transactions (date)",
+        "CREATE INDEX ix_transactions_user_id ON transactions (user_id)",
+    )),
+    ("users", f"""
+CREATE TABLE users (
+    id SERIAL NOT NULL,
+    username VARCHAR,
+    hashed_password VARCHAR,{_AUDIT_COLUMNS},
+    PRIMARY KEY (id)
+)""", (
+        "CREATE UNIQUE INDEX ix_users_username ON users (username)",
+    )),
+)
+
+async def upgrade(conn):
+    for name, create_table, create_indexes in BASELINE_TABLES:
+        if await table_exists(conn, name):
+            continue
+        await conn.execute(create_table or _transactions_table())
+        for statement in create_indexes:
+            await conn.execute(statement)
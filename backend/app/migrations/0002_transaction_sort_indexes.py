@@ -0,0 +1,21 @@
+"""
+Indexes matching the hot list queries, built online.
+
+``(user_id, control_date, date)`` serves the transactions list ordered by
+control_date and date (scanned backwards) without a sort step, and replaces
+``(user_id, control_date)``. ``(credit_id, date)`` serves a credit's payments
+ordered by date.
+"""
+
+from ..core.migrations import create_index_concurrently, drop_index_concurrently
+
+transactional = False
+
+async def upgrade(conn):
+    await create_index_concurrently(
+        conn, "idx_transactions_user_control_date_date", "transactions", "user_id, control_date, date"
+    )
+    await drop_index_concurrently(conn, "idx_transactions_user_control_date")
+    await create_index_concurrently(
+        conn, "idx_credit_payments_credit_date", "credit_payments", "credit_id, date"
+    )
@@ -0,0 +1,28 @@
+"""
+Monthly running balance checkpoints per account, and how far each user's
+checkpoints are valid.
+"""
+
+from ..core.migrations import table_exists
+
+CREATE_TABLES = (
+    ("balance_checkpoints", """
+CREATE TABLE balance_checkpoints (
+    user_id INTEGER NOT NULL,
+    month DATE NOT NULL,
+    account VARCHAR NOT NULL,
+    balance FLOAT NOT NULL,
+    PRIMARY KEY (user_id, month, account)
+)"""),
+    ("balance_checkpoint_coverage", """
+CREATE TABLE balance_checkpoint_coverage (
+    user_id INTEGER NOT NULL,
+    through_month DATE NOT NULL,
+    PRIMARY KEY (user_id)
+)"""),
+)
+
+async def upgrade(conn):
+    for name, statement in CREATE_TABLES:
+        if not await table_exists(conn, name):
+            await conn.execute(statement)
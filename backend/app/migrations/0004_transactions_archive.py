@@ -0,0 +1,51 @@
+"""
+Archive table for transactions of closed control periods.
+
+The array columns are the bulk of each row and get TOAST-compressed; on
+PostgreSQL 14+ they use lz4, which is faster to decompress than pglz.
+"""
+
+import logging
+
+import asyncpg
+
+from ..core.migrations import table_exists
+
+logger = logging.getLogger(__name__)
+
+CREATE_ARCHIVE_TABLE = """
+CREATE TABLE transactions_archive (
+    user_id INTEGER NOT NULL,
+    control_date DATE NOT NULL,
+    row_count INTEGER NOT NULL,
+    first_date DATE,
+    last_date DATE,
+    ids INTEGER[] NOT NULL,
+    descriptions VARCHAR[] NOT NULL,
+    amounts FLOAT[] NOT NULL,
+    dates DATE[] NOT NULL,
+    categories VARCHAR[] NOT NULL,
+    accounts VARCHAR[] NOT NULL,
+    create_bys INTEGER[] NOT NULL,
+    create_dates TIMESTAMP WITHOUT TIME ZONE[] NOT NULL,
+    update_bys INTEGER[] NOT NULL,
+    update_dates TIMESTAMP WITHOUT TIME ZONE[] NOT NULL,
+    archived_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    PRIMARY KEY (user_id, control_date)
+)"""
+
+ARRAY_COLUMNS = ("ids", "descriptions", "amounts", "dates", "categories", "accounts",
+                 "create_bys", "create_dates", "update_bys", "update_dates")
+
+async def upgrade(conn):
+    if not await table_exists(conn, "transactions_archive"):
+        await conn.execute(CREATE_ARCHIVE_TABLE)
+    if await conn.fetchval("SELECT current_setting('server_version_num')::int") < 140000:
+        return
+    try:
+        # Savepoint: servers built without lz4 reject it, and pglz is fine then
+        async with conn.transaction():
+            for column in ARRAY_COLUMNS:
+                await conn.execute(f"ALTER TABLE transactions_archive ALTER COLUMN {column} SET COMPRESSION lz4")
+    except asyncpg.PostgresError as e:
+        logger.info(f"Keeping default compression for transactions_archive: {e}")
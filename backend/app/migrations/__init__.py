@@ -0,0 +1,6 @@
+"""
+Versioned schema migrations, applied in order by ``app.core.migrations``.
+
+Add a module named ``NNNN_description.py`` with the next free number. Never
+edit a migration that may have been applied; add a new one instead.
+"""
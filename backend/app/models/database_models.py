@@ -1,6 +1,21 @@
 import sqlalchemy
+from sqlalchemy.dialects.postgresql import ARRAY
+from ..core.config import settings
 from ..core.database import metadata
 
+# Optional declarative partitioning of the transactions table. Postgres requires
+# the partition key in the primary key, so it joins ``id`` there.
+TRANSACTIONS_PARTITIONING = settings.TRANSACTIONS_PARTITIONING
+if TRANSACTIONS_PARTITIONING not in ("", "range", "hash"):
+    raise ValueError(f"Unsupported TRANSACTIONS_PARTITIONING: {TRANSACTIONS_PARTITIONING}")
+_range_partitioned = TRANSACTIONS_PARTITIONING == "range"
+_hash_partitioned = TRANSACTIONS_PARTITIONING == "hash"
+_transactions_options = {}
+if _range_partitioned:
+    _transactions_options["postgresql_partition_by"] = "RANGE (control_date)"
+elif _hash_partitioned:
+    _transactions_options["postgresql_partition_by"] = "HASH (user_id)"
+
 # Users table
 users_table = sqlalchemy.Table(
     "users",
@@ -33,21 +48,24 @@ control_dates_table = sqlalchemy.Table(
 transactions_table = sqlalchemy.Table(
     "transactions",
     metadata,
-    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True, autoincrement=True),
     sqlalchemy.Column("description", sqlalchemy.String),
     sqlalchemy.Column("amount", sqlalchemy.Float),
     sqlalchemy.Column("date", sqlalchemy.Date, index=True),
-    sqlalchemy.Column("control_date", sqlalchemy.Date, index=True),
+    sqlalchemy.Column("control_date", sqlalchemy.Date, index=True,
+                      primary_key=_range_partitioned, nullable=not _range_partitioned),
     sqlalchemy.Column("category", sqlalchemy.String, index=True),
     sqlalchemy.Column("account", sqlalchemy.String, index=True),
-    sqlalchemy.Column("user_id", sqlalchemy.Integer, nullable=False, index=True),
+    sqlalchemy.Column("user_id", sqlalchemy.Integer, nullable=False, index=True,
+                      primary_key=_hash_partitioned),
     sqlalchemy.Column("create_by", sqlalchemy.Integer, nullable=False),
     sqlalchemy.Column("create_date", sqlalchemy.DateTime, nullable=False),
     sqlalchemy.Column("update_by", sqlalchemy.Integer, nullable=False),
     sqlalchemy.Column("update_date", sqlalchemy.DateTime, nullable=False),
     # Composite indexes for common query patterns
-    sqlalchemy.Index("idx_transactions_user_control_date", "user_id", "control_date"),
+    sqlalchemy.Index("idx_transactions_user_control_date_date", "user_id", "control_date", "date"),
     sqlalchemy.Index("idx_transactions_user_date", "user_id", "date"),
+    **_transactions_options,
 )
 
 # Credits table
@@ -79,6 +97,7 @@ credit_payments_table = sqlalchemy.Table(
     sqlalchemy.Column("create_date", sqlalchemy.DateTime, nullable=False),
     sqlalchemy.Column("update_by", sqlalchemy.Integer, nullable=False),
     sqlalchemy.Column("update_date", sqlalchemy.DateTime, nullable=False),
+    sqlalchemy.Index("idx_credit_payments_credit_date", "credit_id", "date"),
 )
 
 # Budget preferences table
@@ -107,3 +126,46 @@ budget_preference_categories_table = sqlalchemy.Table(
     # Unique constraint to prevent duplicate category assignments for the same budget preference
     sqlalchemy.UniqueConstraint("budget_preference_id", "category", name="uq_budget_preference_category"),
 )
+
+# Cumulative balance per account through the end of a month, so running
+# balance series can start from a checkpoint instead of the first transaction
+balance_checkpoints_table = sqlalchemy.Table(
+    "balance_checkpoints",
+    metadata,
+    sqlalchemy.Column("user_id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("month", sqlalchemy.Date, primary_key=True),
+    sqlalchemy.Column("account", sqlalchemy.String, primary_key=True),
+    sqlalchemy.Column("balance", sqlalchemy.Float, nullable=False),
+)
+
+# Last month through which a user's balance checkpoints are valid
+balance_checkpoint_coverage_table = sqlalchemy.Table(
+    "balance_checkpoint_coverage",
+    metadata,
+    sqlalchemy.Column("user_id", sqlalchemy.Integer, primary_key=True, autoincrement=False),
+    sqlalchemy.Column("through_month", sqlalchemy.Date, nullable=False),
+)
+
+# Archived transactions of closed control periods, one row per user and
+# period with the transactions' columns as parallel arrays (compressed by
+# TOAST). Written by app.core.archive.
+transactions_archive_table = sqlalchemy.Table(
+    "transactions_archive",
+    metadata,
+    sqlalchemy.Column("user_id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("control_date", sqlalchemy.Date, primary_key=True),
+    sqlalchemy.Column("row_count", sqlalchemy.Integer, nullable=False),
+    sqlalchemy.Column("first_date", sqlalchemy.Date),
+    sqlalchemy.Column("last_date", sqlalchemy.Date),
+    sqlalchemy.Column("ids", ARRAY(sqlalchemy.Integer), nullable=False),
+    sqlalchemy.Column("descriptions", ARRAY(sqlalchemy.String), nullable=False),
+    sqlalchemy.Column("amounts", ARRAY(sqlalchemy.Float), nullable=False),
+    sqlalchemy.Column("dates", ARRAY(sqlalchemy.Date), nullable=False),
+    sqlalchemy.Column("categories", ARRAY(sqlalchemy.String), nullable=False),
+    sqlalchemy.Column("accounts", ARRAY(sqlalchemy.String), nullable=False),
+    sqlalchemy.Column("create_bys", ARRAY(sqlalchemy.Integer), nullable=False),
+    sqlalchemy.Column("create_dates", ARRAY(sqlalchemy.DateTime), nullable=False),
+    sqlalchemy.Column("update_bys", ARRAY(sqlalchemy.Integer), nullable=False),
+    sqlalchemy.Column("update_dates", ARRAY(sqlalchemy.DateTime), nullable=False),
+    sqlalchemy.Column("archived_at", sqlalchemy.DateTime, nullable=False),
+)
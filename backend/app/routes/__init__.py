@@ -3,5 +3,9 @@ from .transactions import router as transactions_router
 from .control_dates import router as control_dates_router
 from .credits import router as credits_router
 from .budget_preferences import router as budget_preferences_router
+from .dashboard import router as dashboard_router
+from .admin import router as admin_router
+from .analytics import router as analytics_router
+from .events import router as events_router
 
-__all__ = ["auth_router", "transactions_router", "control_dates_router", "credits_router", "budget_preferences_router"]
+__all__ = ["auth_router", "transactions_router", "control_dates_router", "credits_router", "budget_preferences_router", "dashboard_router", "admin_router", "analytics_router", "events_router"]
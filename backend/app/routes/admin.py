@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+import logging
+
+from ..core.security import get_current_admin_user
+from ..core.slow_queries import slow_query_log
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    limit: int = 50,
+    plans: bool = True,
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """Slow statements seen by this worker, most total time first, with their
+    normalized SQL, routes and the latest captured EXPLAIN plan."""
+    return {
+        **slow_query_log.stats(),
+        "queries": slow_query_log.entries(limit=limit, include_plans=plans),
+    }
+
+@router.delete("/slow-queries", status_code=204)
+async def reset_slow_queries(current_user: dict = Depends(get_current_admin_user)):
+    """Clear the captured slow statements on this worker."""
+    slow_query_log.reset()
+    logger.info("Slow query log reset by %s", current_user["username"])
@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal, Optional
+from datetime import date
+import logging
+
+from ..core.config import settings
+from ..core.responses import ORJSONResponse
+from ..core.security import get_current_user
+from ..core.timeouts import statement_timeout
+from ..services.analytics_service import AnalyticsService, add_years, count_buckets
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.get("/series", dependencies=[Depends(statement_timeout(settings.LONG_STATEMENT_TIMEOUT_MS))])
+async def get_series(
+    bucket: Literal["day", "week", "month", "quarter", "year"] = "month",
+    metric: Literal["sum", "count", "income", "expense"] = "sum",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    account: Optional[str] = None,
+    category: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """A metric per time bucket, ready to plot.
+    
+    ``dates`` holds every bucket start from the one containing ``date_from``
+    (default: a year before ``date_to``) to the one containing ``date_to``
+    (default: today), and ``values`` one value per date, 0 where there were
+    no transactions. ``account``/``category`` restrict the transactions
+    counted; ``""`` selects those without one.
+    """
+    date_to = date_to or date.today()
+    date_from = date_from or add_years(date_to, -1)
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must not be after date_to"
+        )
+    if count_buckets(bucket, date_from, date_to) > settings.ANALYTICS_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Series longer than {settings.ANALYTICS_MAX_BUCKETS} buckets; use a larger bucket or a shorter range"
+        )
+    
+    series = await AnalyticsService.get_series(
+        current_user["id"], bucket, metric, date_from, date_to, account=account, category=category
+    )
+    return ORJSONResponse(series)
+
+@router.get("/breakdown", dependencies=[Depends(statement_timeout(settings.LONG_STATEMENT_TIMEOUT_MS))])
+async def get_breakdown(
+    by: Literal["category", "account"] = "category",
+    metric: Literal["sum", "count", "income", "expense"] = "expense",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    account: Optional[str] = None,
+    category: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """A metric per category or account between ``date_from`` (default: a
+    year before ``date_to``) and ``date_to`` (default: today), inclusive."""
+    date_to = date_to or date.today()
+    date_from = date_from or add_years(date_to, -1)
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must not be after date_to"
+        )
+    
+    breakdown = await AnalyticsService.get_breakdown(
+        current_user["id"], by, metric, date_from, date_to, account=account, category=category
+    )
+    return ORJSONResponse(breakdown)
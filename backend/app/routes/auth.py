@@ -12,7 +12,7 @@ router = APIRouter()
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
 async def register(user: UserCreate):
     """Register a new user."""
-    logger.info(f"Register request received: username={user.username}")
+    logger.info("Register request received: username=%s", user.username)
     
     try:
         # Check if user already exists
@@ -25,14 +25,14 @@ async def register(user: UserCreate):
         
         # Create user
         new_user = await UserService.create_user(user)
-        logger.info(f"User registered successfully: id={new_user['id']}, username={new_user['username']}")
+        logger.info("User registered successfully: id=%s, username=%s", new_user["id"], new_user["username"])
         
         return new_user
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error during registration for {user.username}: {e}")
+        logger.error("Error during registration for %s: %s", user.username, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Registration failed: {str(e)}"
@@ -82,7 +82,7 @@ async def get_budget_preferences_summary(
         result = await budget_preference_service.get_user_budget_preferences(current_user.id)
         return result
     except Exception as e:
-        logger.error(f"Error getting budget preferences for user_id: {current_user.id}: {str(e)}")
+        logger.error("Error getting budget preferences for user_id: %s: %s", current_user.id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve budget preferences"
@@ -196,7 +196,7 @@ async def delete_budget_preference(
         # Re-raise HTTP exceptions as-is
         raise
     except Exception as e:
-        logger.error(f"Error deleting budget preference {budget_preference_id} for user {current_user.id}: {str(e)}")
+        logger.error("Error deleting budget preference %s for user %s: %s", budget_preference_id, current_user.id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete budget preference"
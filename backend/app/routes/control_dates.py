@@ -2,7 +2,9 @@ from fastapi import APIRouter, HTTPException, Depends, status
 
 from ..schemas.control_date_schemas import ControlDateSetting, ControlDateResponse
 from ..services.control_date_service import ControlDateService
+from ..core.config import settings
 from ..core.security import get_current_user
+from ..core.timeouts import statement_timeout
 
 router = APIRouter()
 
@@ -31,3 +33,17 @@ async def set_control_date(
     """Set or update control date configuration for the current user."""
     result = await ControlDateService.set_user_control_date(current_user["id"], config)
     return result
+
+@router.post("/recompute", dependencies=[Depends(statement_timeout(settings.LONG_STATEMENT_TIMEOUT_MS))])
+async def recompute_transaction_periods(current_user: dict = Depends(get_current_user)):
+    """Reassign the control date of every dated transaction from the current
+    configuration, e.g. after changing the period boundary day."""
+    updated = await ControlDateService.recompute_transaction_periods(current_user["id"])
+    
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Control date not configured for user"
+        )
+    
+    return {"updated_count": updated}
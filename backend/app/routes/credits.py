@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 import logging
 
+from ..core.responses import RecordListResponse
 from ..core.security import get_current_user
 from ..services.credit_service import CreditService
 from ..schemas.credit_schemas import (
@@ -16,7 +17,7 @@ router = APIRouter()
 @router.get("/", response_model=List[Credit])
 async def list_credits(current_user: dict = Depends(get_current_user)):
     credits = await CreditService.get_credits_by_user(current_user["id"])
-    return credits
+    return RecordListResponse(credits, Credit)
 
 @router.post("/", response_model=Credit, status_code=status.HTTP_201_CREATED)
 async def create_credit(data: CreditCreate, current_user: dict = Depends(get_current_user)):
@@ -46,7 +47,7 @@ async def list_payments(credit_id: int, current_user: dict = Depends(get_current
         credit = await CreditService.get_credit_by_id(credit_id, current_user["id"])
         if not credit:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Credit not found")
-    return payments
+    return RecordListResponse(payments, CreditPayment)
 
 @router.post("/payments", response_model=CreditPayment, status_code=status.HTTP_201_CREATED)
 async def create_payment(data: CreditPaymentCreate, current_user: dict = Depends(get_current_user)):
@@ -0,0 +1,69 @@
+import asyncio
+from fastapi import APIRouter, Depends
+from typing import Literal
+import logging
+
+from ..core.responses import ORJSONResponse, record_dicts, columnar_document
+from ..core.security import get_current_user
+from ..schemas.dashboard_schemas import Dashboard
+from ..schemas.transaction_schemas import TRANSACTION_DICTIONARY_FIELDS, Transaction
+from ..schemas.credit_schemas import Credit, CreditPayment
+from ..services.transaction_service import TransactionService
+from ..services.control_date_service import ControlDateService
+from ..services.credit_service import CreditService
+from ..services.budget_preference_service import budget_preference_service
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# The JSON format is shaped like Dashboard; records are serialized directly
+@router.get("", response_class=ORJSONResponse, responses={200: {"model": Dashboard}})
+async def get_dashboard(
+    limit: int = 10000,
+    format: Literal["json", "columnar"] = "json",
+    current_user: dict = Depends(get_current_user)
+):
+    """Everything the frontend needs on startup, in one request.
+
+    Authenticates once and runs the queries concurrently, each on its own
+    pooled connection, so latency is bounded by the slowest query rather than
+    their sum.
+    """
+    user_id = current_user["id"]
+    (
+        transactions_total,
+        transactions,
+        control_date,
+        credits,
+        payments,
+        budget_preferences,
+    ) = await asyncio.gather(
+        TransactionService.get_user_transactions_count(user_id),
+        TransactionService.get_user_transactions(user_id, limit=limit, offset=0),
+        ControlDateService.get_user_control_date(user_id),
+        CreditService.get_credits_by_user(user_id),
+        CreditService.get_payments_by_user(user_id),
+        budget_preference_service.get_user_budget_preferences(user_id),
+    )
+    
+    credit_payments = {credit["id"]: [] for credit in credits}
+    for payment in record_dicts(payments, CreditPayment):
+        credit_payments.setdefault(payment["credit_id"], []).append(payment)
+    
+    if format == "columnar":
+        transactions_content = columnar_document(transactions, Transaction, TRANSACTION_DICTIONARY_FIELDS)
+    else:
+        transactions_content = record_dicts(transactions, Transaction)
+    
+    return ORJSONResponse({
+        "transactions_total": transactions_total,
+        "transactions": transactions_content,
+        "control_date": {
+            "year": control_date["year"],
+            "month": control_date["month"],
+            "control_date": control_date["control_date"],
+        } if control_date else None,
+        "credits": record_dicts(credits, Credit),
+        "credit_payments": credit_payments,
+        "budget_preferences": budget_preferences.model_dump(),
+    })
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+import logging
+
+from ..core.events import change_events
+from ..core.security import get_current_user
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.get("")
+async def stream_changes(current_user: dict = Depends(get_current_user)):
+    """Server-sent events announcing changes to the current user's data.
+    
+    Each ``change`` event carries ``{"resource": ...}`` with one of
+    ``transactions``, ``credits``, ``credit_payments``, ``budget_preferences``,
+    ``control_date`` or ``user``, sent once per resource however many writes
+    happened since the last event. ``resync`` means changes may have been
+    missed and everything should be refetched. Events carry no data; clients
+    refetch what changed.
+    """
+    subscriber = change_events.subscribe(current_user["id"])
+    if subscriber is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open event streams, please retry",
+            headers={"Retry-After": "5"}
+        )
+    
+    return StreamingResponse(
+        change_events.stream(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,10 +1,17 @@
 from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List
+from typing import List, Literal, Optional
+from datetime import date
 import logging
 
-from ..schemas.transaction_schemas import Transaction, TransactionCreate, TransactionUpdate
+from ..schemas.transaction_schemas import (
+    AccountBalances, TRANSACTION_DICTIONARY_FIELDS, Transaction, TransactionCreate, TransactionUpdate
+)
+from ..services.balance_service import BalanceService
 from ..services.transaction_service import TransactionService
+from ..core.config import settings
+from ..core.responses import RecordListResponse, ColumnarResponse, ArrowResponse, ArrowFileResponse, ORJSONResponse, pyarrow
 from ..core.security import get_current_user
+from ..core.timeouts import statement_timeout
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -13,33 +20,112 @@ router = APIRouter()
 async def get_transactions(
     limit: int = 100,
     offset: int = 0,
+    format: Literal["json", "columnar", "arrow"] = "json",
+    control_date_from: Optional[date] = None,
+    control_date_to: Optional[date] = None,
+    include_archived: bool = True,
     current_user: dict = Depends(get_current_user)
 ):
-    """Get paginated transactions for the current user."""
+    """Get paginated transactions for the current user.
+    
+    ``control_date_from``/``control_date_to`` (inclusive) restrict the result
+    to those control periods, which lets range-partitioned tables skip the rest.
+    Archived periods are included when the range reaches them (flagged
+    ``archived``, read-only) unless ``include_archived=false``.
+
+    - **format=json** (default): a list of transaction objects
+    - **format=columnar**: one array per field; dates as day offsets from
+      ``epoch``, category and account as ``{dictionary, indices}``
+    - **format=arrow**: an Arrow IPC stream with dictionary-encoded category and account
+    """
+    if format == "arrow" and pyarrow is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Arrow format is not available on this server"
+        )
+    
     transactions = await TransactionService.get_user_transactions(
-        current_user["id"], limit=limit, offset=offset
+        current_user["id"], limit=limit, offset=offset,
+        control_date_from=control_date_from, control_date_to=control_date_to,
+        include_archived=include_archived
+    )
+    logger.info(
+        "Fetched %d transactions from DB for user %s (limit=%d, offset=%d)",
+        len(transactions), current_user["username"], limit, offset
     )
-    logger.info(f"Fetched {len(transactions)} transactions from DB for user {current_user['username']} (limit={limit}, offset={offset})")
-    return transactions
+    
+    if format == "columnar":
+        return ColumnarResponse(transactions, Transaction, TRANSACTION_DICTIONARY_FIELDS)
+    if format == "arrow":
+        return ArrowResponse(transactions, Transaction, TRANSACTION_DICTIONARY_FIELDS)
+    return RecordListResponse(transactions, Transaction)
 
 @router.get("/count", response_model=dict)
-async def get_transactions_count(current_user: dict = Depends(get_current_user)):
+async def get_transactions_count(include_archived: bool = True, current_user: dict = Depends(get_current_user)):
     """Get total count of transactions for the current user."""
-    count = await TransactionService.get_user_transactions_count(current_user["id"])
+    count = await TransactionService.get_user_transactions_count(current_user["id"], include_archived=include_archived)
     return {"total": count}
 
+@router.get("/export", dependencies=[Depends(statement_timeout(settings.EXPORT_STATEMENT_TIMEOUT_MS))])
+async def export_transactions(
+    format: Literal["parquet", "arrow"] = "parquet",
+    current_user: dict = Depends(get_current_user)
+):
+    """Download every transaction of the current user, archived ones included.
+    
+    - **format=parquet** (default): a Parquet file, one row group per chunk
+    - **format=arrow**: an Arrow IPC stream, one record batch per chunk
+    
+    Category and account are dictionary-encoded. Rows are read and encoded
+    in chunks of EXPORT_CHUNK_SIZE while the file streams out.
+    """
+    if pyarrow is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Arrow and Parquet exports are not available on this server"
+        )
+    
+    logger.info("Exporting transactions as %s for user %s", format, current_user["username"])
+    chunks = TransactionService.export_transactions(current_user["id"], settings.EXPORT_CHUNK_SIZE)
+    return ArrowFileResponse(chunks, Transaction, format, TRANSACTION_DICTIONARY_FIELDS, filename="transactions")
+
+@router.get("/balances", response_model=AccountBalances, dependencies=[Depends(statement_timeout(settings.LONG_STATEMENT_TIMEOUT_MS))])
+async def get_account_balances(
+    resolution: Literal["day", "week", "month", "quarter", "year"] = "month",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Running balance per account at the end of each bucket.
+    
+    ``dates`` holds the bucket starts between ``date_from`` and ``date_to``
+    (inclusive, defaulting to the first and last bucket with transactions) and
+    ``balances`` one value per bucket for each account. Transactions without
+    an account are balanced under ``""``.
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must not be after date_to"
+        )
+    
+    balances = await BalanceService.get_account_balances(
+        current_user["id"], resolution=resolution, date_from=date_from, date_to=date_to
+    )
+    return ORJSONResponse(balances)
+
 @router.post("/", response_model=Transaction, status_code=status.HTTP_201_CREATED)
 async def create_transaction(
     transaction: TransactionCreate,
     current_user: dict = Depends(get_current_user)
 ):
     """Create a new transaction."""
-    logger.info(f"Creating transaction for user {current_user['username']}: {transaction.dict()}")
+    logger.info("Creating transaction for user %s", current_user["username"])
     
     new_transaction = await TransactionService.create_transaction(transaction, current_user["id"])
     return new_transaction
 
-@router.post("/bulk/", status_code=status.HTTP_201_CREATED)
+@router.post("/bulk/", status_code=status.HTTP_201_CREATED, dependencies=[Depends(statement_timeout(settings.LONG_STATEMENT_TIMEOUT_MS))])
 async def create_transactions_bulk(
     transactions: List[TransactionCreate],
     current_user: dict = Depends(get_current_user)
@@ -51,7 +137,7 @@ async def create_transactions_bulk(
             detail="No transactions provided"
         )
     
-    logger.info(f"Creating {len(transactions)} transactions in bulk for user {current_user['username']}")
+    logger.info("Creating %d transactions in bulk for user %s", len(transactions), current_user["username"])
     result = await TransactionService.create_transactions_bulk(transactions, current_user["id"])
     return result
 
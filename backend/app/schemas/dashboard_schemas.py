@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Union
+
+from .transaction_schemas import Transaction
+from .control_date_schemas import ControlDateResponse
+from .credit_schemas import Credit, CreditPayment
+from .budget_preference_schemas import BudgetPreferencesSummary
+
+class Dashboard(BaseModel):
+    transactions_total: int
+    # A list of transactions, or a columnar document when format=columnar
+    transactions: Union[List[Transaction], Dict[str, Any]]
+    control_date: Optional[ControlDateResponse] = None
+    credits: List[Credit]
+    credit_payments: Dict[int, List[CreditPayment]]
+    budget_preferences: BudgetPreferencesSummary
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import date as dtdate
 
 class TransactionBase(BaseModel):
@@ -21,9 +21,18 @@ class TransactionUpdate(BaseModel):
     category: Optional[str] = None
     account: Optional[str] = None
 
+# Low-cardinality fields dictionary-encoded in columnar and Arrow responses
+TRANSACTION_DICTIONARY_FIELDS = ("category", "account")
+
 class Transaction(TransactionBase):
     id: int
     user_id: int
+    archived: bool = False
     
     class Config:
         orm_mode = True
+
+class AccountBalances(BaseModel):
+    resolution: str
+    dates: List[dtdate]
+    balances: Dict[str, List[float]]
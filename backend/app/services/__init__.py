@@ -1,5 +1,7 @@
 from .user_service import UserService
 from .transaction_service import TransactionService
 from .control_date_service import ControlDateService
+from .balance_service import BalanceService
+from .analytics_service import AnalyticsService
 
-__all__ = ["UserService", "TransactionService", "ControlDateService"]
+__all__ = ["UserService", "TransactionService", "ControlDateService", "BalanceService", "AnalyticsService"]
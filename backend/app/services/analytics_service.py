@@ -0,0 +1,214 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import DateTime, Interval, String, bindparam, cast, func, literal_column, or_, select
+from ..core.archive import archived_through, ledger_transactions, reaches_archive
+from ..core.coalesce import coalesced
+from ..core.columnar_cache import columnar_cache
+from ..core.database import get_read_database
+from ..core.queries import PreparedQuery
+from ..models.database_models import transactions_table
+from .balance_service import bucket_start, next_bucket
+
+METRICS = ("sum", "count", "income", "expense")
+
+# generate_series steps per bucket size, matching date_trunc's units
+SERIES_STEPS = {"day": "1 day", "week": "1 week", "month": "1 month", "quarter": "3 months", "year": "1 year"}
+
+# Ranges reaching into the user's archived periods read hot and archived transactions
+_ledger = ledger_transactions(date_range=("date_from", "date_to"))
+
+def _aggregate(source, metric: str):
+    amount = source.c.amount
+    if metric == "count":
+        return func.count()
+    if metric == "income":
+        return func.sum(amount).filter(amount > literal_column("0"))
+    if metric == "expense":
+        return -func.sum(amount).filter(amount < literal_column("0"))
+    return func.sum(amount)
+
+def _filter(column, name: str):
+    """Match ``column`` against an optional parameter; NULL matches everything."""
+    return or_(
+        cast(bindparam(name, type_=String), String).is_(None),
+        func.coalesce(column, literal_column("''")) == bindparam(name, type_=String),
+    )
+
+def _series_query(source, metric: str) -> PreparedQuery:
+    """One value per bucket between series_from and series_to, 0 where empty.
+
+    Bucket totals come from a scan bounded by user_id and date, which the
+    ``(user_id, date)`` index serves; generate_series supplies the empty
+    buckets so the result is already aligned for plotting.
+    """
+    buckets = func.generate_series(
+        cast(bindparam("series_from", type_=DateTime), DateTime),
+        cast(bindparam("series_to", type_=DateTime), DateTime),
+        cast(cast(bindparam("step", type_=String), String), Interval),
+    ).table_valued("bucket").render_derived(name="buckets")
+    totals = select(
+        func.date_trunc(
+            bindparam("bucket", type_=String), cast(source.c.date, DateTime)
+        ).label("bucket"),
+        _aggregate(source, metric).label("value"),
+    ).where(
+        source.c.user_id == bindparam("user_id"),
+        source.c.date >= bindparam("date_from"),
+        source.c.date < bindparam("date_to"),
+        _filter(source.c.account, "account"),
+        _filter(source.c.category, "category"),
+    ).group_by(literal_column("1")).subquery("totals")
+    return PreparedQuery(
+        select(
+            buckets.c.bucket,
+            func.coalesce(totals.c.value, literal_column("0")).label("value"),
+        ).select_from(
+            buckets.outerjoin(totals, totals.c.bucket == buckets.c.bucket)
+        ).order_by(buckets.c.bucket)
+    )
+
+SERIES_QUERIES: Dict[str, PreparedQuery] = {metric: _series_query(transactions_table, metric) for metric in METRICS}
+LEDGER_SERIES_QUERIES: Dict[str, PreparedQuery] = {metric: _series_query(_ledger, metric) for metric in METRICS}
+
+def _breakdown_query(source, by: str, metric: str) -> PreparedQuery:
+    key = func.coalesce(source.c[by], literal_column("''"))
+    return PreparedQuery(
+        select(
+            key.label("key"),
+            func.coalesce(_aggregate(source, metric), literal_column("0")).label("value"),
+        ).where(
+            source.c.user_id == bindparam("user_id"),
+            source.c.date >= bindparam("date_from"),
+            source.c.date < bindparam("date_to"),
+            _filter(source.c.account, "account"),
+            _filter(source.c.category, "category"),
+        ).group_by(literal_column("1")).order_by(literal_column("1"))
+    )
+
+BREAKDOWN_QUERIES: Dict[tuple, PreparedQuery] = {
+    (by, metric): _breakdown_query(transactions_table, by, metric)
+    for by in ("category", "account") for metric in METRICS
+}
+LEDGER_BREAKDOWN_QUERIES: Dict[tuple, PreparedQuery] = {
+    (by, metric): _breakdown_query(_ledger, by, metric)
+    for by in ("category", "account") for metric in METRICS
+}
+
+# Everything the columnar cache keeps for a user, archived periods included, in date order
+_all_transactions = ledger_transactions()
+USER_TRANSACTION_COLUMNS_QUERY = PreparedQuery(
+    select(
+        _all_transactions.c.date,
+        _all_transactions.c.amount,
+        func.coalesce(_all_transactions.c.category, literal_column("''")),
+        func.coalesce(_all_transactions.c.account, literal_column("''")),
+    ).where(
+        _all_transactions.c.date.isnot(None),
+    ).order_by(_all_transactions.c.date)
+)
+
+def count_buckets(bucket: str, date_from: date, date_to: date) -> int:
+    """Number of buckets from the one containing ``date_from`` to the one containing ``date_to``."""
+    first, last = bucket_start(date_from, bucket), bucket_start(date_to, bucket)
+    if bucket in ("day", "week"):
+        return (last - first).days // (1 if bucket == "day" else 7) + 1
+    months = (last.year - first.year) * 12 + last.month - first.month
+    return months // {"month": 1, "quarter": 3, "year": 12}[bucket] + 1
+
+def add_years(day: date, years: int) -> date:
+    """The same day ``years`` later (or earlier), Feb 29 falling back to Feb 28."""
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return day.replace(year=day.year + years, day=28)
+
+def _rounded(metric: str, values: list) -> list:
+    if metric == "count":
+        return values
+    return [round(v, 2) for v in values]
+
+class AnalyticsService:
+    @staticmethod
+    async def _cached_columns(user_id: int):
+        return await columnar_cache.get(
+            user_id,
+            lambda: USER_TRANSACTION_COLUMNS_QUERY.fetch_all(get_read_database(user_id), user_id=user_id),
+        )
+    
+    @staticmethod
+    @coalesced
+    async def get_series(
+        user_id: int,
+        bucket: str,
+        metric: str,
+        date_from: date,
+        date_to: date,
+        account: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> dict:
+        """Metric per bucket from ``date_from`` to ``date_to`` (inclusive).
+
+        ``dates`` are bucket starts and ``values`` has one entry per date,
+        0 for buckets without transactions. ``sum`` is the net amount,
+        ``income`` the positive amounts and ``expense`` the negative amounts
+        as a positive number.
+        """
+        first, last = bucket_start(date_from, bucket), bucket_start(date_to, bucket)
+        if columnar_cache.enabled:
+            starts = [first]
+            while starts[-1] < last:
+                starts.append(next_bucket(starts[-1], bucket))
+            columns = await AnalyticsService._cached_columns(user_id)
+            values = columns.series(metric, starts, next_bucket(last, bucket), account=account, category=category)
+            return {"bucket": bucket, "metric": metric, "dates": starts, "values": values}
+        
+        queries = LEDGER_SERIES_QUERIES if reaches_archive(await archived_through(user_id), first) else SERIES_QUERIES
+        rows = await queries[metric].fetch_all(
+            get_read_database(user_id),
+            user_id=user_id,
+            bucket=bucket,
+            step=SERIES_STEPS[bucket],
+            series_from=datetime.combine(first, time()),
+            series_to=datetime.combine(last, time()),
+            date_from=first,
+            date_to=next_bucket(last, bucket),
+            account=account,
+            category=category,
+        )
+        dates: List[date] = [row["bucket"].date() for row in rows]
+        values = _rounded(metric, [row["value"] for row in rows])
+        return {"bucket": bucket, "metric": metric, "dates": dates, "values": values}
+    
+    @staticmethod
+    @coalesced
+    async def get_breakdown(
+        user_id: int,
+        by: str,
+        metric: str,
+        date_from: date,
+        date_to: date,
+        account: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> dict:
+        """Metric per category or account over ``date_from`` to ``date_to`` (inclusive).
+
+        ``keys`` lists the categories or accounts with transactions in the
+        range (``""`` for none), ``values`` the metric for each.
+        """
+        end = date_to + timedelta(days=1)
+        if columnar_cache.enabled:
+            columns = await AnalyticsService._cached_columns(user_id)
+            keys, values = columns.breakdown(by, metric, date_from, end, account=account, category=category)
+        else:
+            queries = LEDGER_BREAKDOWN_QUERIES if reaches_archive(await archived_through(user_id), date_from) else BREAKDOWN_QUERIES
+            rows = await queries[(by, metric)].fetch_all(
+                get_read_database(user_id),
+                user_id=user_id,
+                date_from=date_from,
+                date_to=end,
+                account=account,
+                category=category,
+            )
+            keys = [row["key"] for row in rows]
+            values = _rounded(metric, [row["value"] for row in rows])
+        return {"by": by, "metric": metric, "keys": keys, "values": values}
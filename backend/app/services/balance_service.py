@@ -0,0 +1,266 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import Date, DateTime, Integer, String, bindparam, cast, func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from ..core.archive import archived_through, ledger_transactions, load_archived_through, reaches_archive
+from ..core.coalesce import coalesced
+from ..core.database import database, get_read_database
+from ..core.queries import PreparedQuery
+from ..models.database_models import (
+    balance_checkpoint_coverage_table,
+    balance_checkpoints_table,
+    transactions_table,
+)
+from .control_date_service import add_months
+
+RESOLUTIONS = ("day", "week", "month", "quarter", "year")
+
+# Scans reaching into the user's archived periods read hot and archived transactions
+_ledger = ledger_transactions(date_range=("scan_from", "scan_to"))
+
+def _totals(source, unit, name: str):
+    """Totals per account (``""`` for none) and ``unit`` of ``source`` rows dated in [scan_from, scan_to)."""
+    return select(
+        func.coalesce(source.c.account, literal_column("''")).label("account"),
+        cast(func.date_trunc(unit, cast(source.c.date, DateTime)), Date).label(name),
+        func.sum(source.c.amount).label("amount"),
+    ).where(
+        source.c.user_id == bindparam("user_id"),
+        source.c.date >= bindparam("scan_from"),
+        source.c.date < bindparam("scan_to"),
+    ).group_by(literal_column("1"), literal_column("2")).subquery(f"{name}_totals")
+
+def _series_query(source) -> PreparedQuery:
+    """Per-bucket totals accumulated per account in bucket order by a window sum."""
+    bucket_totals = _totals(source, bindparam("resolution", type_=String), "bucket")
+    return PreparedQuery(
+        select(
+            bucket_totals.c.account,
+            bucket_totals.c.bucket,
+            func.sum(bucket_totals.c.amount).over(
+                partition_by=bucket_totals.c.account,
+                order_by=bucket_totals.c.bucket,
+            ).label("balance"),
+        ).order_by(bucket_totals.c.account, bucket_totals.c.bucket)
+    )
+
+BALANCE_SERIES_QUERY = _series_query(transactions_table)
+LEDGER_BALANCE_SERIES_QUERY = _series_query(_ledger)
+
+# Latest checkpoint per account at or before a month
+_latest_checkpoints = select(
+    balance_checkpoints_table.c.account,
+    balance_checkpoints_table.c.balance,
+).where(
+    balance_checkpoints_table.c.user_id == bindparam("user_id"),
+    balance_checkpoints_table.c.month <= bindparam("month"),
+).distinct(balance_checkpoints_table.c.account).order_by(
+    balance_checkpoints_table.c.account,
+    balance_checkpoints_table.c.month.desc(),
+)
+
+OPENING_BALANCES_QUERY = PreparedQuery(_latest_checkpoints)
+
+COVERAGE_QUERY = PreparedQuery(
+    select(balance_checkpoint_coverage_table.c.through_month).where(
+        balance_checkpoint_coverage_table.c.user_id == bindparam("user_id")
+    )
+)
+
+CREATE_COVERAGE_QUERY = PreparedQuery(
+    insert(balance_checkpoint_coverage_table).values(
+        user_id=bindparam("user_id"),
+        through_month=bindparam("through_month"),
+    ).on_conflict_do_nothing()
+)
+
+LOCK_COVERAGE_QUERY = PreparedQuery(
+    select(balance_checkpoint_coverage_table.c.through_month).where(
+        balance_checkpoint_coverage_table.c.user_id == bindparam("user_id")
+    ).with_for_update()
+)
+
+SET_COVERAGE_QUERY = PreparedQuery(
+    balance_checkpoint_coverage_table.update().where(
+        balance_checkpoint_coverage_table.c.user_id == bindparam("user_id")
+    ).values(through_month=bindparam("through_month"))
+)
+
+# Pull coverage back to the month before a changed transaction
+INVALIDATE_COVERAGE_QUERY = PreparedQuery(
+    balance_checkpoint_coverage_table.update().where(
+        balance_checkpoint_coverage_table.c.user_id == bindparam("user_id"),
+        balance_checkpoint_coverage_table.c.through_month >= bindparam("changed_month"),
+    ).values(through_month=bindparam("through_month"))
+)
+
+DELETE_STALE_CHECKPOINTS_QUERY = PreparedQuery(
+    balance_checkpoints_table.delete().where(
+        balance_checkpoints_table.c.user_id == bindparam("user_id"),
+        balance_checkpoints_table.c.month > bindparam("month"),
+    )
+)
+
+_opening = _latest_checkpoints.subquery("opening")
+
+def _build_checkpoints_query(source) -> PreparedQuery:
+    """Checkpoints for the months in [scan_from, scan_to).
+
+    Each is the balance at the last valid checkpoint plus a running sum of
+    the monthly totals since.
+    """
+    monthly_totals = _totals(source, literal_column("'month'"), "month")
+    return PreparedQuery(
+        balance_checkpoints_table.insert().from_select(
+            ["user_id", "month", "account", "balance"],
+            select(
+                cast(bindparam("user_id"), Integer),
+                monthly_totals.c.month,
+                monthly_totals.c.account,
+                func.coalesce(_opening.c.balance, literal_column("0")) + func.sum(monthly_totals.c.amount).over(
+                    partition_by=monthly_totals.c.account,
+                    order_by=monthly_totals.c.month,
+                ),
+            ).select_from(
+                monthly_totals.outerjoin(_opening, _opening.c.account == monthly_totals.c.account)
+            )
+        )
+    )
+
+BUILD_CHECKPOINTS_QUERY = _build_checkpoints_query(transactions_table)
+LEDGER_BUILD_CHECKPOINTS_QUERY = _build_checkpoints_query(_ledger)
+
+def bucket_start(day: date, resolution: str) -> date:
+    """First day of the bucket containing ``day``, matching Postgres' date_trunc."""
+    if resolution == "day":
+        return day
+    if resolution == "week":
+        return day - timedelta(days=day.weekday())
+    if resolution == "month":
+        return day.replace(day=1)
+    if resolution == "quarter":
+        return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+    return date(day.year, 1, 1)
+
+def next_bucket(start: date, resolution: str) -> date:
+    if resolution == "day":
+        return start + timedelta(days=1)
+    if resolution == "week":
+        return start + timedelta(days=7)
+    return add_months(start, {"month": 1, "quarter": 3, "year": 12}[resolution])
+
+def _previous_month(month: date) -> date:
+    return add_months(month, -1) if month > date.min else date.min
+
+class BalanceService:
+    @staticmethod
+    @coalesced
+    async def get_account_balances(
+        user_id: int,
+        resolution: str = "month",
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> dict:
+        """Running balance per account at the end of each bucket.
+
+        Totals per bucket are accumulated in SQL with a window sum, so only one
+        row per account and bucket leaves the database. With ``date_from`` the
+        scan starts after the latest monthly checkpoint before it instead of at
+        the user's first transaction. Buckets without activity carry the
+        previous balance. Transactions without a date are not counted.
+        """
+        scan_from = date.min
+        opening: Dict[str, float] = {}
+        start = bucket_start(date_from, resolution) if date_from else None
+        if start is not None:
+            anchor = min(
+                _previous_month(start.replace(day=1)),
+                _previous_month(date.today().replace(day=1)),
+            )
+            if anchor > date.min:
+                await BalanceService._ensure_checkpoints(user_id, anchor)
+                opening = {
+                    row["account"]: row["balance"]
+                    for row in await OPENING_BALANCES_QUERY.fetch_all(database, user_id=user_id, month=anchor)
+                }
+                scan_from = add_months(anchor, 1)
+
+        end = bucket_start(date_to, resolution) if date_to else None
+        query = LEDGER_BALANCE_SERIES_QUERY if reaches_archive(await archived_through(user_id), scan_from) else BALANCE_SERIES_QUERY
+        rows = await query.fetch_all(
+            get_read_database(user_id),
+            user_id=user_id,
+            resolution=resolution,
+            scan_from=scan_from,
+            scan_to=next_bucket(end, resolution) if end else date.max,
+        )
+
+        if start is None and rows:
+            start = min(row["bucket"] for row in rows)
+        if end is None and rows:
+            end = max(row["bucket"] for row in rows)
+        dates = []
+        if start is not None and end is not None:
+            bucket = start
+            while bucket <= end:
+                dates.append(bucket)
+                bucket = next_bucket(bucket, resolution)
+
+        series: Dict[str, list] = {}
+        for row in rows:
+            series.setdefault(row["account"], []).append((row["bucket"], row["balance"]))
+        balances = {}
+        for account in sorted(series.keys() | opening.keys()):
+            base = opening.get(account, 0.0)
+            points = series.get(account, [])
+            values = []
+            index, running = 0, 0.0
+            for bucket in dates:
+                while index < len(points) and points[index][0] <= bucket:
+                    running = points[index][1]
+                    index += 1
+                values.append(round(base + running, 2))
+            balances[account] = values
+
+        return {"resolution": resolution, "dates": dates, "balances": balances}
+
+    @staticmethod
+    async def _ensure_checkpoints(user_id: int, through_month: date) -> None:
+        """Extend the user's checkpoints to cover every month up to ``through_month``."""
+        covered = await COVERAGE_QUERY.fetch_val(database, user_id=user_id)
+        if covered is not None and covered >= through_month:
+            return
+
+        async with database.transaction():
+            await CREATE_COVERAGE_QUERY.execute(database, user_id=user_id, through_month=date.min)
+            # Serializes rebuilds with each other and with invalidations
+            covered = await LOCK_COVERAGE_QUERY.fetch_val(database, user_id=user_id)
+            if covered >= through_month:
+                return
+            await DELETE_STALE_CHECKPOINTS_QUERY.execute(database, user_id=user_id, month=covered)
+            scan_from = add_months(covered, 1) if covered > date.min else date.min
+            # Checkpoints persist, so decide from the primary rather than the cache
+            through = await load_archived_through(database, user_id)
+            query = LEDGER_BUILD_CHECKPOINTS_QUERY if reaches_archive(through, scan_from) else BUILD_CHECKPOINTS_QUERY
+            await query.execute(
+                database,
+                user_id=user_id,
+                month=covered,
+                scan_from=scan_from,
+                scan_to=add_months(through_month, 1),
+            )
+            await SET_COVERAGE_QUERY.execute(database, user_id=user_id, through_month=through_month)
+
+    @staticmethod
+    async def invalidate_checkpoints(user_id: int, dates: Sequence[Optional[date]]) -> None:
+        """Drop checkpoint coverage from the earliest month among changed transaction dates."""
+        known = [d for d in dates if d is not None]
+        if not known:
+            return
+        changed_month = min(known).replace(day=1)
+        await INVALIDATE_COVERAGE_QUERY.execute(
+            database,
+            user_id=user_id,
+            changed_month=changed_month,
+            through_month=_previous_month(changed_month),
+        )
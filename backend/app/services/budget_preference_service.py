@@ -1,8 +1,12 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import logging
-from sqlalchemy import select, delete, and_, func
-from ..core.database import database
+from sqlalchemy import select, delete, and_, func, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from ..core.cache import cached, invalidates
+from ..core.coalesce import coalesced
+from ..core.database import database, get_read_database, writes_user_data
+from ..core.queries import PreparedQuery
 from ..models.database_models import (
     budget_preferences_table, 
     budget_preference_categories_table
@@ -18,10 +22,46 @@ from ..schemas.budget_preference_schemas import (
 # Set up logger
 logger = logging.getLogger(__name__)
 
+# Hot read queries, compiled once at startup
+BUDGET_PREFERENCE_QUERY = PreparedQuery(
+    select(budget_preferences_table).where(
+        and_(
+            budget_preferences_table.c.id == bindparam("budget_preference_id"),
+            budget_preferences_table.c.user_id == bindparam("user_id")
+        )
+    )
+)
+
+BUDGET_PREFERENCE_CATEGORIES_QUERY = PreparedQuery(
+    select(budget_preference_categories_table.c.category).where(
+        budget_preference_categories_table.c.budget_preference_id == bindparam("budget_preference_id")
+    )
+)
+
+USER_BUDGET_PREFERENCES_QUERY = PreparedQuery(
+    select(budget_preferences_table).where(
+        budget_preferences_table.c.user_id == bindparam("user_id")
+    ).order_by(budget_preferences_table.c.create_date)
+)
+
+# ANY(array) instead of IN so the statement text does not depend on the id count
+CATEGORIES_BY_BUDGET_PREFERENCES_QUERY = PreparedQuery(
+    select(
+        budget_preference_categories_table.c.budget_preference_id,
+        budget_preference_categories_table.c.category
+    ).where(
+        budget_preference_categories_table.c.budget_preference_id == any_(
+            bindparam("budget_preference_ids", type_=ARRAY(Integer))
+        )
+    )
+)
+
 
 class BudgetPreferenceService:
     
     @staticmethod
+    @writes_user_data
+    @invalidates("budget_preferences")
     async def create_budget_preference(
         budget_preference_data: BudgetPreferenceCreate, 
         user_id: int, 
@@ -77,23 +117,20 @@ class BudgetPreferenceService:
     async def get_budget_preference(budget_preference_id: int, user_id: int) -> Optional[BudgetPreferenceResponse]:
         """Get a budget preference by ID."""
         
+        db = get_read_database(user_id)
+        
         # Get budget preference
-        query = select(budget_preferences_table).where(
-            and_(
-                budget_preferences_table.c.id == budget_preference_id,
-                budget_preferences_table.c.user_id == user_id
-            )
+        budget_preference = await BUDGET_PREFERENCE_QUERY.fetch_one(
+            db, budget_preference_id=budget_preference_id, user_id=user_id
         )
-        budget_preference = await database.fetch_one(query)
         
         if not budget_preference:
             return None
         
         # Get categories
-        query = select(budget_preference_categories_table.c.category).where(
-            budget_preference_categories_table.c.budget_preference_id == budget_preference_id
+        categories_result = await BUDGET_PREFERENCE_CATEGORIES_QUERY.fetch_all(
+            db, budget_preference_id=budget_preference_id
         )
-        categories_result = await database.fetch_all(query)
         categories = [row["category"] for row in categories_result]
         
         return BudgetPreferenceResponse(
@@ -107,16 +144,18 @@ class BudgetPreferenceService:
         )
     
     @staticmethod
+    @cached("budget_preferences")
+    @coalesced
     async def get_user_budget_preferences(user_id: int) -> BudgetPreferencesSummary:
         """Get all budget preferences for a user with summary information."""
         
+        db = get_read_database(user_id)
+        
         try:
             # First get all budget preferences for user
-            query = select(budget_preferences_table).where(
-                budget_preferences_table.c.user_id == user_id
-            ).order_by(budget_preferences_table.c.create_date)
-            
-            budget_preferences_raw = await database.fetch_all(query)
+            budget_preferences_raw = await USER_BUDGET_PREFERENCES_QUERY.fetch_all(
+                db, user_id=user_id
+            )
             
             if not budget_preferences_raw:
                 return BudgetPreferencesSummary(
@@ -129,13 +168,9 @@ class BudgetPreferenceService:
             
             # Get all categories for these budget preferences in one query
             bp_ids = [bp["id"] for bp in budget_preferences_raw]
-            categories_query = select(
-                budget_preference_categories_table.c.budget_preference_id,
-                budget_preference_categories_table.c.category
-            ).where(
-                budget_preference_categories_table.c.budget_preference_id.in_(bp_ids)
+            categories_raw = await CATEGORIES_BY_BUDGET_PREFERENCES_QUERY.fetch_all(
+                db, budget_preference_ids=bp_ids
             )
-            categories_raw = await database.fetch_all(categories_query)
             
             # Group categories by budget preference id
             categories_by_bp = {}
@@ -195,6 +230,8 @@ class BudgetPreferenceService:
             raise
     
     @staticmethod
+    @writes_user_data
+    @invalidates("budget_preferences")
     async def update_budget_preference(
         budget_preference_id: int,
         budget_preference_data: BudgetPreferenceUpdate,
@@ -269,6 +306,8 @@ class BudgetPreferenceService:
         return await BudgetPreferenceService.get_budget_preference(budget_preference_id, user_id)
     
     @staticmethod
+    @writes_user_data
+    @invalidates("budget_preferences")
     async def delete_budget_preference(budget_preference_id: int, user_id: int) -> bool:
         """Delete a budget preference and its categories."""
         
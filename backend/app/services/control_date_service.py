@@ -1,17 +1,129 @@
-from datetime import datetime
-from typing import Optional
-from ..core.database import database
-from ..models.database_models import control_dates_table
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Sequence
+from sqlalchemy import ARRAY, Date, bindparam, cast, func
+from ..core.cache import cached, invalidates
+from ..core.coalesce import coalesced
+from ..core.database import database, get_read_database, writes_user_data
+from ..core.queries import PreparedQuery
+from ..models.database_models import control_dates_table, transactions_table
 from ..schemas.control_date_schemas import ControlDateSetting
 
+USER_CONTROL_DATE_QUERY = PreparedQuery(
+    control_dates_table.select().where(control_dates_table.c.user_id == bindparam("user_id"))
+)
+
+USER_TRANSACTION_DATE_RANGE_QUERY = PreparedQuery(
+    transactions_table.select().with_only_columns(
+        func.min(transactions_table.c.date), func.max(transactions_table.c.date)
+    ).where(transactions_table.c.user_id == bindparam("user_id"))
+)
+
+# Periods as [period_start, period_end) ranges, joined in a single UPDATE
+_periods = func.unnest(
+    cast(bindparam("period_starts", type_=ARRAY(Date)), ARRAY(Date)),
+    cast(bindparam("period_ends", type_=ARRAY(Date)), ARRAY(Date)),
+).table_valued("period_start", "period_end").render_derived(name="periods")
+
+RECOMPUTE_PERIODS_QUERY = PreparedQuery(
+    transactions_table.update().where(
+        transactions_table.c.user_id == bindparam("user_id"),
+        transactions_table.c.date >= _periods.c.period_start,
+        transactions_table.c.date < _periods.c.period_end,
+        transactions_table.c.control_date.is_distinct_from(_periods.c.period_start)
+    ).values(
+        control_date=_periods.c.period_start,
+        update_by=bindparam("updated_by"),
+        update_date=bindparam("updated_at")
+    )
+)
+
+def add_months(month_start: date, months: int) -> date:
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def period_start(month_start: date, boundary_day: int) -> date:
+    """The period boundary within a month, clamped to the month's length."""
+    days_in_month = (add_months(month_start, 1) - month_start).days
+    return month_start + timedelta(days=min(boundary_day, days_in_month) - 1)
+
+def period_boundaries(boundary_day: int, first: date, last: date) -> List[date]:
+    """Sorted period boundaries from the one at or before ``first`` to the one after ``last``."""
+    month = add_months(first.replace(day=1), -1)
+    end = add_months(last.replace(day=1), 1)
+    boundaries = []
+    while month <= end:
+        boundaries.append(period_start(month, boundary_day))
+        month = add_months(month, 1)
+    return boundaries
+
+def assign_periods(dates: Sequence[Optional[date]], boundary_day: int) -> List[Optional[date]]:
+    """Map each date to the start of the control period containing it.
+
+    Periods start on ``boundary_day`` of every month. Boundaries for the span
+    of the input are built once and each date is placed with a binary search,
+    so a batch costs O(n log m) rather than a lookup per row.
+    """
+    known = [d for d in dates if d is not None]
+    if not known:
+        return [None] * len(dates)
+    boundaries = period_boundaries(boundary_day, min(known), max(known))
+    ordinals = [b.toordinal() for b in boundaries]
+    return [
+        boundaries[bisect_right(ordinals, d.toordinal()) - 1] if d is not None else None
+        for d in dates
+    ]
+
 class ControlDateService:
     @staticmethod
+    @cached("control_date")
+    @coalesced
     async def get_user_control_date(user_id: int) -> Optional[dict]:
         """Get control date configuration for a user."""
-        query = control_dates_table.select().where(control_dates_table.c.user_id == user_id)
-        return await database.fetch_one(query)
+        return await USER_CONTROL_DATE_QUERY.fetch_one(get_read_database(user_id), user_id=user_id)
+    
+    @staticmethod
+    async def derive_control_dates(user_id: int, dates: Sequence[Optional[date]]) -> List[Optional[date]]:
+        """Control dates for transaction dates from the user's configuration.
+        
+        The configured control_date's day of month is the period boundary.
+        Returns all None when the user has no configuration.
+        """
+        if not any(d is not None for d in dates):
+            return [None] * len(dates)
+        config = await ControlDateService.get_user_control_date(user_id)
+        if not config:
+            return [None] * len(dates)
+        return assign_periods(dates, config["control_date"].day)
+    
+    @staticmethod
+    @writes_user_data
+    @invalidates("transactions")
+    async def recompute_transaction_periods(user_id: int) -> Optional[int]:
+        """Reassign control dates of all the user's dated transactions from their
+        current configuration in one UPDATE; returns the number of rows changed,
+        or None when the user has no configuration."""
+        config = await ControlDateService.get_user_control_date(user_id)
+        if not config:
+            return None
+        date_range = await USER_TRANSACTION_DATE_RANGE_QUERY.fetch_one(database, user_id=user_id)
+        if date_range is None or date_range[0] is None:
+            return 0
+        
+        boundaries = period_boundaries(config["control_date"].day, date_range[0], date_range[1])
+        status = await RECOMPUTE_PERIODS_QUERY.execute(
+            database,
+            user_id=user_id,
+            period_starts=boundaries[:-1],
+            period_ends=boundaries[1:],
+            updated_by=user_id,
+            updated_at=datetime.utcnow()
+        )
+        return int(status.split()[-1])
     
     @staticmethod
+    @writes_user_data
+    @invalidates("control_date")
     async def set_user_control_date(user_id: int, config: ControlDateSetting) -> dict:
         """Set or update control date configuration for a user."""
         current_time = datetime.utcnow()
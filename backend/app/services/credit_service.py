@@ -1,27 +1,62 @@
 from datetime import datetime
 from typing import List, Optional
-from ..core.database import database
+from sqlalchemy import bindparam, select
+from ..core.cache import cached, invalidates
+from ..core.coalesce import coalesced
+from ..core.database import database, get_read_database, writes_user_data
+from ..core.queries import PreparedQuery
 from ..models.database_models import credits_table, credit_payments_table
 from ..schemas.credit_schemas import (
     CreditCreate, CreditUpdate, CreditPaymentCreate, CreditPaymentUpdate
 )
 
+# Hot read queries, compiled once at startup
+USER_CREDITS_QUERY = PreparedQuery(
+    credits_table.select().where(
+        credits_table.c.user_id == bindparam("user_id")
+    ).order_by(credits_table.c.name.asc())
+)
+
+CREDIT_BY_ID_QUERY = PreparedQuery(
+    credits_table.select().where(
+        credits_table.c.id == bindparam("credit_id"),
+        credits_table.c.user_id == bindparam("user_id")
+    )
+)
+
+CREDIT_PAYMENTS_QUERY = PreparedQuery(
+    credit_payments_table.select().where(
+        credit_payments_table.c.credit_id == bindparam("credit_id")
+    ).order_by(credit_payments_table.c.date.desc())
+)
+
+USER_CREDIT_PAYMENTS_QUERY = PreparedQuery(
+    select(credit_payments_table).select_from(
+        credit_payments_table.join(credits_table, credit_payments_table.c.credit_id == credits_table.c.id)
+    ).where(
+        credits_table.c.user_id == bindparam("user_id")
+    ).order_by(credit_payments_table.c.date.desc())
+)
+
+PAYMENT_BY_ID_QUERY = PreparedQuery(
+    credit_payments_table.select().where(credit_payments_table.c.id == bindparam("payment_id"))
+)
+
 class CreditService:
     # Credits
     @staticmethod
+    @cached("credits")
+    @coalesced
     async def get_credits_by_user(user_id: int) -> List[dict]:
-        query = credits_table.select().where(credits_table.c.user_id == user_id).order_by(credits_table.c.name.asc())
-        return await database.fetch_all(query)
+        return await USER_CREDITS_QUERY.fetch_all(get_read_database(user_id), user_id=user_id)
 
     @staticmethod
     async def get_credit_by_id(credit_id: int, user_id: int) -> Optional[dict]:
-        query = credits_table.select().where(
-            credits_table.c.id == credit_id,
-            credits_table.c.user_id == user_id
-        )
-        return await database.fetch_one(query)
+        return await CREDIT_BY_ID_QUERY.fetch_one(get_read_database(user_id), credit_id=credit_id, user_id=user_id)
 
     @staticmethod
+    @writes_user_data
+    @invalidates("credits")
     async def create_credit(data: CreditCreate, user_id: int) -> dict:
         now = datetime.utcnow()
         insert = credits_table.insert().values(
@@ -39,6 +74,8 @@ class CreditService:
         return {**data.dict(), "id": new_id, "user_id": user_id}
 
     @staticmethod
+    @writes_user_data
+    @invalidates("credits")
     async def update_credit(credit_id: int, data: CreditUpdate, user_id: int) -> Optional[dict]:
         # Optimize by checking existence within the update query
         update_data = data.dict(exclude_unset=True)
@@ -60,6 +97,8 @@ class CreditService:
         return await CreditService.get_credit_by_id(credit_id, user_id)
 
     @staticmethod
+    @writes_user_data
+    @invalidates("credits")
     async def delete_credit(credit_id: int, user_id: int) -> bool:
         existing = await CreditService.get_credit_by_id(credit_id, user_id)
         if not existing:
@@ -77,22 +116,27 @@ class CreditService:
 
     # Credit Payments
     @staticmethod
+    @coalesced
     async def get_payments_by_credit(credit_id: int, user_id: int) -> List[dict]:
         # Ensure credit belongs to user
         credit = await CreditService.get_credit_by_id(credit_id, user_id)
         if not credit:
             return []
-        query = credit_payments_table.select().where(
-            credit_payments_table.c.credit_id == credit_id
-        ).order_by(credit_payments_table.c.date.desc())
-        return await database.fetch_all(query)
+        return await CREDIT_PAYMENTS_QUERY.fetch_all(get_read_database(user_id), credit_id=credit_id)
+
+    @staticmethod
+    @coalesced
+    async def get_payments_by_user(user_id: int) -> List[dict]:
+        """Get payments for all of a user's credits in one query, newest first."""
+        return await USER_CREDIT_PAYMENTS_QUERY.fetch_all(get_read_database(user_id), user_id=user_id)
 
     @staticmethod
     async def get_payment_by_id(payment_id: int) -> Optional[dict]:
-        query = credit_payments_table.select().where(credit_payments_table.c.id == payment_id)
-        return await database.fetch_one(query)
+        return await PAYMENT_BY_ID_QUERY.fetch_one(database, payment_id=payment_id)
 
     @staticmethod
+    @writes_user_data
+    @invalidates("credit_payments")
     async def create_payment(data: CreditPaymentCreate, user_id: int) -> Optional[dict]:
         # Validate credit ownership
         credit = await CreditService.get_credit_by_id(data.credit_id, user_id)
@@ -113,6 +157,8 @@ class CreditService:
         return {**data.dict(), "id": new_id}
 
     @staticmethod
+    @writes_user_data
+    @invalidates("credit_payments")
     async def update_payment(payment_id: int, data: CreditPaymentUpdate, user_id: int) -> Optional[dict]:
         existing = await CreditService.get_payment_by_id(payment_id)
         if not existing:
@@ -131,6 +177,8 @@ class CreditService:
         return await CreditService.get_payment_by_id(payment_id)
 
     @staticmethod
+    @writes_user_data
+    @invalidates("credit_payments")
     async def delete_payment(payment_id: int, user_id: int) -> bool:
         existing = await CreditService.get_payment_by_id(payment_id)
         if not existing:
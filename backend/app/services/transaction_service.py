@@ -1,50 +1,178 @@
-from datetime import datetime
-from typing import List, Optional
-from ..core.database import database
-from ..models.database_models import transactions_table
+from datetime import date, datetime
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import bindparam, false, func, literal_column, select
+from ..core.archive import archived_through, ledger_transactions, reaches_archive
+from ..core.coalesce import coalesced
+from ..core.columnar_cache import columnar_cache
+from ..core.database import database, get_read_database, writes_user_data
+from ..core.invalidation import invalidation_bus
+from ..core.queries import PreparedQuery
+from ..models.database_models import transactions_archive_table, transactions_table, TRANSACTIONS_PARTITIONING
 from ..schemas.transaction_schemas import TransactionCreate, TransactionUpdate
+from .balance_service import BalanceService
+from .control_date_service import ControlDateService
+
+# Hot read queries, compiled once at startup; hot rows are never archived
+USER_TRANSACTIONS_QUERY = PreparedQuery(
+    select(transactions_table, false().label("archived")).where(
+        transactions_table.c.user_id == bindparam("user_id")
+    ).order_by(
+        transactions_table.c.control_date.desc(),
+        transactions_table.c.date.desc()
+    ).limit(bindparam("limit")).offset(bindparam("offset"))
+)
+
+# Bounded by control_date so range-partitioned tables only scan matching partitions
+USER_TRANSACTIONS_RANGE_QUERY = PreparedQuery(
+    select(transactions_table, false().label("archived")).where(
+        transactions_table.c.user_id == bindparam("user_id"),
+        transactions_table.c.control_date >= bindparam("control_date_from"),
+        transactions_table.c.control_date <= bindparam("control_date_to")
+    ).order_by(
+        transactions_table.c.control_date.desc(),
+        transactions_table.c.date.desc()
+    ).limit(bindparam("limit")).offset(bindparam("offset"))
+)
+
+USER_TRANSACTIONS_COUNT_QUERY = PreparedQuery(
+    transactions_table.select().with_only_columns(func.count()).where(
+        transactions_table.c.user_id == bindparam("user_id")
+    )
+)
+
+# Variants over hot and archived transactions, for reads reaching into the user's archived periods
+_ledger = ledger_transactions()
+LEDGER_TRANSACTIONS_QUERY = PreparedQuery(
+    select(_ledger).order_by(
+        _ledger.c.control_date.desc(),
+        _ledger.c.date.desc()
+    ).limit(bindparam("limit")).offset(bindparam("offset"))
+)
+
+_ledger_range = ledger_transactions(control_date_range=("control_date_from", "control_date_to"))
+LEDGER_TRANSACTIONS_RANGE_QUERY = PreparedQuery(
+    select(_ledger_range).where(
+        _ledger_range.c.control_date >= bindparam("control_date_from"),
+        _ledger_range.c.control_date <= bindparam("control_date_to")
+    ).order_by(
+        _ledger_range.c.control_date.desc(),
+        _ledger_range.c.date.desc()
+    ).limit(bindparam("limit")).offset(bindparam("offset"))
+)
+
+LEDGER_TRANSACTIONS_COUNT_QUERY = PreparedQuery(
+    select(
+        USER_TRANSACTIONS_COUNT_QUERY.statement.scalar_subquery()
+        + select(func.coalesce(func.sum(transactions_archive_table.c.row_count), literal_column("0"))).where(
+            transactions_archive_table.c.user_id == bindparam("user_id")
+        ).scalar_subquery()
+    )
+)
+
+# A user's whole history, archived periods included, for exports
+_export = ledger_transactions()
+EXPORT_TRANSACTIONS_QUERY = PreparedQuery(
+    select(_export).order_by(
+        _export.c.control_date,
+        _export.c.date,
+        _export.c.id
+    )
+)
+
+TRANSACTION_BY_ID_QUERY = PreparedQuery(
+    select(transactions_table, false().label("archived")).where(
+        transactions_table.c.id == bindparam("transaction_id"),
+        transactions_table.c.user_id == bindparam("user_id")
+    )
+)
+
+def _stored_control_date(control_date: Optional[date], transaction_date: Optional[date]) -> Optional[date]:
+    """Control date to store; range partitioning needs one, so fall back to the transaction's month."""
+    if control_date is None and TRANSACTIONS_PARTITIONING == "range":
+        return (transaction_date or date.today()).replace(day=1)
+    return control_date
+
+async def _transactions_changed(user_id: int, dates: List[Optional[date]]) -> None:
+    """Invalidate derived data after the user's transactions on ``dates`` changed."""
+    columnar_cache.invalidate(user_id)
+    await BalanceService.invalidate_checkpoints(user_id, dates)
+    await invalidation_bus.publish("transactions", user_id)
 
 class TransactionService:
     @staticmethod
-    async def get_user_transactions(user_id: int, limit: int = 100, offset: int = 0) -> List[dict]:
-        """Get paginated transactions for a user."""
-        query = transactions_table.select().where(
-            transactions_table.c.user_id == user_id
-        ).order_by(
-            transactions_table.c.control_date.desc(),
-            transactions_table.c.date.desc()
-        ).limit(limit).offset(offset)
-        return await database.fetch_all(query)
+    @coalesced
+    async def get_user_transactions(
+        user_id: int,
+        limit: int = 100,
+        offset: int = 0,
+        control_date_from: Optional[date] = None,
+        control_date_to: Optional[date] = None,
+        include_archived: bool = True
+    ) -> List[dict]:
+        """Get paginated transactions for a user, optionally within a control date range.
+
+        Archived transactions (flagged ``archived``) are read whenever the
+        requested periods reach into the user's archived ones, unless
+        ``include_archived`` is False.
+        """
+        db = get_read_database(user_id)
+        through = await archived_through(user_id) if include_archived else date.min
+        if control_date_from is None and control_date_to is None:
+            query = LEDGER_TRANSACTIONS_QUERY if reaches_archive(through, None) else USER_TRANSACTIONS_QUERY
+            return await query.fetch_all(
+                db, user_id=user_id, limit=limit, offset=offset
+            )
+        ledger = reaches_archive(through, control_date_from)
+        query = LEDGER_TRANSACTIONS_RANGE_QUERY if ledger else USER_TRANSACTIONS_RANGE_QUERY
+        return await query.fetch_all(
+            db,
+            user_id=user_id,
+            control_date_from=control_date_from or date.min,
+            control_date_to=control_date_to or date.max,
+            limit=limit,
+            offset=offset
+        )
     
     @staticmethod
-    async def get_user_transactions_count(user_id: int) -> int:
-        """Get total count of transactions for a user."""
-        from sqlalchemy import func
-        query = transactions_table.select().with_only_columns(func.count()).where(
-            transactions_table.c.user_id == user_id
-        )
-        result = await database.fetch_one(query)
-        return result[0] if result else 0
+    @coalesced
+    async def get_user_transactions_count(user_id: int, include_archived: bool = True) -> int:
+        """Get total count of transactions for a user, archived ones included unless ``include_archived`` is False."""
+        through = await archived_through(user_id) if include_archived else date.min
+        query = LEDGER_TRANSACTIONS_COUNT_QUERY if reaches_archive(through, None) else USER_TRANSACTIONS_COUNT_QUERY
+        result = await query.fetch_val(get_read_database(user_id), user_id=user_id)
+        return result or 0
+    
+    @staticmethod
+    def export_transactions(user_id: int, chunk_size: int) -> AsyncIterator[list]:
+        """Every transaction of the user, archived ones included, in chunks of rows.
+
+        Ordered by control date, date and id. The rows are read through a
+        server-side cursor on the user's read database.
+        """
+        return EXPORT_TRANSACTIONS_QUERY.iterate_chunks(get_read_database(user_id), chunk_size, user_id=user_id)
     
     @staticmethod
     async def get_transaction_by_id(transaction_id: int, user_id: int) -> Optional[dict]:
         """Get a specific transaction by ID for a user."""
-        query = transactions_table.select().where(
-            transactions_table.c.id == transaction_id,
-            transactions_table.c.user_id == user_id
+        return await TRANSACTION_BY_ID_QUERY.fetch_one(
+            get_read_database(user_id), transaction_id=transaction_id, user_id=user_id
         )
-        return await database.fetch_one(query)
     
     @staticmethod
+    @writes_user_data
     async def create_transaction(transaction: TransactionCreate, user_id: int) -> dict:
         """Create a new transaction."""
         current_time = datetime.utcnow()
+        control_date = transaction.control_date
+        if control_date is None:
+            control_date = (await ControlDateService.derive_control_dates(user_id, [transaction.date]))[0]
+        control_date = _stored_control_date(control_date, transaction.date)
         
         query = transactions_table.insert().values(
             description=transaction.description,
             amount=transaction.amount,
             date=transaction.date,
-            control_date=transaction.control_date,
+            control_date=control_date,
             category=transaction.category,
             account=transaction.account,
             user_id=user_id,
@@ -55,23 +183,38 @@ class TransactionService:
         )
         
         transaction_id = await database.execute(query)
-        return {**transaction.dict(), "id": transaction_id, "user_id": user_id}
+        await _transactions_changed(user_id, [transaction.date])
+        return {**transaction.dict(), "control_date": control_date, "id": transaction_id, "user_id": user_id}
     
     @staticmethod
+    @writes_user_data
     async def create_transactions_bulk(transactions: List[TransactionCreate], user_id: int) -> dict:
-        """Create multiple transactions at once using optimized bulk insert."""
+        """Create multiple transactions at once using optimized bulk insert.
+        
+        Rows without a control_date get one derived from the user's control
+        date configuration in a single pass.
+        """
         if not transactions:
             return {"inserted_count": 0}
         
         current_time = datetime.utcnow()
         
+        control_dates = [t.control_date for t in transactions]
+        missing = [i for i, control_date in enumerate(control_dates) if control_date is None]
+        if missing:
+            derived = await ControlDateService.derive_control_dates(
+                user_id, [transactions[i].date for i in missing]
+            )
+            for i, control_date in zip(missing, derived):
+                control_dates[i] = control_date
+        
         # Use bulk insert for better performance
         values = [
             {
                 "description": t.description,
                 "amount": t.amount,
                 "date": t.date,
-                "control_date": t.control_date,
+                "control_date": _stored_control_date(control_date, t.date),
                 "category": t.category,
                 "account": t.account,
                 "user_id": user_id,
@@ -80,16 +223,18 @@ class TransactionService:
                 "update_by": user_id,
                 "update_date": current_time
             }
-            for t in transactions
+            for t, control_date in zip(transactions, control_dates)
         ]
         
         # Use execute_many for true bulk operation
         query = transactions_table.insert()
         await database.execute_many(query=query, values=values)
+        await _transactions_changed(user_id, [t.date for t in transactions])
         
         return {"inserted_count": len(values)}
     
     @staticmethod
+    @writes_user_data
     async def update_transaction(transaction_id: int, transaction: TransactionUpdate, user_id: int) -> Optional[dict]:
         """Update an existing transaction."""
         # Prepare update data
@@ -97,6 +242,15 @@ class TransactionService:
         if not update_data:
             return await TransactionService.get_transaction_by_id(transaction_id, user_id)
         
+        existing = await TransactionService.get_transaction_by_id(transaction_id, user_id)
+        if not existing:
+            return None
+        
+        if "control_date" in update_data:
+            update_data["control_date"] = _stored_control_date(
+                update_data["control_date"], update_data.get("date", existing["date"])
+            )
+        
         # Add audit fields
         current_time = datetime.utcnow()
         update_data["update_by"] = user_id
@@ -111,11 +265,13 @@ class TransactionService:
         result = await database.execute(update_query)
         if result == 0:  # No rows affected means transaction doesn't exist or doesn't belong to user
             return None
+        await _transactions_changed(user_id, [existing["date"], update_data.get("date")])
         
         # Return updated transaction
         return await TransactionService.get_transaction_by_id(transaction_id, user_id)
     
     @staticmethod
+    @writes_user_data
     async def delete_transaction(transaction_id: int, user_id: int) -> bool:
         """Delete a transaction."""
         # Check if transaction exists and belongs to user
@@ -130,4 +286,5 @@ class TransactionService:
         )
         
         await database.execute(delete_query)
+        await _transactions_changed(user_id, [existing["date"]])
         return True
@@ -1,22 +1,39 @@
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import bindparam
+from ..core.cache import cached
+from ..core.coalesce import coalesced
 from ..core.database import database
+from ..core.queries import PreparedQuery
 from ..core.security import get_password_hash, verify_password
 from ..models.database_models import users_table
 from ..schemas.user_schemas import UserCreate
 
+# Looked up on every authenticated request, compiled once at startup
+USER_BY_USERNAME_QUERY = PreparedQuery(
+    users_table.select().where(users_table.c.username == bindparam("username"))
+)
+
+USER_BY_ID_QUERY = PreparedQuery(
+    users_table.select().where(users_table.c.id == bindparam("user_id"))
+)
+
 class UserService:
     @staticmethod
+    @cached("user", user_arg="username")
+    @coalesced(user_arg="username")
     async def get_user_by_username(username: str) -> Optional[dict]:
-        """Get a user by username."""
-        query = users_table.select().where(users_table.c.username == username)
-        return await database.fetch_one(query)
+        """Get a user by username.
+
+        Backs the authentication of every request, so it is cached; a write
+        to a user's row must invalidate ``("user", username)``.
+        """
+        return await USER_BY_USERNAME_QUERY.fetch_one(database, username=username)
     
     @staticmethod
     async def get_user_by_id(user_id: int) -> Optional[dict]:
         """Get a user by ID."""
-        query = users_table.select().where(users_table.c.id == user_id)
-        return await database.fetch_one(query)
+        return await USER_BY_ID_QUERY.fetch_one(database, user_id=user_id)
     
     @staticmethod
     async def create_user(user: UserCreate) -> dict:
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latency, peak memory and payload size of serializing a large
+transaction list through FastAPI's response_model path (pydantic validation
+per row, then json.dumps) versus the orjson RecordListResponse fast path and
+the columnar format.
+
+Run from the backend directory:
+    python -m benchmarks.bench_list_serialization [rows]
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.core.responses import serialize_records, serialize_columnar
+from app.schemas.transaction_schemas import Transaction
+
+CATEGORIES = ["Groceries", "Rent", "Salary", "Transport", "Utilities", "Leisure"]
+ACCOUNTS = ["Checking", "Savings", "Credit Card"]
+
+def make_rows(count: int) -> List[dict]:
+    rng = random.Random(42)
+    start = date(2020, 1, 1)
+    now = datetime(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        day = start + timedelta(days=rng.randrange(1500))
+        rows.append({
+            "id": i + 1,
+            "description": f"Transaction {i}",
+            "amount": round(rng.uniform(-500, 500), 2),
+            "date": day,
+            "control_date": day.replace(day=1),
+            "category": rng.choice(CATEGORIES),
+            "account": rng.choice(ACCOUNTS),
+            "user_id": 1,
+            "create_by": 1,
+            "create_date": now,
+            "update_by": 1,
+            "update_date": now,
+        })
+    return rows
+
+def response_model_path(rows, adapter) -> bytes:
+    validated = adapter.validate_python(rows, from_attributes=True)
+    content = adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def fast_path(rows, adapter) -> bytes:
+    return serialize_records(rows, Transaction)
+
+def columnar_path(rows, adapter) -> bytes:
+    return serialize_columnar(rows, Transaction, ("category", "account"))
+
+def measure(func, rows, adapter):
+    func(rows, adapter)  # warm up
+    start = time.perf_counter()
+    for _ in range(5):
+        body = func(rows, adapter)
+    elapsed = (time.perf_counter() - start) / 5
+    tracemalloc.start()
+    func(rows, adapter)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, body
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rows = make_rows(count)
+    adapter = TypeAdapter(List[Transaction])
+
+    slow_time, slow_peak, slow_body = measure(response_model_path, rows, adapter)
+    fast_time, fast_peak, fast_body = measure(fast_path, rows, adapter)
+    columnar_time, columnar_peak, columnar_body = measure(columnar_path, rows, adapter)
+    assert json.loads(slow_body) == json.loads(fast_body), "fast path output differs"
+
+    print(f"{count} rows")
+    print(f"{'path':<16}{'ms/response':>14}{'peak MiB':>12}{'KiB':>10}")
+    for name, elapsed, peak, body in [
+        ("response_model", slow_time, slow_peak, slow_body),
+        ("orjson records", fast_time, fast_peak, fast_body),
+        ("columnar", columnar_time, columnar_peak, columnar_body),
+    ]:
+        print(f"{name:<16}{elapsed * 1000:>14.1f}{peak / 2**20:>12.1f}{len(body) / 1024:>10.0f}")
+    print(f"speedup: {slow_time / fast_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
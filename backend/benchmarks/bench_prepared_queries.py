@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-call CPU of building and compiling a SQLAlchemy Core
+statement (what databases does on every call) versus binding parameters
+into a PreparedQuery compiled once at startup.
+
+Run from the backend directory:
+    python -m benchmarks.bench_prepared_queries
+"""
+
+import timeit
+
+from app.core.database import database
+from app.core.queries import compile_prepared_queries
+from app.models.database_models import transactions_table, users_table
+from app.services.transaction_service import USER_TRANSACTIONS_QUERY
+from app.services.user_service import USER_BY_USERNAME_QUERY
+
+NUMBER = 20000
+
+def main():
+    connection = database._backend.connection()
+    compile_prepared_queries(database)
+
+    def dynamic_transactions():
+        query = transactions_table.select().where(
+            transactions_table.c.user_id == 42
+        ).order_by(
+            transactions_table.c.control_date.desc(),
+            transactions_table.c.date.desc()
+        ).limit(100).offset(0)
+        connection._compile(query)
+
+    def prepared_transactions():
+        USER_TRANSACTIONS_QUERY.bind(database, {"user_id": 42, "limit": 100, "offset": 0})
+
+    def dynamic_user():
+        connection._compile(users_table.select().where(users_table.c.username == "alice"))
+
+    def prepared_user():
+        USER_BY_USERNAME_QUERY.bind(database, {"username": "alice"})
+
+    cases = [
+        ("get_user_transactions", dynamic_transactions, prepared_transactions),
+        ("get_user_by_username", dynamic_user, prepared_user),
+    ]
+    print(f"{'query':<24}{'dynamic us/call':>18}{'prepared us/call':>18}{'speedup':>10}")
+    for name, dynamic, prepared in cases:
+        dynamic_us = min(timeit.repeat(dynamic, number=NUMBER, repeat=3)) / NUMBER * 1e6
+        prepared_us = min(timeit.repeat(prepared, number=NUMBER, repeat=3)) / NUMBER * 1e6
+        print(f"{name:<24}{dynamic_us:>18.2f}{prepared_us:>18.2f}{dynamic_us / prepared_us:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
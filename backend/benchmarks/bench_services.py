@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for service-layer hot paths against a local database:
+bulk transaction inserts (1k/10k/100k rows), budget preferences with many
+categories, credit payment reads and writes, and get_current_user.
+
+Data comes from a fixed seed and belongs to a dedicated ``bench_services``
+user, which is removed afterwards. The schema must exist
+(``python -m app.core.migrations upgrade``). Results are printed as a table
+and written as JSON with ``--output``.
+
+Run from the backend directory:
+    python -m benchmarks.bench_services --output bench_services.json
+    python -m benchmarks.bench_services --only bulk_insert_1k,get_current_user
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from app.core.database import connect_db, database, disconnect_db
+from app.core.queries import compile_prepared_queries
+from app.core.security import create_access_token, get_current_user
+from app.models.database_models import (
+    balance_checkpoint_coverage_table,
+    balance_checkpoints_table,
+    budget_preference_categories_table,
+    budget_preferences_table,
+    credit_payments_table,
+    credits_table,
+    transactions_archive_table,
+    transactions_table,
+    users_table,
+)
+from app.schemas.budget_preference_schemas import BudgetPreferenceCreate
+from app.schemas.credit_schemas import CreditCreate, CreditPaymentCreate
+from app.schemas.transaction_schemas import TransactionCreate
+from app.schemas.user_schemas import UserCreate
+from app.services.budget_preference_service import budget_preference_service
+from app.services.credit_service import CreditService
+from app.services.transaction_service import TransactionService
+from app.services.user_service import UserService
+
+BENCH_USERNAME = "bench_services"
+CATEGORIES = ["Groceries", "Rent", "Salary", "Transport", "Utilities", "Leisure", "Health", "Gifts"]
+ACCOUNTS = ["Checking", "Savings", "Credit Card"]
+
+def make_transactions(rng: random.Random, count: int):
+    start = date(2020, 1, 1)
+    transactions = []
+    for i in range(count):
+        day = start + timedelta(days=rng.randrange(1500))
+        transactions.append(TransactionCreate(
+            description=f"Bench transaction {i}",
+            amount=round(rng.uniform(-500, 500), 2),
+            date=day,
+            control_date=day.replace(day=1),
+            category=rng.choice(CATEGORIES),
+            account=rng.choice(ACCOUNTS),
+        ))
+    return transactions
+
+async def measure(name: str, func, repeat: int, warmup: int = 1, teardown=None, rows: int = None) -> dict:
+    """Time ``func`` ``repeat`` times after ``warmup`` untimed runs."""
+    for _ in range(warmup):
+        await func()
+        if teardown:
+            await teardown()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - started) * 1000)
+        if teardown:
+            await teardown()
+    result = {
+        "name": name,
+        "repeat": repeat,
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "p95_ms": round(statistics.quantiles(timings, n=20)[-1], 3) if repeat >= 2 else round(timings[0], 3),
+    }
+    if rows:
+        result["rows"] = rows
+        result["rows_per_s"] = round(rows / (result["median_ms"] / 1000))
+    return result
+
+async def cleanup(user_id: int):
+    credit_ids = credits_table.select().with_only_columns(credits_table.c.id).where(
+        credits_table.c.user_id == user_id
+    )
+    await database.execute(credit_payments_table.delete().where(credit_payments_table.c.credit_id.in_(credit_ids)))
+    bp_ids = budget_preferences_table.select().with_only_columns(budget_preferences_table.c.id).where(
+        budget_preferences_table.c.user_id == user_id
+    )
+    await database.execute(budget_preference_categories_table.delete().where(
+        budget_preference_categories_table.c.budget_preference_id.in_(bp_ids)
+    ))
+    for table in (budget_preferences_table, credits_table, transactions_table,
+                  balance_checkpoints_table, balance_checkpoint_coverage_table, transactions_archive_table):
+        await database.execute(table.delete().where(table.c.user_id == user_id))
+
+async def delete_transactions(user_id: int):
+    await database.execute(transactions_table.delete().where(transactions_table.c.user_id == user_id))
+
+async def run(seed: int, only: set, budget_preferences: int, categories_per_preference: int, payments: int):
+    rng = random.Random(seed)
+    existing = await UserService.get_user_by_username(BENCH_USERNAME)
+    if existing:
+        user_id = existing["id"]
+    else:
+        user_id = (await UserService.create_user(UserCreate(username=BENCH_USERNAME, password="bench")))["id"]
+    await cleanup(user_id)
+
+    def wanted(name):
+        return not only or name in only
+
+    results = []
+    try:
+        for label, count, repeat in (("1k", 1000, 10), ("10k", 10000, 5), ("100k", 100000, 2)):
+            name = f"bulk_insert_{label}"
+            if not wanted(name):
+                continue
+            transactions = make_transactions(rng, count)
+            results.append(await measure(
+                name,
+                lambda: TransactionService.create_transactions_bulk(transactions, user_id),
+                repeat=repeat,
+                teardown=lambda: delete_transactions(user_id),
+                rows=count,
+            ))
+
+        if wanted("get_user_budget_preferences"):
+            percentage = round(100 / budget_preferences, 2)
+            for p in range(budget_preferences):
+                await budget_preference_service.create_budget_preference(
+                    BudgetPreferenceCreate(
+                        name=f"Bench preference {p}",
+                        percentage=percentage,
+                        categories=[f"Category {p}.{c}" for c in range(categories_per_preference)],
+                    ),
+                    user_id,
+                    user_id,
+                )
+            results.append(await measure(
+                "get_user_budget_preferences",
+                lambda: budget_preference_service.get_user_budget_preferences(user_id),
+                repeat=50,
+                rows=budget_preferences * categories_per_preference,
+            ))
+
+        credit_names = [n for n in ("get_payments_by_credit", "get_payments_by_user", "create_payment") if wanted(n)]
+        if credit_names:
+            credits = [
+                await CreditService.create_credit(
+                    CreditCreate(name=f"Bench credit {c}", monthly_value=250.0, payment_day=5, total_amount=30000.0),
+                    user_id,
+                )
+                for c in range(5)
+            ]
+            now = datetime.utcnow()
+            await database.execute_many(credit_payments_table.insert(), [
+                {
+                    "credit_id": credit["id"],
+                    "value": round(rng.uniform(100, 400), 2),
+                    "date": date(2015, 1, 5) + timedelta(days=30 * i),
+                    "type": "scheduled" if rng.random() < 0.9 else "off_schedule",
+                    "create_by": user_id,
+                    "create_date": now,
+                    "update_by": user_id,
+                    "update_date": now,
+                }
+                for credit in credits
+                for i in range(payments // len(credits))
+            ])
+            credit_id = credits[0]["id"]
+            if wanted("get_payments_by_credit"):
+                results.append(await measure(
+                    "get_payments_by_credit",
+                    lambda: CreditService.get_payments_by_credit(credit_id, user_id),
+                    repeat=50,
+                    rows=payments // len(credits),
+                ))
+            if wanted("get_payments_by_user"):
+                results.append(await measure(
+                    "get_payments_by_user",
+                    lambda: CreditService.get_payments_by_user(user_id),
+                    repeat=50,
+                    rows=payments,
+                ))
+            if wanted("create_payment"):
+                payment = CreditPaymentCreate(credit_id=credit_id, value=250.0, date=date(2030, 1, 5), type="off_schedule")
+                results.append(await measure(
+                    "create_payment",
+                    lambda: CreditService.create_payment(payment, user_id),
+                    repeat=200,
+                ))
+
+        if wanted("get_current_user"):
+            token = create_access_token({"sub": BENCH_USERNAME})
+            results.append(await measure("get_current_user", lambda: get_current_user(token), repeat=500))
+    finally:
+        await cleanup(user_id)
+        await database.execute(users_table.delete().where(users_table.c.id == user_id))
+    return results
+
+async def main():
+    parser = argparse.ArgumentParser(description="Service-layer microbenchmarks")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", default="", help="comma-separated benchmark names")
+    parser.add_argument("--budget-preferences", type=int, default=20)
+    parser.add_argument("--categories-per-preference", type=int, default=25)
+    parser.add_argument("--payments", type=int, default=1000, help="payments spread over 5 credits")
+    parser.add_argument("--output", help="write results JSON here")
+    args = parser.parse_args()
+
+    await connect_db()
+    compile_prepared_queries(database)
+    try:
+        results = await run(
+            args.seed,
+            {name for name in args.only.split(",") if name},
+            args.budget_preferences,
+            args.categories_per_preference,
+            args.payments,
+        )
+    finally:
+        await disconnect_db()
+
+    print(f"{'benchmark':<30}{'repeat':>7}{'min ms':>10}{'median ms':>11}{'p95 ms':>10}{'rows/s':>12}")
+    for r in results:
+        rows_per_s = f"{r['rows_per_s']:,}" if "rows_per_s" in r else "-"
+        print(f"{r['name']:<30}{r['repeat']:>7}{r['min_ms']:>10.2f}{r['median_ms']:>11.2f}{r['p95_ms']:>10.2f}{rows_per_s:>12}")
+
+    if args.output:
+        document = {
+            "meta": {
+                "seed": args.seed,
+                "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
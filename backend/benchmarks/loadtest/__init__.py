@@ -0,0 +1,14 @@
+"""
+End-to-end load test: a synthetic data generator plus an HTTP workload driver.
+
+Run from the backend directory against a local Postgres and a running app:
+    python -m benchmarks.loadtest.generate --users 200 --transactions 2000
+    python -m benchmarks.loadtest.run --users 200 --concurrency 50 --duration 60 \\
+        --baseline benchmarks/loadtest/baseline.json
+"""
+
+USERNAME_PREFIX = "loadtest_"
+DEFAULT_PASSWORD = "loadtest-password"
+
+def username(index: int) -> str:
+    return f"{USERNAME_PREFIX}{index:05d}"
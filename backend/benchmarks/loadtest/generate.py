@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic users with transactions, control dates, credits, credit
+payments and budget preferences, loaded with COPY.
+
+Per-user transaction counts are log-normal around ``--transactions`` (a few
+heavy users, many light ones). Each month has a salary and rent; other
+spending follows weighted categories with log-normal amounts. Previously
+generated load-test users and their data are removed first.
+
+Run from the backend directory:
+    python -m benchmarks.loadtest.generate --users 200 --transactions 2000 --months 24
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+from datetime import date, datetime, timedelta
+
+import asyncpg
+
+from app.core.database import get_dsn
+from app.core.security import get_password_hash
+
+from . import DEFAULT_PASSWORD, USERNAME_PREFIX, username
+
+# (category, weight, median amount)
+SPENDING = [
+    ("Groceries", 30, 45.0),
+    ("Transport", 15, 20.0),
+    ("Leisure", 15, 35.0),
+    ("Shopping", 12, 60.0),
+    ("Utilities", 10, 80.0),
+    ("Health", 8, 40.0),
+    ("Gifts", 5, 50.0),
+    ("Other", 5, 25.0),
+]
+ACCOUNTS = [("Checking", 60), ("Credit Card", 30), ("Savings", 10)]
+BUDGETS = [
+    ("Needs", 50, ["Rent", "Groceries", "Utilities", "Health"]),
+    ("Wants", 30, ["Leisure", "Shopping", "Transport", "Gifts", "Other"]),
+    ("Savings", 20, ["Savings"]),
+]
+CREDIT_NAMES = ["Mortgage", "Car loan", "Personal loan", "Student loan", "Phone"]
+
+def _month_start(months_ago: int, today: date) -> date:
+    index = today.year * 12 + today.month - 1 - months_ago
+    return date(index // 12, index % 12 + 1, 1)
+
+def _lognormal_count(rng: random.Random, mean: float, sigma: float = 0.75) -> int:
+    mu = math.log(max(mean, 1)) - sigma * sigma / 2
+    return max(1, min(int(rng.lognormvariate(mu, sigma)), int(mean * 20)))
+
+def _user_rows(rng: random.Random, user_id: int, transactions: int, months: int, today: date, now: datetime):
+    categories = [c for c, _, _ in SPENDING]
+    weights = [w for _, w, _ in SPENDING]
+    medians = {c: m for c, _, m in SPENDING}
+    accounts = [a for a, _ in ACCOUNTS]
+    account_weights = [w for _, w in ACCOUNTS]
+    audit = (user_id, now, user_id, now)
+
+    rows = []
+    salary = max(800.0, rng.gauss(2500, 800))
+    rent = round(salary * rng.uniform(0.25, 0.4), 2)
+    for months_ago in range(months):
+        month = _month_start(months_ago, today)
+        payday = month + timedelta(days=rng.randrange(24, 28))
+        if payday <= today:
+            rows.append(("Salary", round(salary * rng.uniform(0.98, 1.05), 2), payday,
+                         month, "Salary", "Checking", user_id) + audit)
+        rows.append(("Rent", -rent, month, month, "Rent", "Checking", user_id) + audit)
+
+    for i in range(max(0, transactions - 2 * months)):
+        category = rng.choices(categories, weights)[0]
+        day = today - timedelta(days=rng.randrange(months * 30))
+        amount = -round(rng.lognormvariate(math.log(medians[category]), 0.6), 2)
+        rows.append((f"{category} {i}", amount, day, day.replace(day=1), category,
+                     rng.choices(accounts, account_weights)[0], user_id) + audit)
+    return rows
+
+async def reset(conn):
+    user_ids = [r["id"] for r in await conn.fetch(
+        "SELECT id FROM users WHERE username LIKE $1", USERNAME_PREFIX + "%"
+    )]
+    if not user_ids:
+        return 0
+    await conn.execute(
+        "DELETE FROM credit_payments WHERE credit_id IN (SELECT id FROM credits WHERE user_id = ANY($1))", user_ids
+    )
+    await conn.execute(
+        "DELETE FROM budget_preference_categories WHERE budget_preference_id IN "
+        "(SELECT id FROM budget_preferences WHERE user_id = ANY($1))", user_ids
+    )
+    for table in ("transactions", "credits", "budget_preferences", "control_dates",
+                  "balance_checkpoints", "balance_checkpoint_coverage", "transactions_archive"):
+        await conn.execute(f"DELETE FROM {table} WHERE user_id = ANY($1)", user_ids)
+    await conn.execute("DELETE FROM users WHERE id = ANY($1)", user_ids)
+    return len(user_ids)
+
+async def generate(conn, users: int, transactions: int, months: int, seed: int):
+    rng = random.Random(seed)
+    today = date.today()
+    now = datetime.utcnow()
+    hashed_password = get_password_hash(DEFAULT_PASSWORD)
+
+    await conn.copy_records_to_table(
+        "users",
+        columns=["username", "hashed_password", "create_by", "create_date", "update_by", "update_date"],
+        records=[(username(i), hashed_password, 0, now, 0, now) for i in range(users)],
+    )
+    user_ids = [r["id"] for r in await conn.fetch(
+        "SELECT id FROM users WHERE username LIKE $1 ORDER BY username", USERNAME_PREFIX + "%"
+    )]
+
+    current_month = today.replace(day=1)
+    await conn.copy_records_to_table(
+        "control_dates",
+        columns=["user_id", "year", "month", "control_date", "create_by", "create_date", "update_by", "update_date"],
+        records=[(u, today.year, today.month, current_month, u, now, u, now) for u in user_ids],
+    )
+
+    transaction_columns = ["description", "amount", "date", "control_date", "category", "account",
+                           "user_id", "create_by", "create_date", "update_by", "update_date"]
+    total = 0
+    for user_id in user_ids:
+        rows = _user_rows(rng, user_id, _lognormal_count(rng, transactions), months, today, now)
+        await conn.copy_records_to_table("transactions", columns=transaction_columns, records=rows)
+        total += len(rows)
+
+    credits = []
+    for user_id in user_ids:
+        for name in rng.sample(CREDIT_NAMES, rng.choices([0, 1, 2, 3], [30, 40, 20, 10])[0]):
+            monthly_value = round(rng.uniform(50, 600), 2)
+            total_amount = round(monthly_value * rng.randint(12, 120), 2) if rng.random() < 0.8 else None
+            credits.append((name, monthly_value, rng.randint(1, 28), total_amount, user_id, user_id, now, user_id, now))
+    await conn.copy_records_to_table(
+        "credits",
+        columns=["name", "monthly_value", "payment_day", "total_amount", "user_id",
+                 "create_by", "create_date", "update_by", "update_date"],
+        records=credits,
+    )
+
+    payments = []
+    for credit in await conn.fetch(
+        "SELECT id, user_id, monthly_value, payment_day FROM credits WHERE user_id = ANY($1)", user_ids
+    ):
+        for months_ago in range(months):
+            due = _month_start(months_ago, today).replace(day=credit["payment_day"])
+            if due > today:
+                continue
+            payments.append((credit["id"], credit["monthly_value"], due, "scheduled",
+                             credit["user_id"], now, credit["user_id"], now))
+            if rng.random() < 0.1:
+                payments.append((credit["id"], round(credit["monthly_value"] * rng.uniform(0.5, 3), 2),
+                                 due + timedelta(days=rng.randrange(1, 10)), "off_schedule",
+                                 credit["user_id"], now, credit["user_id"], now))
+    await conn.copy_records_to_table(
+        "credit_payments",
+        columns=["credit_id", "value", "date", "type", "create_by", "create_date", "update_by", "update_date"],
+        records=payments,
+    )
+
+    preferences = []
+    for user_id in user_ids:
+        # Shift some of the needs/wants split per user, keeping the total at 100%
+        shift = rng.choice([-5, 0, 0, 5])
+        for name, percentage, _ in BUDGETS:
+            percentage += {"Needs": shift, "Wants": -shift}.get(name, 0)
+            preferences.append((name, float(percentage), user_id, user_id, now, user_id, now))
+    await conn.copy_records_to_table(
+        "budget_preferences",
+        columns=["name", "percentage", "user_id", "create_by", "create_date", "update_by", "update_date"],
+        records=preferences,
+    )
+    budget_categories = {name: categories for name, _, categories in BUDGETS}
+    await conn.copy_records_to_table(
+        "budget_preference_categories",
+        columns=["budget_preference_id", "category", "create_by", "create_date"],
+        records=[
+            (bp["id"], category, bp["user_id"], now)
+            for bp in await conn.fetch(
+                "SELECT id, name, user_id FROM budget_preferences WHERE user_id = ANY($1)", user_ids
+            )
+            for category in budget_categories[bp["name"]]
+        ],
+    )
+
+    for table in ("users", "transactions", "control_dates", "credits", "credit_payments",
+                  "budget_preferences", "budget_preference_categories"):
+        await conn.execute(f"ANALYZE {table}")
+    return {"users": len(user_ids), "transactions": total, "credits": len(credits),
+            "credit_payments": len(payments), "budget_preferences": len(preferences)}
+
+async def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic load-test data")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--transactions", type=int, default=2000, help="mean transactions per user")
+    parser.add_argument("--months", type=int, default=24, help="history length")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dsn", default=None, help="defaults to DATABASE_URL")
+    args = parser.parse_args()
+
+    conn = await asyncpg.connect(args.dsn or get_dsn())
+    try:
+        started = time.perf_counter()
+        removed = await reset(conn)
+        if removed:
+            print(f"Removed {removed} previous load-test users")
+        counts = await generate(conn, args.users, args.transactions, args.months, args.seed)
+        print(", ".join(f"{count:,} {name}" for name, count in counts.items()))
+        print(f"Generated in {time.perf_counter() - started:.1f}s; password for every user: {DEFAULT_PASSWORD}")
+    finally:
+        await conn.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Replay a dashboard-like workload against a running app and report
+per-endpoint throughput and p50/p95/p99 latency.
+
+Each virtual user logs in as one generated user and loops over weighted
+requests (dashboard bootstrap, transaction pages, counts, credits, budget
+preferences, occasional writes) with optional think time. Requests during
+the warmup are not measured. 429/503 responses from admission control are
+reported as shed; raise RATE_LIMIT_* on the server to measure raw capacity.
+
+With ``--baseline`` the results are compared to a previous run and the
+process exits with status 1 when an endpoint regressed beyond
+``--tolerance``; ``--update-baseline`` writes the current results there.
+
+Run from the backend directory:
+    python -m benchmarks.loadtest.run --base-url http://localhost:8000 \\
+        --users 200 --concurrency 50 --duration 60 --baseline benchmarks/loadtest/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import date
+from typing import Dict, List
+
+import httpx
+
+from . import DEFAULT_PASSWORD, username
+
+# (name, weight, method, path)
+WORKLOAD = [
+    ("dashboard", 30, "GET", "/dashboard?limit=1000"),
+    ("transactions_page", 25, "GET", "/transactions/?limit=100&offset={offset}"),
+    ("transactions_columnar", 5, "GET", "/transactions/?format=columnar&limit=5000"),
+    ("transactions_count", 10, "GET", "/transactions/count"),
+    ("credits", 10, "GET", "/credits/"),
+    ("budget_preferences", 10, "GET", "/budget-preferences/"),
+    ("control_date", 5, "GET", "/config/control_date/"),
+    ("create_transaction", 5, "POST", "/transactions/"),
+]
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.shed = 0
+
+    def summary(self, duration: float) -> dict:
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        if count >= 2:
+            cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+            p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+        else:
+            p50 = p95 = p99 = latencies[0] if latencies else 0.0
+        requests = count + self.errors + self.shed
+        return {
+            "requests": requests,
+            "rps": round(count / duration, 2),
+            "p50_ms": round(p50, 2),
+            "p95_ms": round(p95, 2),
+            "p99_ms": round(p99, 2),
+            "error_rate": round(self.errors / requests, 4) if requests else 0.0,
+            "shed": self.shed,
+        }
+
+async def login(client: httpx.AsyncClient, index: int) -> str:
+    response = await client.post("/token", data={"username": username(index), "password": DEFAULT_PASSWORD})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+async def login_all(client: httpx.AsyncClient, users: int, parallel: int = 8) -> List[str]:
+    semaphore = asyncio.Semaphore(parallel)
+
+    async def one(index):
+        async with semaphore:
+            return await login(client, index)
+
+    return await asyncio.gather(*(one(i) for i in range(users)))
+
+async def virtual_user(client, token, stats, rng, measure_from, stop_at, think_ms):
+    headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip, br, zstd"}
+    names = [w[0] for w in WORKLOAD]
+    weights = [w[1] for w in WORKLOAD]
+    requests = {w[0]: (w[2], w[3]) for w in WORKLOAD}
+
+    while time.monotonic() < stop_at:
+        name = rng.choices(names, weights)[0]
+        method, path = requests[name]
+        body = None
+        if method == "POST":
+            today = date.today()
+            body = {
+                "description": "Load test",
+                "amount": -round(rng.uniform(1, 100), 2),
+                "date": today.isoformat(),
+                "control_date": today.replace(day=1).isoformat(),
+                "category": "Other",
+                "account": "Checking",
+            }
+        started = time.monotonic()
+        try:
+            response = await client.request(
+                method, path.format(offset=rng.choice([0, 0, 100, 200])), headers=headers, json=body
+            )
+            status = response.status_code
+        except httpx.HTTPError:
+            status = None
+        elapsed_ms = (time.monotonic() - started) * 1000
+
+        if started >= measure_from:
+            entry = stats[name]
+            if status in (429, 503):
+                entry.shed += 1
+            elif status is None or status >= 400:
+                entry.errors += 1
+            else:
+                entry.latencies.append(elapsed_ms)
+        if think_ms:
+            await asyncio.sleep(rng.expovariate(1000 / think_ms))
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Regressions of ``results`` against ``baseline``, as human-readable lines."""
+    regressions = []
+    for name, base in baseline["endpoints"].items():
+        current = results["endpoints"].get(name)
+        if current is None:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if base[metric] and current[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {current[metric]} > baseline {base[metric]} (+{tolerance:.0%})")
+        if base["rps"] and current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {current['rps']} < baseline {base['rps']} (-{tolerance:.0%})")
+        if current["error_rate"] > base["error_rate"] + 0.01:
+            regressions.append(f"{name}: error_rate {current['error_rate']} > baseline {base['error_rate']}")
+    return regressions
+
+def print_report(results: dict):
+    print(f"\n{'endpoint':<24}{'requests':>10}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}{'shed':>7}")
+    for name, s in results["endpoints"].items():
+        print(f"{name:<24}{s['requests']:>10}{s['rps']:>9.1f}{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}"
+              f"{s['p99_ms']:>9.1f}{s['error_rate']:>8.1%}{s['shed']:>7}")
+    total = results["total"]
+    print(f"{'total':<24}{total['requests']:>10}{total['rps']:>9.1f}{total['p50_ms']:>9.1f}"
+          f"{total['p95_ms']:>9.1f}{total['p99_ms']:>9.1f}{total['error_rate']:>8.1%}{total['shed']:>7}")
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run the load-test workload against the API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=200, help="generated users to log in as")
+    parser.add_argument("--concurrency", type=int, default=50, help="virtual users")
+    parser.add_argument("--duration", type=float, default=60.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=10.0, help="unmeasured seconds before measuring")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="mean think time between requests")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--update-baseline", action="store_true", help="write results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60.0) as client:
+        print(f"Logging in {args.users} users...")
+        tokens = await login_all(client, args.users)
+
+        stats: Dict[str, EndpointStats] = {name: EndpointStats() for name, *_ in WORKLOAD}
+        measure_from = time.monotonic() + args.warmup
+        stop_at = measure_from + args.duration
+        print(f"Running {args.concurrency} virtual users for {args.warmup:.0f}s warmup + {args.duration:.0f}s...")
+        await asyncio.gather(*(
+            virtual_user(client, tokens[i % len(tokens)], stats, random.Random(args.seed + i),
+                         measure_from, stop_at, args.think_ms)
+            for i in range(args.concurrency)
+        ))
+
+    combined = EndpointStats()
+    for entry in stats.values():
+        combined.latencies.extend(entry.latencies)
+        combined.errors += entry.errors
+        combined.shed += entry.shed
+    results = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "update_baseline")},
+        "endpoints": {name: entry.summary(args.duration) for name, entry in stats.items() if entry.latencies or entry.errors},
+        "total": combined.summary(args.duration),
+    }
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,10 +4,15 @@ Entry point for the refactored Finance Tracker API.
 This replaces the old main.py file.
 """
 
+import asyncio
+
 import uvicorn
+from app.core import migrations
 from app.main import app
 
 if __name__ == "__main__":
+    # Bring the schema up to date before the server (and its reloader) start
+    asyncio.run(migrations.upgrade())
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
@@ -0,0 +1,21 @@
+from datetime import date
+
+from app.core.archive import archive_cutoff, reaches_archive
+
+
+def test_archive_cutoff():
+    assert archive_cutoff(24, date(2024, 2, 29)) == date(2022, 2, 1)
+    assert archive_cutoff(1, date(2024, 1, 31)) == date(2023, 12, 1)
+    assert archive_cutoff(0, date(2024, 2, 29)) is None
+
+
+def test_reaches_archive_without_archived_rows():
+    assert not reaches_archive(date.min, None)
+    assert not reaches_archive(date.min, date(2000, 1, 1))
+
+
+def test_reaches_archive_up_to_last_archived_day():
+    through = date(2023, 3, 31)
+    assert reaches_archive(through, None)
+    assert reaches_archive(through, date(2023, 3, 31))
+    assert not reaches_archive(through, date(2023, 4, 1))
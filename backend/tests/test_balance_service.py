@@ -0,0 +1,46 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.balance_service import bucket_start, next_bucket
+
+
+@pytest.mark.parametrize("resolution, day, expected", [
+    ("day", date(2024, 2, 29), date(2024, 2, 29)),
+    ("week", date(2024, 2, 29), date(2024, 2, 26)),
+    ("week", date(2024, 3, 3), date(2024, 2, 26)),
+    ("week", date(2024, 1, 3), date(2024, 1, 1)),
+    ("week", date(2023, 1, 1), date(2022, 12, 26)),
+    ("month", date(2024, 2, 29), date(2024, 2, 1)),
+    ("month", date(2023, 1, 31), date(2023, 1, 1)),
+    ("quarter", date(2024, 3, 31), date(2024, 1, 1)),
+    ("quarter", date(2024, 4, 1), date(2024, 4, 1)),
+    ("quarter", date(2024, 12, 31), date(2024, 10, 1)),
+    ("year", date(2024, 12, 31), date(2024, 1, 1)),
+])
+def test_bucket_start(resolution, day, expected):
+    assert bucket_start(day, resolution) == expected
+
+
+@pytest.mark.parametrize("resolution, start, expected", [
+    ("day", date(2024, 2, 28), date(2024, 2, 29)),
+    ("day", date(2023, 2, 28), date(2023, 3, 1)),
+    ("day", date(2023, 12, 31), date(2024, 1, 1)),
+    ("week", date(2024, 2, 26), date(2024, 3, 4)),
+    ("month", date(2024, 1, 1), date(2024, 2, 1)),
+    ("month", date(2024, 12, 1), date(2025, 1, 1)),
+    ("quarter", date(2024, 10, 1), date(2025, 1, 1)),
+    ("year", date(2024, 1, 1), date(2025, 1, 1)),
+])
+def test_next_bucket(resolution, start, expected):
+    assert next_bucket(start, resolution) == expected
+
+
+@pytest.mark.parametrize("resolution", ["day", "week", "month", "quarter", "year"])
+def test_buckets_tile_without_gaps(resolution):
+    bucket = bucket_start(date(2023, 12, 30), resolution)
+    for _ in range(20):
+        following = next_bucket(bucket, resolution)
+        assert bucket_start(following, resolution) == following
+        assert bucket_start(following - timedelta(days=1), resolution) == bucket
+        bucket = following
@@ -0,0 +1,76 @@
+from datetime import date
+
+import pytest
+
+from app.services.control_date_service import add_months, assign_periods, period_boundaries, period_start
+
+
+def test_add_months_crosses_years():
+    assert add_months(date(2023, 11, 1), 3) == date(2024, 2, 1)
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+
+
+@pytest.mark.parametrize("boundary_day, month, expected", [
+    (29, date(2023, 2, 1), date(2023, 2, 28)),
+    (29, date(2024, 2, 1), date(2024, 2, 29)),
+    (30, date(2024, 2, 1), date(2024, 2, 29)),
+    (31, date(2023, 2, 1), date(2023, 2, 28)),
+    (31, date(2023, 4, 1), date(2023, 4, 30)),
+    (31, date(2023, 5, 1), date(2023, 5, 31)),
+    (1, date(2023, 2, 1), date(2023, 2, 1)),
+])
+def test_period_start_clamps_to_month_length(boundary_day, month, expected):
+    assert period_start(month, boundary_day) == expected
+
+
+def test_period_boundaries_span_one_month_either_side():
+    boundaries = period_boundaries(31, date(2024, 2, 15), date(2024, 3, 10))
+    assert boundaries == [
+        date(2024, 1, 31),
+        date(2024, 2, 29),
+        date(2024, 3, 31),
+        date(2024, 4, 30),
+    ]
+
+
+def test_period_boundaries_are_sorted_across_short_months():
+    boundaries = period_boundaries(30, date(2023, 1, 1), date(2023, 12, 31))
+    assert boundaries == sorted(boundaries)
+    assert date(2023, 2, 28) in boundaries
+
+
+def test_assign_periods_on_and_around_boundary_day():
+    dates = [date(2023, 3, 24), date(2023, 3, 25), date(2023, 4, 24)]
+    assert assign_periods(dates, 25) == [date(2023, 2, 25), date(2023, 3, 25), date(2023, 3, 25)]
+
+
+@pytest.mark.parametrize("boundary_day", [29, 30, 31])
+def test_assign_periods_month_end_boundaries_non_leap_year(boundary_day):
+    dates = [date(2023, 2, 27), date(2023, 2, 28), date(2023, 3, 1)]
+    assert assign_periods(dates, boundary_day) == [
+        date(2023, 1, boundary_day),
+        date(2023, 2, 28),
+        date(2023, 2, 28),
+    ]
+
+
+def test_assign_periods_month_end_boundaries_leap_year():
+    dates = [date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 30), date(2024, 3, 31)]
+    assert assign_periods(dates, 31) == [
+        date(2024, 1, 31),
+        date(2024, 2, 29),
+        date(2024, 2, 29),
+        date(2024, 3, 31),
+    ]
+    assert assign_periods([date(2024, 2, 29)], 29) == [date(2024, 2, 29)]
+    assert assign_periods([date(2024, 2, 29)], 30) == [date(2024, 2, 29)]
+
+
+def test_assign_periods_keeps_none_in_place():
+    dates = [None, date(2023, 6, 30), None, date(2023, 7, 1)]
+    assert assign_periods(dates, 30) == [None, date(2023, 6, 30), None, date(2023, 6, 30)]
+
+
+def test_assign_periods_without_dates():
+    assert assign_periods([None, None], 15) == [None, None]
+    assert assign_periods([], 15) == []
@@ -0,0 +1,21 @@
+from app.core.logs import parse_sampling
+
+
+def test_parse_sampling():
+    assert parse_sampling("app.requests=0.1, uvicorn.access=0.5") == {
+        "app.requests": 0.1,
+        "uvicorn.access": 0.5,
+    }
+
+
+def test_parse_sampling_clamps_rates():
+    assert parse_sampling("a=2,b=-1,c=1") == {"a": 1.0, "b": 0.0, "c": 1.0}
+
+
+def test_parse_sampling_skips_blank_and_incomplete_parts():
+    assert parse_sampling("") == {}
+    assert parse_sampling(" , a=0.2,,b=,=0.3,c") == {"a": 0.2}
+
+
+def test_parse_sampling_last_entry_wins():
+    assert parse_sampling("a=0.2,a=0.4") == {"a": 0.4}
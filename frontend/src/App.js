@@ -71,9 +71,9 @@ const AppContent = () => {
   const { state: appState, actions: appActions } = useAppContext();
   const { layout, updateLayout, getVisibleComponents, isComponentVisible } = useLayout();
   const { token, isAuthenticated, login, logout } = useAuth();
-  const { transactions, createTransaction, updateTransaction, deleteTransaction } = useTransactions(token);
-  const { credits, paymentsByCredit, fetchPayments, createCredit, updateCredit, deleteCredit, createPayment, updatePayment, deletePayment } = useCredits(token);
-  const { budgetPreferences, budgetSummary, createBudgetPreference, updateBudgetPreference, deleteBudgetPreference } = useBudgetPreferences(token);
+  const { transactions, fetchTransactions, hydrateTransactions, createTransaction, updateTransaction, deleteTransaction } = useTransactions(token);
+  const { credits, paymentsByCredit, fetchCredits, hydrateCredits, fetchPayments, createCredit, updateCredit, deleteCredit, createPayment, updatePayment, deletePayment } = useCredits(token);
+  const { budgetPreferences, budgetSummary, createBudgetPreference, updateBudgetPreference, deleteBudgetPreference, hydrateBudgetPreferences, refetch: fetchBudgetPreferences } = useBudgetPreferences(token);
 
   // Local state
   const [description, setDescription] = useState("");
@@ -396,11 +396,47 @@ const AppContent = () => {
     return allCategories;
   }, [budgetPreferences]);
 
-  // Load config on mount
+  // Load everything on sign-in with a single dashboard request
   useEffect(() => {
-    if (token) {
-      fetchControlDateConfig();
-    }
+    if (!token) return undefined;
+    let cancelled = false;
+    let retryTimer = null;
+    const loadDashboard = async () => {
+      try {
+        const data = await apiService.getDashboard(token);
+        if (cancelled) return;
+        hydrateTransactions(data.transactions);
+        hydrateCredits(data.credits, data.credit_payments);
+        hydrateBudgetPreferences(data.budget_preferences);
+        if (data.control_date) {
+          setConfigYear(data.control_date.year.toString());
+          setConfigMonth(data.control_date.month.toString());
+          setConfigControlDate(data.control_date.control_date);
+        }
+        // The dashboard caps the list at its limit; fetch the full list when it was cut short
+        if (data.transactions_total > data.transactions.length) {
+          console.warn(`Dashboard returned ${data.transactions.length} of ${data.transactions_total} transactions; loading the rest`);
+          fetchTransactions(true);
+        }
+      } catch (err) {
+        if (cancelled) return;
+        // The server is shedding load: retry later rather than send more requests now
+        if (err.status === 429 || err.status === 503) {
+          retryTimer = setTimeout(loadDashboard, (err.retryAfter || 1) * 1000);
+          return;
+        }
+        console.error("Failed to load dashboard, falling back to separate requests:", err);
+        fetchTransactions(true);
+        fetchCredits();
+        fetchBudgetPreferences();
+        fetchControlDateConfig();
+      }
+    };
+    loadDashboard();
+    return () => {
+      cancelled = true;
+      clearTimeout(retryTimer);
+    };
   }, [token]);
 
   // Use performance optimizations hook for expensive calculations
@@ -510,9 +546,11 @@ const AppContent = () => {
               />
             </Box>
             <Box sx={{ mb: 2 }}>
-              <AccountSumChart 
-                transactions={filteredTransactions} 
-                controlDate={configControlDate ? new Date(configControlDate) : null} 
+              <AccountSumChart
+                token={token}
+                transactions={transactions}
+                asOf={filterDateTo ? formatLocalDate(filterDateTo) : null}
+                account={filterAccount}
               />
             </Box>
             {getControlDateAccountBarData(allTransactionsFiltered) && (
@@ -5,22 +5,48 @@ import Paper from '@mui/material/Paper';
 import { useTheme } from '@mui/material/styles';
 import { surfaceBoxSx } from '../../theme/primitives';
 import { formatChartCurrency } from '../../utils/charts';
+import apiService from '../../services/api';
 
 Chart.register(BarElement, CategoryScale, LinearScale, Tooltip, Legend);
 
-const AccountSumChart = React.memo(({ transactions, controlDate }) => {
+const todayISO = () => {
+  const d = new Date();
+  return `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}-${String(d.getDate()).padStart(2, '0')}`;
+};
+
+// Balance per account as of `asOf` (default today), computed by the server from
+// its monthly checkpoints; `transactions` only signals when to refetch
+const AccountSumChart = React.memo(({ token, transactions, asOf, account }) => {
   const theme = useTheme();
+  const [balances, setBalances] = React.useState({});
+
+  React.useEffect(() => {
+    if (!token) return undefined;
+    let cancelled = false;
+    const dateTo = asOf || todayISO();
+    // A single day bucket: the server starts from the last monthly checkpoint
+    apiService.getBalances(token, 'day', dateTo, dateTo)
+      .then((data) => {
+        if (cancelled) return;
+        const latest = {};
+        Object.entries(data.balances).forEach(([name, values]) => {
+          latest[name] = values.length ? values[values.length - 1] : 0;
+        });
+        setBalances(latest);
+      })
+      .catch((err) => console.error('Failed to fetch account balances:', err));
+    return () => { cancelled = true; };
+  }, [token, transactions, asOf]);
 
-  // Memoize expensive calculations
   const chartData = React.useMemo(() => {
     const grouped = {};
     let poupancaSum = 0;
-    transactions.forEach(({ account, amount }) => {
-      if (account === 'Poupança Física' || account === 'Poupança Objectivo') {
-        poupancaSum += amount;
+    Object.entries(balances).forEach(([name, balance]) => {
+      if (account && name !== account) return;
+      if (name === 'Poupança Física' || name === 'Poupança Objectivo') {
+        poupancaSum += balance;
       } else {
-        if (!grouped[account]) grouped[account] = 0;
-        grouped[account] += amount;
+        grouped[name] = balance;
       }
     });
 
@@ -34,7 +60,7 @@ const AccountSumChart = React.memo(({ transactions, controlDate }) => {
     const values = accounts.map(acc => grouped[acc]);
     
     return { accounts, values, grouped };
-  }, [transactions]);
+  }, [balances, account]);
 
   const { accounts, values } = chartData;
   const labelColor = theme.palette.text.primary;
@@ -45,7 +71,7 @@ const AccountSumChart = React.memo(({ transactions, controlDate }) => {
     labels: accounts,
     datasets: [
       {
-        label: 'Sum by Account',
+        label: 'Balance',
         data: values,
         backgroundColor: accounts.map((_, i) => palette[i % palette.length]),
         borderColor: accounts.map(() => theme.palette.mode === 'dark' ? 'rgba(255,255,255,0.25)' : 'rgba(0,0,0,0.15)'),
@@ -61,7 +87,7 @@ const AccountSumChart = React.memo(({ transactions, controlDate }) => {
     responsive: true,
     plugins: {
       legend: { display: false },
-      title: { display: true, text: 'Sum of Values by Account', color: labelColor },
+      title: { display: true, text: 'Balance by Account', color: labelColor },
       tooltip: {
         callbacks: { 
           label: (c) => `${c.dataset.label}: ${formatChartCurrency(c.parsed.x)}` 
@@ -74,7 +100,7 @@ const AccountSumChart = React.memo(({ transactions, controlDate }) => {
     scales: {
       x: { 
         beginAtZero: true, 
-        title: { display: true, text: 'Sum', color: labelColor }, 
+        title: { display: true, text: 'Balance', color: labelColor }, 
         ticks: { 
           color: labelColor,
           callback: function(value) {
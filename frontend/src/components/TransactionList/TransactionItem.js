@@ -56,19 +56,32 @@ const TransactionItem = React.memo(({ transaction, onEdit, onClone, onDelete })
                 sx={{ borderRadius: 2 }}
               />
             )}
+            {transaction.archived && (
+              <Chip
+                label="🗄️ Archived"
+                size="small"
+                variant="outlined"
+                sx={{ borderRadius: 2 }}
+              />
+            )}
           </Box>
         </CardContent>
         
         <CardActions sx={{ pt: 0, justifyContent: 'flex-end' }}>
-          <Button size="small" onClick={() => onEdit(transaction)}>
-            Edit
-          </Button>
+          {/* Archived transactions are read-only; they can still be cloned */}
+          {!transaction.archived && (
+            <Button size="small" onClick={() => onEdit(transaction)}>
+              Edit
+            </Button>
+          )}
           <Button size="small" onClick={() => onClone(transaction)}>
             Clone
           </Button>
-          <Button size="small" color="error" onClick={() => onDelete(transaction.id)}>
-            Delete
-          </Button>
+          {!transaction.archived && (
+            <Button size="small" color="error" onClick={() => onDelete(transaction.id)}>
+              Delete
+            </Button>
+          )}
         </CardActions>
       </Card>
     </Grid>
@@ -96,10 +96,19 @@ export const useBudgetPreferences = (token) => {
     }
   }, [token]);
 
-  // Fetch budget preferences on mount and when token changes
+  // Seed the summary from the dashboard bootstrap
+  const hydrateBudgetPreferences = useCallback((summary) => {
+    setBudgetSummary(summary);
+    setBudgetPreferences(summary.budget_preferences || []);
+  }, []);
+
+  // Refetch when the server reports changed budget preferences
   useEffect(() => {
-    fetchBudgetPreferences();
-  }, [fetchBudgetPreferences]);
+    if (!token) return undefined;
+    return apiService.onChange(token, (resource) => {
+      if (resource === 'budget_preferences' || resource === '*') fetchBudgetPreferences();
+    });
+  }, [token, fetchBudgetPreferences]);
 
   return {
     budgetPreferences,
@@ -110,6 +119,7 @@ export const useBudgetPreferences = (token) => {
     updateBudgetPreference,
     deleteBudgetPreference,
     validateBudgetPreferences,
+    hydrateBudgetPreferences,
     refetch: fetchBudgetPreferences
   };
 };
\ No newline at end of file
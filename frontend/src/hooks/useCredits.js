@@ -123,7 +123,19 @@ export const useCredits = (token) => {
     }
   }, [token]);
 
-  useEffect(() => { fetchCredits(); }, [fetchCredits]);
+  // Seed credits and their payments from the dashboard bootstrap
+  const hydrateCredits = useCallback((data, payments) => {
+    setCredits(data);
+    setPaymentsByCredit(payments);
+  }, []);
+
+  // Refetch when the server reports changed credits or payments
+  useEffect(() => {
+    if (!token) return undefined;
+    return apiService.onChange(token, (resource) => {
+      if (resource === 'credits' || resource === 'credit_payments' || resource === '*') fetchCredits();
+    });
+  }, [token, fetchCredits]);
 
   return {
     credits,
@@ -131,6 +143,7 @@ export const useCredits = (token) => {
     loading,
     error,
     fetchCredits,
+    hydrateCredits,
     fetchPayments,
     createCredit,
     updateCredit,
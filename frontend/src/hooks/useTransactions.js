@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import apiService from '../services/api';
 
 export const useTransactions = (token) => {
@@ -73,15 +73,28 @@ export const useTransactions = (token) => {
     }
   }, [token]);
 
+  // Seed the list from an already-loaded payload (the dashboard bootstrap)
+  const hydrateTransactions = useCallback((data) => {
+    setTransactions(data);
+    setLastFetch(Date.now());
+  }, []);
+
+  // Refetch when the server reports changed transactions (e.g. from another tab)
+  const fetchRef = useRef(fetchTransactions);
+  fetchRef.current = fetchTransactions;
   useEffect(() => {
-    fetchTransactions();
-  }, [fetchTransactions]);
+    if (!token) return undefined;
+    return apiService.onChange(token, (resource) => {
+      if (resource === 'transactions' || resource === '*') fetchRef.current(true);
+    });
+  }, [token]);
 
   return {
     transactions,
     loading,
     error,
     fetchTransactions,
+    hydrateTransactions,
     createTransaction,
     updateTransaction,
     deleteTransaction
@@ -1,8 +1,80 @@
 import { API_BASE_URL } from '../constants';
+import { decodeColumnar } from '../utils/columnar';
 
 class ApiService {
   constructor() {
     this.baseURL = API_BASE_URL;
+    this.changeListeners = new Set();
+    this.changeStream = null;
+  }
+
+  // Server-sent change events, shared by every listener. listener(resource)
+  // gets the changed resource name, or '*' when everything should be
+  // refetched. Returns a function that removes the listener.
+  onChange(token, listener) {
+    this.changeListeners.add(listener);
+    if (!this.changeStream || this.changeStream.token !== token) {
+      this.closeChangeStream();
+      this.openChangeStream(token);
+    }
+    return () => {
+      this.changeListeners.delete(listener);
+      // Let a listener re-added in the same tick keep the stream open
+      setTimeout(() => {
+        if (this.changeListeners.size === 0) this.closeChangeStream();
+      }, 0);
+    };
+  }
+
+  openChangeStream(token) {
+    const controller = new AbortController();
+    const stream = { token, controller };
+    this.changeStream = stream;
+    const emit = (resource) => this.changeListeners.forEach(listener => listener(resource));
+
+    const run = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          const response = await fetch(`${this.baseURL}/events`, {
+            headers: this.getAuthHeaders(token),
+            signal: controller.signal
+          });
+          if (!response.ok) throw new Error(`HTTP ${response.status}`);
+          const reader = response.body.getReader();
+          const decoder = new TextDecoder();
+          let buffer = '';
+          for (;;) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            let end;
+            while ((end = buffer.indexOf('\n\n')) >= 0) {
+              const message = buffer.slice(0, end);
+              buffer = buffer.slice(end + 2);
+              const lines = message.split('\n');
+              const event = lines.find(line => line.startsWith('event: '));
+              const data = lines.find(line => line.startsWith('data: '));
+              if (event === 'event: resync') emit('*');
+              else if (event === 'event: change' && data) emit(JSON.parse(data.slice(6)).resource);
+            }
+          }
+        } catch (err) {
+          if (controller.signal.aborted) return;
+          console.warn('Change events stream failed, reconnecting:', err);
+        }
+        // Changes may have been missed while disconnected
+        await new Promise(resolve => setTimeout(resolve, 5000));
+        if (!controller.signal.aborted) emit('*');
+      }
+    };
+    run();
+  }
+
+  closeChangeStream() {
+    if (this.changeStream) {
+      this.changeStream.controller.abort();
+      this.changeStream = null;
+    }
   }
 
   // Helper method to get auth headers
@@ -20,7 +92,10 @@ class ApiService {
     }
     
     const errorData = await response.json().catch(() => ({ detail: 'Unknown error' }));
-    throw new Error(errorData.detail || `HTTP ${response.status}`);
+    const error = new Error(errorData.detail || `HTTP ${response.status}`);
+    error.status = response.status;
+    error.retryAfter = Number(response.headers.get('Retry-After')) || null;
+    throw error;
   }
 
   // Authentication endpoints
@@ -52,12 +127,14 @@ class ApiService {
 
   // Transaction endpoints
   async getTransactions(token, limit = 10000, offset = 0) {
-    const response = await fetch(`${this.baseURL}/transactions/?limit=${limit}&offset=${offset}`, {
+    // Columnar format avoids repeating keys and category/account strings per row
+    const response = await fetch(`${this.baseURL}/transactions/?limit=${limit}&offset=${offset}&format=columnar`, {
       method: 'GET',
       headers: this.getAuthHeaders(token)
     });
     
-    return this.handleResponse(response);
+    const data = await this.handleResponse(response);
+    return decodeColumnar(data);
   }
 
   async getTransactionsCount(token) {
@@ -69,6 +146,57 @@ class ApiService {
     return this.handleResponse(response);
   }
 
+  async exportTransactions(token, format = 'parquet') {
+    const response = await fetch(`${this.baseURL}/transactions/export?format=${format}`, {
+      method: 'GET',
+      headers: this.getAuthHeaders(token)
+    });
+    
+    if (!response.ok) {
+      const errorData = await response.json().catch(() => ({ detail: 'Unknown error' }));
+      throw new Error(errorData.detail || `HTTP ${response.status}`);
+    }
+    return response.blob();
+  }
+
+  async getBalances(token, resolution = 'month', dateFrom = null, dateTo = null) {
+    const params = new URLSearchParams({ resolution });
+    if (dateFrom) params.append('date_from', dateFrom);
+    if (dateTo) params.append('date_to', dateTo);
+    const response = await fetch(`${this.baseURL}/transactions/balances?${params}`, {
+      method: 'GET',
+      headers: this.getAuthHeaders(token)
+    });
+    
+    return this.handleResponse(response);
+  }
+
+  async getSeries(token, { bucket = 'month', metric = 'sum', dateFrom, dateTo, account, category } = {}) {
+    const params = new URLSearchParams({ bucket, metric });
+    if (dateFrom) params.append('date_from', dateFrom);
+    if (dateTo) params.append('date_to', dateTo);
+    if (account !== undefined) params.append('account', account);
+    if (category !== undefined) params.append('category', category);
+    const response = await fetch(`${this.baseURL}/analytics/series?${params}`, {
+      method: 'GET',
+      headers: this.getAuthHeaders(token)
+    });
+    
+    return this.handleResponse(response);
+  }
+
+  async getBreakdown(token, { by = 'category', metric = 'expense', dateFrom, dateTo } = {}) {
+    const params = new URLSearchParams({ by, metric });
+    if (dateFrom) params.append('date_from', dateFrom);
+    if (dateTo) params.append('date_to', dateTo);
+    const response = await fetch(`${this.baseURL}/analytics/breakdown?${params}`, {
+      method: 'GET',
+      headers: this.getAuthHeaders(token)
+    });
+    
+    return this.handleResponse(response);
+  }
+
   async getAllTransactions(token) {
     try {
       // First get the total count
@@ -147,6 +275,15 @@ class ApiService {
     return this.handleResponse(response);
   }
 
+  async recomputeControlDates(token) {
+    const response = await fetch(`${this.baseURL}/config/control_date/recompute`, {
+      method: 'POST',
+      headers: this.getAuthHeaders(token)
+    });
+    
+    return this.handleResponse(response);
+  }
+
   // Credits endpoints
   async getCredits(token) {
     const response = await fetch(`${this.baseURL}/credits/`, {
@@ -272,6 +409,17 @@ class ApiService {
     });
     return this.handleResponse(response);
   }
+
+  // Dashboard bootstrap: transactions, count, control date, credits with
+  // payments and budget preferences in a single request
+  async getDashboard(token, limit = 10000) {
+    const response = await fetch(`${this.baseURL}/dashboard?limit=${limit}&format=columnar`, {
+      method: 'GET',
+      headers: this.getAuthHeaders(token)
+    });
+    const data = await this.handleResponse(response);
+    return { ...data, transactions: decodeColumnar(data.transactions) };
+  }
 }
 
 export default new ApiService();
@@ -0,0 +1,39 @@
+// Decoding helpers for the backend's columnar list format (format=columnar)
+
+const MS_PER_DAY = 86400000;
+
+// Convert a day offset from the payload epoch back to a YYYY-MM-DD string
+const dayOffsetToISODate = (epochMs, offset) => {
+  if (offset === null || offset === undefined) return null;
+  return new Date(epochMs + offset * MS_PER_DAY).toISOString().slice(0, 10);
+};
+
+// Rebuild row objects from a columnar payload
+export const decodeColumnar = (payload, dateFields = ['date', 'control_date']) => {
+  const { length, columns } = payload;
+  const epochMs = Date.parse(`${payload.epoch}T00:00:00Z`);
+  const fields = Object.keys(columns);
+
+  // Resolve each column to a plain value accessor once, outside the row loop
+  const accessors = fields.map((field) => {
+    const column = columns[field];
+    if (column && !Array.isArray(column)) {
+      const { dictionary, indices } = column;
+      return (i) => (indices[i] === null ? null : dictionary[indices[i]]);
+    }
+    if (dateFields.includes(field)) {
+      return (i) => dayOffsetToISODate(epochMs, column[i]);
+    }
+    return (i) => column[i];
+  });
+
+  const rows = new Array(length);
+  for (let i = 0; i < length; i++) {
+    const row = {};
+    for (let f = 0; f < fields.length; f++) {
+      row[fields[f]] = accessors[f](i);
+    }
+    rows[i] = row;
+  }
+  return rows;
+};